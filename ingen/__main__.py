@@ -7,6 +7,9 @@ import time
 from datetime import date
 
 from ingen.metadata.metadata_parser import MetaDataParser
+from ingen.utils.app_http.http_archive import HTTPArchive, RECORD, REPLAY
+from ingen.utils.app_http.http_client import client_manager
+from ingen.utils.url_constructor import clear_param_cache
 from ingen.utils.utils import KeyValue, KeyValueOrString
 from ingen.logger import init_logging
 
@@ -14,8 +17,15 @@ logger = logging.getLogger()
 
 
 def main(
-    config_path, query_params, run_date, interfaces, infile=None, dynamic_data=None, override_params=None
+    config_path, query_params, run_date, interfaces, infile=None, dynamic_data=None, override_params=None,
+    http_record=None, http_replay=None
 ):
+    if http_record and http_replay:
+        raise ValueError("http_record and http_replay cannot be used together")
+    if http_record:
+        client_manager.archive = HTTPArchive(http_record, RECORD)
+    elif http_replay:
+        client_manager.archive = HTTPArchive(http_replay, REPLAY)
     parser = MetaDataParser(
         config_path, query_params, run_date, interfaces, infile, dynamic_data, override_params
     )
@@ -46,6 +56,10 @@ def main(
             logger.error(
                 f"Failed to generate interface file for {metadata.name} \n {e}"
             )
+    # the HTTP sessions and the URL param values are shared by all the interfaces of the run
+    client_manager.close()
+    client_manager.archive = None
+    clear_param_cache()
     main_end = time.time()
     logger.info(
         f"Interface Generation finished. Time taken: {main_end - main_start:.2f} seconds"
@@ -90,6 +104,16 @@ def create_arg_parser():
         action=KeyValue,
         help="Key value pairs used by runtime overrides (interpolators/formatters)",
     )
+    http_archive = parser.add_mutually_exclusive_group()
+    http_archive.add_argument(
+        "--http_record",
+        help="Path of an archive to record the HTTP responses of the run to",
+    )
+    http_archive.add_argument(
+        "--http_replay",
+        help="Path of an archive recorded with --http_record, HTTP requests are answered from the archive "
+        "without calling the APIs",
+    )
     return parser
 
 
@@ -114,5 +138,7 @@ if __name__ == "__main__":
         args.run_date,
         args.interfaces,
         args.infile,
-        override_params=args.override_params
+        override_params=args.override_params,
+        http_record=args.http_record,
+        http_replay=args.http_replay
     )
@@ -0,0 +1,2 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
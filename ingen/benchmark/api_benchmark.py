@@ -0,0 +1,204 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+"""
+API Benchmark
+
+Measures the throughput, the peak memory and the DataFrame build time of API sources and API destinations against
+a local StubServer, for a grid of 'tasks_len' and 'queue_size' settings. Run it with:
+
+    python -m ingen.benchmark.api_benchmark --records 20000 --page_size 100 --latency 0.02 --tasks_len 1 8 32
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import time
+import tracemalloc
+
+from ingen.benchmark.stub_server import StubServer
+from ingen.data_source.api_source import APISource
+from ingen.data_source.dataframe_store import store
+from ingen.utils.app_http.http_client import client_manager
+from ingen.writer.json_writer.destinations.api_destination import ApiDestination
+
+log = logging.getLogger()
+
+RESPONSE_DATAFRAME_ID = 'api_benchmark_response'
+
+
+def run_source_benchmark(server, tasks_len=1, queue_size=1, source_overrides=None):
+    """
+    Fetches all the records of the server with a paginated API source
+    :param server: running StubServer
+    :param tasks_len: tasks_len of the source
+    :param queue_size: queue_size of the source
+    :param source_overrides: dict of source config overriding the benchmark config, eg. 'concurrency'
+    :return: dict of the measures
+    """
+    source_config = {
+        'id': 'api_benchmark',
+        'type': 'api',
+        'url': server.url('/records'),
+        'data_node': ['data'],
+        'retries': 5,
+        'interval': 0.05,
+        'tasks_len': tasks_len,
+        'queue_size': queue_size,
+        'pagination': {'type': 'offset', 'limit': server.page_size, 'total_key': 'total'},
+        **(source_overrides or {})
+    }
+    source = APISource(source_config)
+    requests_before = sum(server.statuses.values())
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        data = source.fetch()
+        elapsed = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    requests = sum(server.statuses.values()) - requests_before
+    return {
+        'benchmark': 'source',
+        'tasks_len': tasks_len,
+        'queue_size': queue_size,
+        'rows': len(data),
+        'requests': requests,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(requests / elapsed, 1) if elapsed else None,
+        'rows_per_second': round(len(data) / elapsed, 1) if elapsed else None,
+        'peak_memory_mb': round(peak_memory / 2 ** 20, 1)
+    }
+
+
+def run_destination_benchmark(server, records=1000, tasks_len=1, queue_size=1, request_overrides=None):
+    """
+    Sends records to the server with an API destination
+    :param server: running StubServer
+    :param records: number of JSON strings sent
+    :param tasks_len: tasks_len of the destination
+    :param queue_size: queue_size of the destination
+    :param request_overrides: dict of api_request_props overriding the benchmark config, eg. 'batch_size'
+    :return: dict of the measures
+    """
+    payload = 'x' * server.record_size
+    json_strings = [json.dumps({'id': index, 'payload': payload}) for index in range(records)]
+    destination_props = {
+        'api_request_props': {
+            'url': server.url('/ingest'),
+            'method': 'post',
+            'headers': {'Content-Type': 'application/json'},
+            'retries': 5,
+            'interval': 0.05,
+            'tasks_len': tasks_len,
+            'queue_size': queue_size,
+            **(request_overrides or {})
+        },
+        'api_response_props': {'type': 'dataframe', 'dataframe_id': RESPONSE_DATAFRAME_ID}
+    }
+    requests_before = sum(server.statuses.values())
+    received_before = server.received_records
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        ApiDestination().handle(json_strings, destination_props)
+        elapsed = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        store.pop(RESPONSE_DATAFRAME_ID, None)
+
+    requests = sum(server.statuses.values()) - requests_before
+    return {
+        'benchmark': 'destination',
+        'tasks_len': tasks_len,
+        'queue_size': queue_size,
+        'rows': server.received_records - received_before,
+        'requests': requests,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(requests / elapsed, 1) if elapsed else None,
+        'rows_per_second': round(records / elapsed, 1) if elapsed else None,
+        'peak_memory_mb': round(peak_memory / 2 ** 20, 1)
+    }
+
+
+def run_benchmarks(server_config, tasks_lens, queue_sizes, destination_records=0, batch_size=None):
+    """
+    Runs the source benchmark, and the destination benchmark when destination_records is given, for every
+    combination of tasks_len and queue_size
+    :param server_config: kwargs of StubServer
+    :return: list of dicts of the measures
+    """
+    results = []
+    request_overrides = {'batch_size': batch_size} if batch_size else None
+    with StubServer(**server_config) as server:
+        try:
+            for tasks_len, queue_size in itertools.product(tasks_lens, queue_sizes):
+                results.append(run_source_benchmark(server, tasks_len, queue_size))
+                if destination_records:
+                    results.append(run_destination_benchmark(server, destination_records, tasks_len, queue_size,
+                                                             request_overrides))
+        finally:
+            client_manager.close()
+    return results
+
+
+def format_results(results):
+    columns = ['benchmark', 'tasks_len', 'queue_size', 'rows', 'requests', 'seconds', 'requests_per_second',
+               'rows_per_second', 'peak_memory_mb']
+    widths = [max(len(column), *(len(str(result[column])) for result in results)) for column in columns]
+    lines = ['  '.join(column.rjust(width) for column, width in zip(columns, widths))]
+    for result in results:
+        lines.append('  '.join(str(result[column]).rjust(width) for column, width in zip(columns, widths)))
+    return '\n'.join(lines)
+
+
+def create_arg_parser():
+    parser = argparse.ArgumentParser(description="Benchmarks API sources and destinations against a stub server")
+    parser.add_argument("--records", type=int, default=10000, help="Number of records served by the stub server")
+    parser.add_argument("--page_size", type=int, default=100, help="Number of records per page")
+    parser.add_argument("--record_size", type=int, default=100, help="Payload characters per record")
+    parser.add_argument("--latency", type=float, default=0.01, help="Latency of the stub server in seconds")
+    parser.add_argument("--latency_jitter", type=float, default=0.0, help="Random latency added, in seconds")
+    parser.add_argument("--error_rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--throttle_every", type=int, default=0, help="A burst of 429s every N requests")
+    parser.add_argument("--throttle_burst", type=int, default=0, help="Number of 429s in a burst")
+    parser.add_argument("--retry_after", type=int, default=0, help="Retry-After of the 429 responses")
+    parser.add_argument("--tasks_len", type=int, nargs="+", default=[1, 8, 32], help="tasks_len values to run")
+    parser.add_argument("--queue_size", type=int, nargs="+", default=[32], help="queue_size values to run")
+    parser.add_argument("--destination_records", type=int, default=0,
+                        help="Number of records sent to the API destination, 0 to skip the destination benchmark")
+    parser.add_argument("--batch_size", type=int, help="batch_size of the API destination")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random latencies and errors")
+    parser.add_argument("--verbose", action="store_true", help="Logs the HTTP requests")
+    return parser
+
+
+def main(args=None):
+    args = create_arg_parser().parse_args(args)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    server_config = {
+        'records': args.records,
+        'page_size': args.page_size,
+        'record_size': args.record_size,
+        'latency': args.latency,
+        'latency_jitter': args.latency_jitter,
+        'error_rate': args.error_rate,
+        'throttle_every': args.throttle_every,
+        'throttle_burst': args.throttle_burst,
+        'retry_after': args.retry_after,
+        'seed': args.seed
+    }
+    results = run_benchmarks(server_config, args.tasks_len, args.queue_size, args.destination_records,
+                             args.batch_size)
+    print(format_results(results))
+    return results
+
+
+if __name__ == "__main__":
+    main()
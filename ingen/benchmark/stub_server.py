@@ -0,0 +1,149 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+"""
+Stub HTTP Server
+
+A local HTTP server used to benchmark API sources and API destinations without a real upstream. Latency, error
+rate, 429 bursts, page size and record size are configurable, see StubServer.
+
+GET /records?offset=<offset>&limit=<limit> returns a page of records: {"total": <records>, "data": [...]}
+POST /ingest accepts a JSON object, a JSON array or NDJSON body, optionally gzip compressed, and returns
+{"done": "true", "received": <number of records>}
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+from collections import Counter
+
+from aiohttp import web
+
+log = logging.getLogger()
+
+
+class StubServer:
+    """
+    Stub HTTP server run on a background thread. Use it as a context manager:
+
+        with StubServer(records=1000, latency=0.05) as server:
+            url = server.url('/records')
+    """
+
+    def __init__(self, records=1000, page_size=100, record_size=100, latency=0.0, latency_jitter=0.0,
+                 error_rate=0.0, throttle_every=0, throttle_burst=0, retry_after=0, seed=None):
+        """
+        :param records: total number of records served by /records
+        :param page_size: default 'limit' of a page
+        :param record_size: number of characters of the payload of a record
+        :param latency: seconds waited before answering a request
+        :param latency_jitter: random seconds, between 0 and latency_jitter, added to the latency
+        :param error_rate: share of requests answered with 503
+        :param throttle_every: a burst of 429 responses ends every 'throttle_every' requests, 0 to never throttle
+        :param throttle_burst: number of requests answered with 429 in a burst, the last ones of every
+                               'throttle_every' requests
+        :param retry_after: Retry-After header of the 429 responses, 0 to leave it out
+        :param seed: seed of the random latencies and errors, for repeatable runs
+        """
+        self.records = records
+        self.page_size = page_size
+        self.record_size = record_size
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_every = throttle_every
+        self.throttle_burst = throttle_burst
+        self.retry_after = retry_after
+        self.statuses = Counter()
+        self.received_records = 0
+        self.received_bytes = 0
+        self._random = random.Random(seed)
+        self._request_count = 0
+        self._loop = None
+        self._thread = None
+        self._runner = None
+        self._port = None
+
+    def url(self, path=''):
+        return f"http://127.0.0.1:{self._port}{path}"
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='stub-http-server', daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        log.info(f"Stub HTTP server listening on {self.url()}")
+        return self
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get('/records', self._records)
+        app.router.add_post('/ingest', self._ingest)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+
+    async def _records(self, request):
+        error_response = await self._simulate()
+        if error_response is not None:
+            return error_response
+        offset = int(request.query.get('offset', 0))
+        limit = int(request.query.get('limit', self.page_size))
+        payload = 'x' * self.record_size
+        data = [{'id': index, 'name': f"record-{index}", 'payload': payload}
+                for index in range(offset, min(offset + limit, self.records))]
+        return self._respond(200, {'total': self.records, 'data': data})
+
+    async def _ingest(self, request):
+        error_response = await self._simulate()
+        if error_response is not None:
+            return error_response
+        # aiohttp decompresses gzip request bodies, content_length is the size sent on the wire
+        text = (await request.read()).decode('utf-8')
+        self.received_bytes += request.content_length or len(text)
+        if 'ndjson' in request.headers.get('Content-Type', ''):
+            received = len([line for line in text.splitlines() if line.strip()])
+        else:
+            payload = json.loads(text)
+            received = len(payload) if isinstance(payload, list) else 1
+        self.received_records += received
+        return self._respond(200, {'done': 'true', 'received': received})
+
+    async def _simulate(self):
+        """
+        Waits for the configured latency, and returns the error response of the request if it has to fail
+        """
+        request_number = self._request_count
+        self._request_count += 1
+        latency = self.latency + self._random.uniform(0, self.latency_jitter)
+        if latency > 0:
+            await asyncio.sleep(latency)
+        if self.throttle_every and request_number % self.throttle_every >= self.throttle_every - self.throttle_burst:
+            headers = {'Retry-After': str(self.retry_after)} if self.retry_after else None
+            return self._respond(429, {'error': 'throttled'}, headers)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._respond(503, {'error': 'unavailable'})
+        return None
+
+    def _respond(self, status, payload, headers=None):
+        self.statuses[status] += 1
+        return web.json_response(payload, status=status, headers=headers)
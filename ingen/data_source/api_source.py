@@ -6,6 +6,7 @@ from datetime import date
 
 from ingen.data_source.source import DataSource
 from ingen.reader.api_reader import APIReader
+from ingen.utils.app_http.aiohttp_retry import DEFAULT_BACKOFF, DEFAULT_MAX_BACKOFF
 from ingen.utils.app_http.http_request import HTTPRequest
 from ingen.utils.app_http.success_criterias import DEFAULT_STATUS_CRITERIA_OPTIONS, get_criteria_by_name
 from ingen.utils.interpolators.Interpolator import Interpolator
@@ -45,6 +46,10 @@ class APISource(DataSource):
         self._method = source.get('method', 'GET')
         self._req_data = source.get('request_body')
         self._headers = self.parse_headers(source.get('headers'))
+        self._pagination = source.get('pagination')
+        if self._pagination is not None:
+            # records of a page are found at the data_node unless configured otherwise
+            self._pagination = {'records_key': self._data_node, **self._pagination}
         self.reader_params = {
             'response_to_list': self._response_to_list,
             'retries': source.get('retries', 2),
@@ -54,9 +59,19 @@ class APISource(DataSource):
             'criteria_options': source.get('criteria_options', DEFAULT_STATUS_CRITERIA_OPTIONS),
             'convertor_method': source.get('convertor_method'),
             'tasks_len': source.get('tasks_len', 1),
+            'concurrency': source.get('concurrency'),
+            'rate_limit': source.get('rate_limit'),
+            'timeout': source.get('timeout'),
+            'backoff': source.get('backoff', DEFAULT_BACKOFF),
+            'max_backoff': source.get('max_backoff', DEFAULT_MAX_BACKOFF),
+            'cache': source.get('cache'),
+            'circuit_breaker': source.get('circuit_breaker'),
             'queue_size': source.get('queue_size', 1),
             'ssl': source.get('ssl', True),
-            'ignore_failure': source.get('ignore_failure', True)
+            'connection': source.get('connection'),
+            'ignore_failure': source.get('ignore_failure', True),
+            'pagination': self._pagination,
+            'normalize_per_response': source.get('normalize_per_response', False)
         }
         self._src_data_checks = source.get('src_data_checks', [])
 
@@ -5,6 +5,7 @@ import logging
 
 import pymysql
 from ingen.data_source.source import DataSource
+from ingen.reader.mysql_partitioned_reader import MYSQLPartitionedReader, DEFAULT_NUM_PARTITIONS
 from ingen.reader.mysql_reader import MYSQLReader
 from ingen.utils.properties import properties
 from ingen.utils.sql_query_parser import SqlQueryParser
@@ -32,29 +33,63 @@ class MYSQLSource(DataSource):
         self._user = properties.get_property('datasource.mysql.user')
         self._password = properties.get_property('datasource.mysql.password')
         self._database = source.get('database')
+        self._fetch_size = source.get('fetch_size')
+        self._columnar = source.get('columnar')
+        self._partition = source.get('partition')
+        self._push_down_filters = source.get('push_down_filters', True) and not source.get('temp_table_params')
+        if self._partition and source.get('temp_table_params'):
+            raise ValueError('partition cannot be used with temp_table_params')
         self._query = SqlQueryParser().parse_query(source['query'], params_map, source.get('temp_table_params'))
+        self._query_params = None
         if self._connection is None:
-            self._connection = pymysql.connect(host=self._host,
-                                                          user=self._user,
-                                                          password=self._password,
-                                                          database=self._database)
+            self._connection = self._connect()
         else:
             raise Exception('You cannot create another MySQL connection')
 
+    def _connect(self):
+        return pymysql.connect(host=self._host,
+                               user=self._user,
+                               password=self._password,
+                               database=self._database)
+
     def fetch(self):
         """
         Executes the SQL query
         :return: A DataFrame created using the result of the query
         """
-        reader = MYSQLReader(self._connection)
+        if self._partition:
+            reader = MYSQLPartitionedReader(self._partition_connections(), self._partition, self._fetch_size,
+                                            self._columnar)
+        else:
+            reader = MYSQLReader(self._connection, self._fetch_size, self._columnar)
         return self.fetch_data(reader)
 
+    def _partition_connections(self):
+        """
+        Creates the pool of connections used to read the partitions concurrently. The pool has one connection
+        per partition, limited to 'max_connections' if configured.
+        """
+        num_partitions = self._partition.get('num_partitions', DEFAULT_NUM_PARTITIONS)
+        pool_size = min(self._partition.get('max_connections', num_partitions), num_partitions)
+        return [self._connection] + [self._connect() for _ in range(max(pool_size, 1) - 1)]
+
     @log_time
     def fetch_data(self, reader):
         """
         returns a DataFrame of data fetched from MySQLSource.
         """
-        return reader.execute(self._query)
+        return reader.execute(self._query, self._query_params)
+
+    def can_push_down(self):
+        return bool(self._push_down_filters)
+
+    def push_down(self, predicate, params):
+        """
+        Wraps the query as a derived table filtered by the predicate, so that only the matching rows are fetched
+        """
+        self._query, self._query_params = SqlQueryParser.wrap_query(self._query, self._query_params,
+                                                                    'ingen_pushdown', predicate, params)
+        log.info(f"Pushed down predicate {predicate} into the query of source {self.id}")
 
     def fetch_validations(self):
         """
@@ -28,3 +28,18 @@ class DataSource:
         :return: list of dictionaries containing mentioned validations on all columns
         """
         pass
+
+    def can_push_down(self):
+        """
+        Method to check if pre-processing predicates can be pushed down into the source
+        :return: True if the source can restrict the fetched data using push_down
+        """
+        return False
+
+    def push_down(self, predicate, params):
+        """
+        Method to restrict the data fetched from the source to the rows matching a SQL predicate
+        :param predicate: SQL predicate with '%s' placeholders
+        :param params: values bound to the placeholders of the predicate
+        """
+        raise NotImplementedError(f"Source {self._id} does not support predicate pushdown")
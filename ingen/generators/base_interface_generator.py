@@ -31,7 +31,7 @@ class BaseInterfaceGenerator(ABC):
         :param post_processes: post_processing steps, to be executed on the dataframe(s)
         """
         try:
-            data = self.read(sources)
+            data = self.read(sources, pre_processes)
 
             # validation on raw data
             _, validation_summary_raw = self.validate(
@@ -64,10 +64,11 @@ class BaseInterfaceGenerator(ABC):
             raise
 
     @abstractmethod
-    def read(self, sources):
+    def read(self, sources, pre_processes=None):
         """
         Responsible for reading data from multiple sources
         :param sources: A list of DataSources
+        :param pre_processes: pre_processing steps, that may be pushed down into the first source
         :return: A dataframe containing raw data
         """
         pass
@@ -24,8 +24,22 @@ class InterfaceGenerator(BaseInterfaceGenerator):
         self.validations = validations
         self.post_processor = post_processor
 
-    def read(self, sources):
-        return {source.id: source.fetch() for source in sources}
+    def read(self, sources, pre_processes=None):
+        """
+        Fetches the data of all sources. When the first source supports it, the leading filtering pre-processing
+        steps are pushed down into its query. The other sources are then fetched first, as masks pushed down into
+        the first source need the data of the masking source.
+        """
+        if not sources or not pre_processes or not sources[0].can_push_down():
+            return {source.id: source.fetch() for source in sources}
+
+        first_source = sources[0]
+        other_data = {source.id: source.fetch() for source in sources[1:]}
+        predicates = self.pre_processor.pushdown_predicates(pre_processes, first_source.id, other_data)
+        for predicate, params in predicates:
+            first_source.push_down(predicate, params)
+        fetched_data = {first_source.id: first_source.fetch(), **other_data}
+        return {source.id: fetched_data[source.id] for source in sources}
 
     def pre_process(self, pre_processes, data):
         pre_processor = self.pre_processor(pre_processes, data)
@@ -1,9 +1,20 @@
 #  Copyright (c) 2023 BlackRock, Inc.
 #  All Rights Reserved.
 
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
 from ingen.pre_processor.aggregators import *
 from ingen.pre_processor.process import Process
 
+log = logging.getLogger()
+
+# keys of the config that are settings of the step, not operations
+STEP_SETTINGS = ('type', 'partitions')
+
 
 class Aggregator(Process):
 
@@ -14,9 +25,44 @@ class Aggregator(Process):
         if data.empty:
             return data
 
-        operations = list(config.keys())
-        operations.remove('type')
+        partitions = int(config.get('partitions') or 1)
+        groupby_config = config.get('groupby')
+        if partitions > 1 and groupby_config:
+            if groupby_config.get('observed', True):
+                return self.aggregate_partitions(config, data, groupby_config, partitions).reset_index()
+            log.warning("Aggregate partitions are ignored when 'observed' is false")
+        return self.apply_operations(config, data).reset_index()
+
+    def apply_operations(self, config, data):
+        operations = [operation for operation in config.keys() if operation not in STEP_SETTINGS]
         for operation in operations:
             operator = get_aggregator(operation)
             data = operator(config[operation], data)
-        return data.reset_index()
+        return data
+
+    def aggregate_partitions(self, config, data, groupby_config, partitions):
+        """
+        Splits the rows into partitions by the hash of their group keys, so that every group is in one partition,
+        and aggregates the partitions in parallel
+        :return: the aggregated data, with the groups in the order an aggregation of the whole data gives
+        """
+        cols = groupby_config['cols']
+        codes = pd.util.hash_pandas_object(data[cols], index=False).to_numpy() % partitions
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(1, partitions))
+        parts = [data.take(positions) for positions in np.split(order, bounds) if len(positions)]
+
+        with ThreadPoolExecutor(max_workers=len(parts)) as executor:
+            results = list(executor.map(lambda part: self.apply_operations(config, part), parts))
+        result = pd.concat(results)
+
+        if groupby_config.get('sort', False):
+            return result.sort_index()
+        # groups in the order of their first row, as groupby with sort=False gives them
+        first_rows = data[cols].drop_duplicates()
+        if isinstance(cols, list) and len(cols) > 1:
+            group_keys = pd.MultiIndex.from_frame(first_rows)
+        else:
+            group_keys = pd.Index(first_rows.squeeze(axis=1) if isinstance(first_rows, pd.DataFrame) else first_rows)
+        positions = result.index.get_indexer(group_keys)
+        return result.take(positions[positions >= 0])
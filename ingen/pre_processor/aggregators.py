@@ -1,6 +1,9 @@
 #  Copyright (c) 2023 BlackRock, Inc.
 #  All Rights Reserved.
 
+import pandas as pd
+
+
 def groupby(config, data):
     """
     groups data by configured column
@@ -9,10 +12,12 @@ def groupby(config, data):
         config columns on which group ing has to be performed as expressed below
         {'cols': ['acc', 'cusip']}
         the intent here is to group on columns acc, cusip
+        groups are returned in the order they appear in, unless 'sort' is true, and only the observed categories
+        of categorical columns are grouped on, unless 'observed' is false
     :param data : data to be grouped
 
     """
-    return data.groupby(config['cols'])
+    return data.groupby(config['cols'], sort=config.get('sort', False), observed=config.get('observed', True))
 
 
 def agg(config, data):
@@ -29,10 +34,24 @@ def agg(config, data):
     return data.agg(config['operation'], config['col'])
 
 
+def aggregations(config, data):
+    """
+    computes named aggregations of the grouped data, all in one pass over the groups
+
+    :param config : output column names mapped to the column and the operation aggregating it
+        example of config : {'total_quantity': {'col': 'quantity', 'operation': 'sum'},
+                             'max_price': {'col': 'price', 'operation': 'max'}}
+    :param data : data to be aggregated
+    """
+    named_aggregations = {name: pd.NamedAgg(column=aggregation['col'], aggfunc=aggregation['operation'])
+                          for name, aggregation in config.items()}
+    return data.agg(**named_aggregations)
+
+
 aggregator_map = {
     'groupby': groupby,
-    'agg': agg
-
+    'agg': agg,
+    'aggregations': aggregations
 }
 
 
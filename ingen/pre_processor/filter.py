@@ -2,17 +2,15 @@
 #  All Rights Reserved.
 
 import numpy as np
+from pandas.api.types import is_object_dtype, is_string_dtype
 
 from ingen.pre_processor.process import Process
+from ingen.utils.sql_query_parser import contains_predicate, in_predicate, quote_identifier
 
 
 class Filter(Process):
 
     def execute(self, config, sources_data, data):
-
-        # trim str values in dataframe for string comparison
-        data = data.applymap(lambda x: x.strip() if isinstance(x, str) else x)
-
         cols = config.get('cols')
         operator = config.get('operator')
 
@@ -20,27 +18,86 @@ class Filter(Process):
 
     def filter_by_column(self, data, cols, operator):
 
-        if data.empty:
+        if data.empty or operator not in ('and', 'or'):
             return data
 
         filter_map = self.make_filter_map(cols)
+        trim_map = self.make_trim_map(cols)
+        # str values of the compared columns are trimmed for string comparison, other columns are left as they are
+        compared = {}
+        trimmed_columns = []
+        for column in filter_map:
+            values = data[column]
+            compared[column] = trim_strings(values) if trim_map[column] else values
+            if compared[column] is not values:
+                trimmed_columns.append(column)
+        reduce = np.logical_and.reduce if operator == 'and' else np.logical_or.reduce
+        mask = reduce([compared[column].isin(target_values) for column, target_values in filter_map.items()])
+
+        if not trimmed_columns:
+            return data[mask]
+        return data[mask].assign(**{column: compared[column][mask] for column in trimmed_columns})
+
+    def pushdown_predicate(self, config, source_id, sources_data):
+        cols = config.get('cols')
+        operator = config.get('operator')
+        if not cols or operator not in ('and', 'or'):
+            return None
+
+        predicates = []
+        params = []
+        trim_map = self.make_trim_map(cols)
+        for column, target_values in self.make_filter_map(cols).items():
+            if not isinstance(target_values, (list, tuple, set)):
+                return None
+            predicate, predicate_params = self.column_predicate(quote_identifier(column), list(target_values),
+                                                                trim_map[column])
+            predicates.append(predicate)
+            params.extend(predicate_params)
+        return f" {operator.upper()} ".join(predicates), params
 
-        if operator == 'and':
-            data = data[
-                np.logical_and.reduce([
-                    data[column].isin(target_values)
-                    for column, target_values in filter_map.items()
-                ])
-            ]
-        elif operator == 'or':
-            data = data[
-                np.logical_or.reduce([
-                    data[col_name].isin(target_values)
-                    for col_name, target_values in filter_map.items()
-                ])
-            ]
-
-        return data
+    def column_predicate(self, column, target_values, trim=True):
+        """
+        String values are matched against the column containing them, as the filter strips any whitespace from the
+        column before comparing and MySQL TRIM only strips spaces, unless trim is turned off for the column
+        """
+        if not trim:
+            return in_predicate(column, target_values)
+        string_values = [value for value in target_values if isinstance(value, str)]
+        other_values = [value for value in target_values if not isinstance(value, str)]
+        predicates = []
+        params = []
+        if string_values:
+            predicate, predicate_params = contains_predicate(column, string_values)
+            predicates.append(predicate)
+            params.extend(predicate_params)
+        if other_values or not string_values:
+            predicate, predicate_params = in_predicate(column, other_values)
+            predicates.append(predicate)
+            params.extend(predicate_params)
+        if len(predicates) == 1:
+            return predicates[0], params
+        return f"({' OR '.join(predicates)})", params
 
     def make_filter_map(self, cols):
         return dict((x.get('col'), x.get('val')) for x in cols)
+
+    def make_trim_map(self, cols):
+        return dict((x.get('col'), x.get('trim', True)) for x in cols)
+
+
+def trim_strings(values):
+    """
+    Strips the str values of a Series, other values are left as they are
+    :param values: pandas Series
+    :return: the Series itself if it cannot hold str values, otherwise a new Series
+    """
+    if not (is_object_dtype(values) or is_string_dtype(values)):
+        return values
+    try:
+        stripped = values.str.strip()
+    except AttributeError:
+        # object column without any str value
+        return values
+    # str.strip gives NaN for the values that are not str
+    return stripped.where(stripped.notna(), values)
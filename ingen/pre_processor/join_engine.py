@@ -0,0 +1,238 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import logging
+import weakref
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_object_dtype, is_string_dtype, is_bool_dtype
+
+log = logging.getLogger()
+
+SUFFIXES = ('_x', '_y')
+# columns of the row positions of both sides, added for the joins done by pandas.merge
+LEFT_ROW = '__ingen_left_row__'
+RIGHT_ROW = '__ingen_right_row__'
+
+
+class JoinEngine:
+    """
+    Joins DataFrames on key columns, with the same result as pandas.merge.
+    Key columns of different types are harmonised before joining, eg. an object column of numbers is joined with an
+    int column as numbers. Inner and left joins where one side has unique keys probe a hash index of that side
+    instead of calling pandas.merge. The index of a DataFrame and its keys is cached until clear is called, at the
+    end of every pre-processing run, or until the DataFrame is garbage collected, so that a source joined by several
+    pre-processing steps of a run is only hashed once. DataFrames of the sources must not be modified in place
+    during a run once they are joined.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+
+    def join(self, left, right, left_on, right_on, how='inner', categorical_keys=False):
+        """
+        :param left: left DataFrame
+        :param right: right DataFrame
+        :param left_on: key column or list of key columns of the left DataFrame
+        :param right_on: key column or list of key columns of the right DataFrame
+        :param how: 'inner', 'left', 'right' or 'outer'
+        :param categorical_keys: True to join string keys as categoricals sharing the same categories, when the
+                                 join is done by pandas.merge
+        :return: joined DataFrame
+        """
+        left_keys = as_list(left_on)
+        right_keys = as_list(right_on)
+        if left_keys is None or right_keys is None or len(left_keys) != len(right_keys):
+            return pd.merge(left, right, left_on=left_on, right_on=right_on, how=how)
+
+        left_values, right_values = harmonise_keys([left[key] for key in left_keys],
+                                                   [right[key] for key in right_keys])
+        if how in ('inner', 'left') and len(left) and len(right):
+            # the smaller side is indexed first, an index is only usable when its keys are unique
+            if how == 'left':
+                build_sides = (False,)
+            else:
+                build_sides = (True, False) if len(left) < len(right) else (False, True)
+            for build_left in build_sides:
+                if build_left:
+                    positions = self._probe(left, left_keys, left_values, right_values)
+                    if positions is not None:
+                        right_positions = np.flatnonzero(positions >= 0)
+                        left_positions = positions[right_positions]
+                        # rows are in the order of the left keys, like pandas.merge
+                        order = np.argsort(left_positions, kind='stable')
+                        return assemble(left, right, left_positions[order], right_positions[order], left_keys,
+                                        right_keys)
+                else:
+                    right_positions = self._probe(right, right_keys, right_values, left_values)
+                    if right_positions is not None:
+                        if how == 'inner':
+                            left_positions = np.flatnonzero(right_positions >= 0)
+                            right_positions = right_positions[left_positions]
+                        else:
+                            left_positions = np.arange(len(left))
+                        return assemble(left, right, left_positions, right_positions, left_keys, right_keys)
+
+        return merge_on_values(left, right, left_keys, right_keys, left_values, right_values, how, categorical_keys)
+
+    def _probe(self, frame, keys, values, probe_values):
+        """
+        :return: position in frame of the row matching each probe key, -1 when no row matches. None when the keys
+                 of frame are not unique
+        """
+        index = self._index(frame, keys, values)
+        if not index.is_unique:
+            return None
+        return index.get_indexer(key_index(probe_values))
+
+    def _index(self, frame, keys, values):
+        cache_key = (id(frame), tuple(keys), tuple(str(value.dtype) for value in values))
+        cached = self._indexes.get(cache_key)
+        # the row count catches the DataFrames grown or shrunk in place
+        if cached is not None and cached[0]() is frame and len(cached[1]) == len(frame):
+            return cached[1]
+        index = key_index(values)
+        reference = weakref.ref(frame, lambda _: self._indexes.pop(cache_key, None))
+        self._indexes[cache_key] = (reference, index)
+        return index
+
+    def clear(self):
+        """
+        Forgets the cached indexes
+        """
+        self._indexes.clear()
+
+
+def as_list(keys):
+    if keys is None:
+        return None
+    return list(keys) if isinstance(keys, (list, tuple)) else [keys]
+
+
+def key_index(values):
+    if len(values) == 1:
+        return pd.Index(values[0])
+    return pd.MultiIndex.from_arrays(values)
+
+
+def harmonise_keys(left_values, right_values):
+    """
+    Converts the key columns of the two sides to comparable types. A numeric key joined with a text key is joined as
+    numbers when every text value is a number, otherwise as text.
+    :return: tuple of the lists of left and right key Series
+    """
+    left_result = []
+    right_result = []
+    for left_value, right_value in zip(left_values, right_values):
+        left_numeric = is_numeric_dtype(left_value) and not is_bool_dtype(left_value)
+        right_numeric = is_numeric_dtype(right_value) and not is_bool_dtype(right_value)
+        if left_numeric and is_text(right_value):
+            right_value, left_value = text_to_numeric(right_value, left_value)
+        elif right_numeric and is_text(left_value):
+            left_value, right_value = text_to_numeric(left_value, right_value)
+        left_result.append(left_value)
+        right_result.append(right_value)
+    return left_result, right_result
+
+
+def is_text(values):
+    return is_object_dtype(values) or is_string_dtype(values)
+
+
+def text_to_numeric(text_values, numeric_values):
+    """
+    :return: tuple of the text and numeric keys converted to the same type
+    """
+    numbers = pd.to_numeric(text_values, errors='coerce')
+    if numbers.isna().equals(text_values.isna()):
+        log.warning(f"Joining text key '{text_values.name}' with numeric key '{numeric_values.name}' as numbers")
+        return numbers, numeric_values
+    log.warning(f"Joining numeric key '{numeric_values.name}' with text key '{text_values.name}' as text")
+    return text_values.astype(str), numeric_values.astype(str)
+
+
+def assemble(left, right, left_positions, right_positions, left_keys, right_keys):
+    """
+    Builds the joined DataFrame from the matched row positions, with the columns pandas.merge would return
+    :param right_positions: position of the right row of each joined row, -1 when no right row matches
+    """
+    left_part = left.take(left_positions)
+    missing = right_positions < 0
+    right_part = right.take(np.where(missing, 0, right_positions))
+    left_part.index = pd.RangeIndex(len(left_part))
+    right_part.index = left_part.index
+    if missing.any():
+        right_part = right_part.where(pd.Series(~missing, index=right_part.index), axis=0)
+
+    # a key with the same name on both sides is kept once, with the left values
+    right_part = right_part.drop(columns=[right_key for left_key, right_key in zip(left_keys, right_keys)
+                                          if left_key == right_key])
+    overlap = set(left_part.columns) & set(right_part.columns)
+    if overlap:
+        left_part = left_part.rename(columns={column: f"{column}{SUFFIXES[0]}" for column in overlap})
+        right_part = right_part.rename(columns={column: f"{column}{SUFFIXES[1]}" for column in overlap})
+    return pd.concat([left_part, right_part], axis=1)
+
+
+def merge_on_values(left, right, left_keys, right_keys, left_values, right_values, how, categorical_keys):
+    """
+    Joins with pandas.merge, on the harmonised key values and optionally on shared categoricals. The key columns
+    converted for the join get back their original values, as when the join probes an index
+    """
+    changed = []
+    left_join = left.copy(deep=False)
+    right_join = right.copy(deep=False)
+    for left_key, right_key, left_value, right_value in zip(left_keys, right_keys, left_values, right_values):
+        # keys with nulls are left as they are, pandas.merge orders null categoricals differently
+        if categorical_keys and is_text(left_value) and is_text(right_value) \
+                and not (left_value.hasnans or right_value.hasnans):
+            categories = pd.Index(pd.concat([left_value, right_value]).dropna().unique()).sort_values()
+            dtype = pd.CategoricalDtype(categories)
+            left_value = left_value.astype(dtype)
+            right_value = right_value.astype(dtype)
+        # harmonised keys are converted to another type on at least one side
+        if left_value.dtype != left[left_key].dtype or right_value.dtype != right[right_key].dtype:
+            changed.append((left_key, right_key))
+        left_join[left_key] = left_value
+        right_join[right_key] = right_value
+    if not changed:
+        return pd.merge(left_join, right_join, left_on=left_keys, right_on=right_keys, how=how)
+
+    left_join[LEFT_ROW] = np.arange(len(left))
+    right_join[RIGHT_ROW] = np.arange(len(right))
+    result = pd.merge(left_join, right_join, left_on=left_keys, right_on=right_keys, how=how)
+    left_rows = result.pop(LEFT_ROW).fillna(-1).to_numpy(dtype=np.int64)
+    right_rows = result.pop(RIGHT_ROW).fillna(-1).to_numpy(dtype=np.int64)
+    for left_key, right_key in changed:
+        left_original = take_rows(left[left_key], left_rows, result.index)
+        if left_key == right_key:
+            # a key of the same name is kept once, with the right values for the rows only found on the right
+            if (left_rows < 0).any():
+                left_original = left_original.where(left_rows >= 0,
+                                                    take_rows(right[right_key], right_rows, result.index))
+            result[left_key] = left_original
+        else:
+            result[key_column(result, left_key, SUFFIXES[0])] = left_original
+            result[key_column(result, right_key, SUFFIXES[1])] = take_rows(right[right_key], right_rows,
+                                                                           result.index)
+    return result
+
+
+def take_rows(values, rows, index):
+    """
+    :param rows: position of the row of each joined row, -1 when there is no matching row
+    :return: Series of the values at the given rows, null for the missing rows
+    """
+    # -1 is not a position of the values, it is reindexed to null
+    return values.reset_index(drop=True).reindex(rows).set_axis(index)
+
+
+def key_column(result, key, suffix):
+    """
+    :return: name of a key column in the joined DataFrame, suffixed when the other side has a column of that name
+    """
+    return key if key in result.columns else f"{key}{suffix}"
+
+
+join_engine = JoinEngine()
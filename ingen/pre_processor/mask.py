@@ -2,6 +2,9 @@
 #  All Rights Reserved.
 
 from ingen.pre_processor.process import Process
+from ingen.utils.sql_query_parser import in_predicate, quote_identifier
+
+MAX_PUSHDOWN_VALUES = 1000
 
 
 class Mask(Process):
@@ -16,3 +19,13 @@ class Mask(Process):
     def mask(self, data, on_col, masking_col, masking_data):
         mask_filter = data[on_col].isin(masking_data[masking_col])
         return data[mask_filter].reset_index(drop=True)
+
+    def pushdown_predicate(self, config, source_id, sources_data):
+        masking_data = sources_data.get(config.get('masking_source'))
+        masking_col = config.get('masking_col')
+        if masking_data is None or masking_col not in masking_data.columns:
+            return None
+        masking_values = masking_data[masking_col].drop_duplicates()
+        if len(masking_values) > MAX_PUSHDOWN_VALUES:
+            return None
+        return in_predicate(quote_identifier(config['on_col']), masking_values.tolist())
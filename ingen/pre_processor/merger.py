@@ -3,6 +3,7 @@
 
 import pandas as pd
 
+from ingen.pre_processor.join_engine import join_engine
 from ingen.pre_processor.process import Process
 
 
@@ -29,9 +30,10 @@ class Merger(Process):
         if right_key is not None and not pd.Series(right_key).isin(right_dataframe.columns).all():
             raise KeyError(f"Column '{right_key}' not present in right dataframe")
 
-        return self.merge(left_dataframe, right_dataframe, left_key, right_key, merge_type)
+        return self.merge(left_dataframe, right_dataframe, left_key, right_key, merge_type,
+                          config.get('categorical_keys', False))
 
-    def merge(self, left, right, left_key, right_key, how):
+    def merge(self, left, right, left_key, right_key, how, categorical_keys=False):
         """
         Merge two dataframes
         :param left: left dataframe
@@ -39,6 +41,7 @@ class Merger(Process):
         :param left_key: column name to join on in left dataframe
         :param right_key: column name to join on in right dataframe
         :param how: type of merge to be performed
+        :param categorical_keys: True to join string keys as shared categoricals
         :return: merged dataframe
         """
-        return pd.merge(left, right, left_on=left_key, right_on=right_key, how=how)
+        return join_engine.join(left, right, left_key, right_key, how, categorical_keys)
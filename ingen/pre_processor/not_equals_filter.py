@@ -28,8 +28,10 @@ class NotEqualsFilter(Process):
         else: 
             df = data 
         
-        if df is None or df.empty:
+        if df is None:
             return pd.DataFrame()
+        if df.empty:
+            return df
         
         return self.not_equals_filter(df, cols)
 
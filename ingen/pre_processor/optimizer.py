@@ -0,0 +1,262 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import logging
+from collections import namedtuple
+
+from ingen.pre_processor.join_engine import SUFFIXES, as_list
+
+log = logging.getLogger()
+
+PlannedStep = namedtuple('PlannedStep', ['config', 'columns'])
+
+
+class PreProcessOptimizer:
+    """
+    Rewrites the pre-processing steps of an interface into a plan giving the same data with less work:
+    - runs of adjacent inner merges are reordered, the merge expected to keep the fewest rows first. Row counts and
+      key cardinalities are read from the fetched sources. Merges on non-unique right keys keep their relative order,
+      so that rows come out in the same order, and the columns are put back in their original order after the run.
+    - mask, filter and not_equals_filter steps are moved before the inner merges preceding them, when the columns
+      they read are already present before the merge and the right keys of the merge are unique. A merge on
+      non-unique right keys groups the rows of the same key together, so filtering before it changes the row order.
+      They are not moved before left merges, whose missing right rows turn int columns into float columns even when
+      the filter drops those rows.
+    Steps whose output columns are only known once they run (eg. aggregate, melt) are never moved across, and the
+    steps after them are left in place.
+    A plan is a list of PlannedSteps: the config of the step and the column order restored after it, or None.
+    """
+
+    def __init__(self, sources_data):
+        self._sources_data = sources_data
+        self._first_source = list(sources_data.values())[0]
+        self._cardinalities = {}
+
+    def optimize(self, pre_processes):
+        """
+        :param pre_processes: pre_processing steps of the interface
+        :return: list of PlannedSteps
+        """
+        plan = [PlannedStep(pre_process, None) for pre_process in pre_processes]
+        if not all(isinstance(pre_process, dict) for pre_process in pre_processes):
+            return plan
+        return self.move_filters(self.reorder_merges(plan))
+
+    def reorder_merges(self, plan):
+        columns = list(self._first_source.columns)
+        origins = dict.fromkeys(columns, self._first_source)
+        optimized = []
+        index = 0
+        while index < len(plan) and columns is not None:
+            end = index
+            while end < len(plan) and self._is_reorderable_merge(plan[end].config):
+                end += 1
+            if end - index < 2:
+                optimized.append(plan[index])
+                columns = self._step_columns(plan[index].config, columns, origins)
+                index += 1
+                continue
+
+            merges = [step.config for step in plan[index:end]]
+            ordered = self._order_merges(merges, columns, origins)
+            for merge in merges:
+                columns = self._step_columns(merge, columns, origins)
+            if ordered is None:
+                optimized.extend(plan[index:end])
+            else:
+                log.info(f"Reordered merges of sources {[merge.get('source') for merge in merges]} to "
+                         f"{[merge.get('source') for merge in ordered]}")
+                optimized.extend(PlannedStep(merge, None) for merge in ordered[:-1])
+                optimized.append(PlannedStep(ordered[-1], columns))
+            index = end
+        return optimized + plan[index:]
+
+    def move_filters(self, plan):
+        optimized = []
+        # columns of the data before each step of optimized, None once they cannot be known
+        inputs = []
+        columns = list(self._first_source.columns)
+        for step in plan:
+            position = len(optimized)
+            read_columns = self._read_columns(step.config)
+            if read_columns is not None:
+                while position > 0 and self._can_move_before(step.config, read_columns, optimized[position - 1],
+                                                             inputs[position - 1]):
+                    position -= 1
+            if position < len(optimized):
+                log.info(f"Moved {step.config.get('type')} step before {optimized[position].config.get('type')} "
+                         f"of source {optimized[position].config.get('source')}")
+                inputs.insert(position, inputs[position])
+            else:
+                inputs.append(columns)
+            optimized.insert(position, step)
+            columns = self._step_columns(step.config, columns, {})
+        return optimized
+
+    def _is_reorderable_merge(self, pre_process):
+        return (pre_process.get('type') == 'merge'
+                and pre_process.get('merge_type', 'inner') == 'inner'
+                and pre_process.get('left_key') is not None
+                and pre_process.get('right_key') is not None
+                and self._sources_data.get(pre_process.get('source')) is not None)
+
+    def _order_merges(self, merges, columns, origins):
+        """
+        Orders a run of inner merges greedily, picking the merge with the lowest estimated row factor among the
+        merges whose left keys are present
+        :return: list of merge configs, None if the run is kept in its order
+        """
+        remaining = list(merges)
+        ordered = []
+        columns = list(columns)
+        origins = dict(origins)
+        while remaining:
+            # merges multiplying rows keep their relative order, only the first remaining one can be picked
+            fan_out = next((merge for merge in remaining if not self._unique_right_keys(merge)), None)
+            candidates = []
+            for position, merge in enumerate(remaining):
+                if fan_out is not None and merge is not fan_out and not self._unique_right_keys(merge):
+                    continue
+                right = self._sources_data.get(merge.get('source'))
+                left_keys = as_list(merge.get('left_key'))
+                right_keys = as_list(merge.get('right_key'))
+                if len(left_keys) != len(right_keys) or not all(key in columns for key in left_keys):
+                    continue
+                # suffixed columns would be named after the merge order
+                if overlapping_columns(columns, list(right.columns), left_keys, right_keys):
+                    continue
+                candidates.append((self._row_factor(merge, origins), position, merge))
+            if not candidates:
+                return None
+            _, _, merge = min(candidates, key=lambda candidate: candidate[:2])
+            columns = self._step_columns(merge, columns, origins)
+            ordered.append(merge)
+            remaining.remove(merge)
+        return None if ordered == merges else ordered
+
+    def _row_factor(self, merge, origins):
+        """
+        :return: estimated ratio of the rows after the merge to the rows before it
+        """
+        right = self._sources_data.get(merge.get('source'))
+        if len(right) == 0:
+            return 0.0
+        right_keys = as_list(merge.get('right_key'))
+        left_keys = as_list(merge.get('left_key'))
+        right_distinct = self._cardinality(right, right_keys)
+        fan_out = len(right) / right_distinct
+        origin = origins.get(left_keys[0])
+        if origin is None or any(origins.get(key) is not origin for key in left_keys):
+            return fan_out
+        # share of the left keys found in the right source, assuming the smaller key set is contained in the other
+        left_distinct = self._cardinality(origin, left_keys)
+        return fan_out * min(1.0, right_distinct / max(left_distinct, 1))
+
+    def _cardinality(self, frame, keys):
+        cache_key = (id(frame), tuple(keys))
+        if cache_key not in self._cardinalities:
+            self._cardinalities[cache_key] = len(frame[keys].drop_duplicates())
+        return self._cardinalities[cache_key]
+
+    def _unique_right_keys(self, merge):
+        right = self._sources_data.get(merge.get('source'))
+        return self._cardinality(right, as_list(merge.get('right_key'))) == len(right)
+
+    def _step_columns(self, pre_process, columns, origins):
+        """
+        :param origins: dict updated with the source DataFrame of the columns added by the step
+        :return: columns of the data after the step, None if they are only known once the step runs
+        """
+        if columns is None:
+            return None
+        step_type = pre_process.get('type')
+        if step_type in ('filter', 'mask'):
+            return columns
+        if step_type == 'not_equals_filter':
+            return None if self._reads_other_source(pre_process) else columns
+        if step_type in ('merge', 'outer_join'):
+            right = self._sources_data.get(pre_process.get('source'))
+            if right is None:
+                return None
+            merged_columns = join_columns(columns, list(right.columns), as_list(pre_process.get('left_key')),
+                                          as_list(pre_process.get('right_key')))
+            for column in merged_columns:
+                if column not in columns:
+                    origins.setdefault(column, right)
+            return merged_columns
+        return None
+
+    def _reads_other_source(self, pre_process):
+        return pre_process.get('source') in self._sources_data
+
+    def _read_columns(self, pre_process):
+        """
+        :return: columns read by a row filtering step, None for the other steps
+        """
+        step_type = pre_process.get('type')
+        if step_type == 'mask':
+            return [pre_process.get('on_col')]
+        if step_type == 'filter' and pre_process.get('operator') in ('and', 'or'):
+            return [col.get('col') for col in pre_process.get('cols') or []]
+        if step_type == 'not_equals_filter' and not self._reads_other_source(pre_process):
+            return [col.get('col') for col in pre_process.get('cols') or []]
+        return None
+
+    def _can_move_before(self, pre_process, read_columns, previous, previous_columns):
+        """
+        A row filter gives the same rows before or after an inner merge when it only reads columns of the left
+        data, and in the same order when the right keys are unique. Filter trims the values it compares, so it is
+        not moved before a merge on those columns.
+        """
+        merge = previous.config
+        if previous_columns is None or merge.get('type') != 'merge':
+            return False
+        if merge.get('merge_type', 'inner') != 'inner':
+            return False
+        right = self._sources_data.get(merge.get('source'))
+        left_keys = as_list(merge.get('left_key'))
+        right_keys = as_list(merge.get('right_key'))
+        if right is None or left_keys is None or right_keys is None or not self._unique_right_keys(merge):
+            return False
+        merged_columns = join_columns(previous_columns, list(right.columns), left_keys, right_keys)
+        if not all(column in previous_columns and column in merged_columns for column in read_columns):
+            return False
+        return pre_process.get('type') != 'filter' or not set(read_columns) & set(left_keys)
+
+
+def overlapping_columns(left_columns, right_columns, left_keys, right_keys):
+    """
+    :return: set of the columns present on both sides of a merge, other than the keys of the same name
+    """
+    shared_keys = {right_key for left_key, right_key in zip(left_keys, right_keys) if left_key == right_key}
+    return set(left_columns) & (set(right_columns) - shared_keys)
+
+
+def join_columns(left_columns, right_columns, left_keys, right_keys):
+    """
+    :return: columns of the DataFrame returned by a merge
+    """
+    if left_keys is None or right_keys is None:
+        # merge on the common columns
+        return left_columns + [column for column in right_columns if column not in left_columns]
+    shared_keys = {right_key for left_key, right_key in zip(left_keys, right_keys) if left_key == right_key}
+    overlap = overlapping_columns(left_columns, right_columns, left_keys, right_keys)
+    return ([f"{column}{SUFFIXES[0]}" if column in overlap else column for column in left_columns]
+            + [f"{column}{SUFFIXES[1]}" if column in overlap else column for column in right_columns
+               if column not in shared_keys])
+
+
+def describe(plan):
+    """
+    :return: one line description of the steps of a plan, for the logs
+    """
+    steps = []
+    for number, step in enumerate(plan, start=1):
+        config = step.config
+        if not isinstance(config, dict):
+            steps.append(f"{number}. {config}")
+            continue
+        details = [f"{key}={config[key]}" for key in ('source', 'masking_source', 'merge_type')
+                   if config.get(key) is not None]
+        steps.append(f"{number}. {config.get('type')}" + (f" ({', '.join(details)})" if details else ""))
+    return "; ".join(steps)
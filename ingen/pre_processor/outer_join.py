@@ -1,4 +1,4 @@
-import pandas as pd
+from ingen.pre_processor.join_engine import join_engine
 from ingen.pre_processor.process import Process
 
 
@@ -33,18 +33,20 @@ class OuterJoin(Process):
         if right_key is not None and right_key not in right_dataframe.columns:
             raise KeyError(f"Column '{right_key}' not present in right dataframe")
 
-        return self.outer_merge(left_dataframe, right_dataframe, left_key, right_key)
+        return self.outer_merge(left_dataframe, right_dataframe, left_key, right_key,
+                                config.get('categorical_keys', False))
 
-    def outer_merge(self, left_df, right_df, left_key, right_key):
+    def outer_merge(self, left_df, right_df, left_key, right_key, categorical_keys=False):
         """Perform a full outer join on the two dataframes.
 
         :param: left_df: The left dataframe
         :param: right_df: The right dataframe
         :param: left_key: column name to join on in left dataframe
         :param: right_key: column name to join on in right dataframe
+        :param: categorical_keys: True to join string keys as shared categoricals
         :return: outer joined dataframe with NaN values converted to empty strings
         """
-        result = pd.merge(left_df, right_df, how='outer', left_on=left_key, right_on=right_key)
+        result = join_engine.join(left_df, right_df, left_key, right_key, 'outer', categorical_keys)
         # Convert NaN to empty strings so column_condition formatters can compare with ""
         result = result.fillna('')
         return result
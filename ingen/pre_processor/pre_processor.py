@@ -7,13 +7,16 @@ import time
 from ingen.pre_processor.aggregator import Aggregator
 from ingen.pre_processor.drop_duplicates import DropDuplicates
 from ingen.pre_processor.filter import Filter
+from ingen.pre_processor.join_engine import join_engine
 from ingen.pre_processor.json_array_expander import JsonArrayExpander
 from ingen.pre_processor.mask import Mask
 from ingen.pre_processor.melt import Melt
 from ingen.pre_processor.merger import Merger
 from ingen.pre_processor.union import Union
 from ingen.pre_processor.not_equals_filter import NotEqualsFilter
+from ingen.pre_processor.optimizer import PlannedStep, PreProcessOptimizer, describe
 from ingen.pre_processor.outer_join import OuterJoin
+from ingen.utils.properties import properties
 
 log = logging.getLogger()
 
@@ -42,15 +45,64 @@ class PreProcessor:
     def pre_process(self):
         if self._pre_processes is not None:
             # if pre processing is needed, do that and return the processed data
-            for pre_process in self._pre_processes:
-                processor = self.get_processor(pre_process)
-                log.info(f"Starting pre-processing step: {pre_process}")
-                start = time.time()
-                self._data = processor.execute(pre_process, self._sources_data, self._data)
-                end = time.time()
-                log.info(f"{pre_process} pre-processing step completed in {end - start:.2f} seconds")
+            try:
+                for pre_process, columns in self.plan():
+                    processor = self.get_processor(pre_process)
+                    log.info(f"Starting pre-processing step: {pre_process}")
+                    start = time.time()
+                    self._data = processor.execute(pre_process, self._sources_data, self._data)
+                    if columns is not None:
+                        self._data = self._data[columns]
+                    end = time.time()
+                    log.info(f"{pre_process} pre-processing step completed in {end - start:.2f} seconds")
+            finally:
+                # join indexes are only reused within a run, the sources may be modified after it
+                join_engine.clear()
         return self._data
 
+    def plan(self):
+        """
+        Optimizes the order of the pre-processing steps, unless the 'pre_processing.optimize' property is false
+        :return: list of PlannedSteps
+        """
+        if str(properties.get_property('pre_processing.optimize', 'true')).lower() == 'false':
+            return [PlannedStep(pre_process, None) for pre_process in self._pre_processes]
+        plan = PreProcessOptimizer(self._sources_data).optimize(self._pre_processes)
+        log.info(f"Pre-processing plan: {describe(plan)}")
+        return plan
+
+    @classmethod
+    def pushdown_predicates(cls, pre_processes, source_id, sources_data):
+        """
+        Collects the SQL predicates of the leading pre-processing steps that can be pushed down into the query of the
+        first source. Pushdown stops at the first step that cannot be pushed down. Nothing is pushed down if a later
+        step reads the first source by its id, as that step expects the unfiltered source data.
+        :param pre_processes: pre_processing steps of the interface
+        :param source_id: id of the first source
+        :param sources_data: dictionary of data fetched from the other sources
+        :return: list of tuples of predicate and params
+        """
+        predicates = []
+        for pre_process in pre_processes or []:
+            processor = cls.PRE_PROCESSORS.get(pre_process.get("type"))
+            # steps that are not a Process (eg. union, melt) cannot be pushed down
+            pushdown_predicate = getattr(processor(), 'pushdown_predicate', None) if processor else None
+            predicate = pushdown_predicate(pre_process, source_id, sources_data) if pushdown_predicate else None
+            if predicate is None:
+                break
+            predicates.append(predicate)
+        if predicates and any(cls._reads_source(pre_process, source_id) for pre_process in pre_processes[1:]):
+            return []
+        return predicates
+
+    @staticmethod
+    def _reads_source(pre_process, source_id):
+        for key in ('source', 'masking_source'):
+            value = pre_process.get(key)
+            if value == source_id or (isinstance(value, list) and source_id in value):
+                return True
+        return False
+
     def get_processor(self, pre_process):
         pre_processor = self.PRE_PROCESSORS.get(pre_process.get("type"))
         if pre_processor is not None:
@@ -16,3 +16,16 @@ class Process:
         :return: A Pandas DataFrame with the result of the process
         """
         pass
+
+    def pushdown_predicate(self, config, source_id, sources_data):
+        """
+        Method returning a SQL predicate that selects the rows kept by the processing step, so that the step can be
+        pushed down into the query of a database source. The step is still executed on the fetched data, so the
+        predicate only needs to keep every row that the step keeps.
+        :param config: configuration of the processing step
+        :param source_id: id of the source whose query the predicate is pushed into
+        :param sources_data: dictionary of data fetched from the other sources
+        :return: tuple of the predicate with '%s' placeholders and the list of its params, or None if the step
+                 cannot be pushed down
+        """
+        return None
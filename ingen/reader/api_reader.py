@@ -4,7 +4,7 @@
 import logging
 
 from ingen.utils.app_http.http_util import execute_requests
-from ingen.utils.json_df_convertors import get_json_to_df_convertor, DEFAULT_CONVERTOR
+from ingen.utils.json_df_convertors import get_json_to_df_convertor, DEFAULT_CONVERTOR, concat_frames
 
 
 class APIReader:
@@ -28,5 +28,22 @@ class APIReader:
         param data_key: List of keys (of type dictionary/string) from the api
         param meta: List of meta fields to be read from the response (see meta arg of pandas.json_normalize())
         """
+        if self._reader_params and self._reader_params.get('normalize_per_response'):
+            return self._execute_per_response(data_node, data_key, meta)
         parsed_data = execute_requests(self._requests, self._reader_params)
         return self.json_convertor(parsed_data, data_node, data_key, meta)
+
+    def _execute_per_response(self, data_node, data_key, meta):
+        """
+        Converts every response to a DataFrame as soon as it is received, instead of converting all the responses
+        at once after the last one is received, and concatenates the DataFrames. The DataFrames are streamed in the
+        order of the requests, and the responses are released as soon as the DataFrames before them are received.
+        """
+        json_convertor = self.json_convertor
+        frames = []
+
+        def transform(response):
+            return json_convertor([response], data_node, data_key, meta)
+
+        execute_requests(self._requests, {**self._reader_params, 'transform': transform, 'on_ready': frames.extend})
+        return concat_frames(frames)
@@ -0,0 +1,141 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from queue import Queue
+
+import pandas as pd
+
+from ingen.reader.mysql_reader import MYSQLReader
+from ingen.utils.sql_query_parser import SqlQueryParser, quote_identifier
+
+log = logging.getLogger()
+
+RANGE_PARTITION = 'range'
+MODULO_PARTITION = 'modulo'
+DEFAULT_NUM_PARTITIONS = 4
+
+
+class MYSQLPartitionedReader:
+    """
+    Splits a query into partitions on a column and reads the partitions concurrently, each partition on a
+    connection taken from a pool of connections.
+    """
+
+    def __init__(self, connections, partition_config, fetch_size=None, columnar=None):
+        """
+        :param connections: list of pymysql connections used as the connection pool, all closed once the
+                            query is read
+        :param partition_config: dict containing the partition 'column', 'type' ('range' or 'modulo'),
+                                 'num_partitions' and optional 'lower_bound' and 'upper_bound' for range partitions
+        :param fetch_size: passed to the MYSQLReader of every partition
+        :param columnar: passed to the MYSQLReader of every partition
+        """
+        self._connections = connections
+        self._column = partition_config['column']
+        self._type = partition_config.get('type', RANGE_PARTITION)
+        self._num_partitions = partition_config.get('num_partitions', DEFAULT_NUM_PARTITIONS)
+        self._lower_bound = partition_config.get('lower_bound')
+        self._upper_bound = partition_config.get('upper_bound')
+        self._fetch_size = fetch_size
+        self._columnar = columnar
+        if self._type not in (RANGE_PARTITION, MODULO_PARTITION):
+            raise ValueError(f"Unknown partition type {self._type}. Supported types are range and modulo.")
+        if self._num_partitions < 1:
+            raise ValueError("num_partitions should be greater than 0")
+
+    def execute(self, sql, params=None):
+        try:
+            predicates = self.partition_predicates(sql, params)
+            pool = Queue()
+            for connection in self._connections:
+                pool.put(connection)
+
+            def read_partition(partition):
+                predicate, predicate_params = partition
+                partition_query, partition_params = SqlQueryParser.wrap_query(sql, params, 'ingen_partition',
+                                                                              predicate, predicate_params)
+                connection = pool.get()
+                try:
+                    reader = MYSQLReader(connection, self._fetch_size, self._columnar)
+                    return reader.read(partition_query, partition_params)
+                finally:
+                    pool.put(connection)
+
+            log.info(f"Reading {len(predicates)} partitions of column {self._column} "
+                     f"using {len(self._connections)} connections")
+            with ThreadPoolExecutor(max_workers=len(self._connections)) as executor:
+                dataframes = list(executor.map(read_partition, predicates))
+
+            dataframe = pd.concat(dataframes, ignore_index=True) if len(dataframes) > 1 else dataframes[0]
+            log.info(f"TOTAL RECORDS IN DATAFRAME FROM MYSQL PARTITIONS: {len(dataframe)}")
+            return dataframe
+        finally:
+            for connection in self._connections:
+                connection.close()
+
+    def partition_predicates(self, sql, params=None):
+        """
+        Creates one WHERE clause per partition. The partitions are disjoint and together cover every row of the
+        query, including rows outside the configured bounds and rows with NULL partition column
+        :param sql: SQL query to partition
+        :param params: values bound to the '%s' placeholders of the query
+        :return: list of tuples of the WHERE clause and its params
+        """
+        column = quote_identifier(self._column)
+        if self._type == MODULO_PARTITION:
+            predicates = [(f"ABS(MOD({column}, %s)) = %s", [self._num_partitions, i])
+                          for i in range(self._num_partitions)]
+            predicate, predicate_params = predicates[0]
+            predicates[0] = (f"({predicate} OR {column} IS NULL)", predicate_params)
+            return predicates
+
+        lower_bound, upper_bound = self._lower_bound, self._upper_bound
+        if lower_bound is None or upper_bound is None:
+            min_value, max_value = self._column_bounds(sql, params)
+            lower_bound = min_value if lower_bound is None else lower_bound
+            upper_bound = max_value if upper_bound is None else upper_bound
+        if lower_bound is None or upper_bound is None:
+            return [("1 = 1", [])]
+
+        boundaries = self._range_boundaries(lower_bound, upper_bound)
+        if not boundaries:
+            return [("1 = 1", [])]
+        predicates = [(f"({column} < %s OR {column} IS NULL)", [boundaries[0]])]
+        for start, end in zip(boundaries, boundaries[1:]):
+            predicates.append((f"{column} >= %s AND {column} < %s", [start, end]))
+        predicates.append((f"{column} >= %s", [boundaries[-1]]))
+        return predicates
+
+    def _column_bounds(self, sql, params):
+        column = quote_identifier(self._column)
+        bounds_query, bounds_params = SqlQueryParser.wrap_query(sql, params, 'ingen_bounds', '1 = 1', [],
+                                                                select=f"MIN({column}), MAX({column})")
+        log.info(f"Fetching bounds of partition column {self._column}")
+        with self._connections[0].cursor() as cursor:
+            cursor.execute(bounds_query, bounds_params)
+            return cursor.fetchone()
+
+    def _range_boundaries(self, lower_bound, upper_bound):
+        """
+        Splits [lower_bound, upper_bound] into num_partitions ranges and returns the inner boundaries
+        """
+        if isinstance(lower_bound, (str, date)) or isinstance(upper_bound, (str, date)):
+            lower, upper = pd.Timestamp(lower_bound), pd.Timestamp(upper_bound)
+            if upper <= lower:
+                return []
+            step = (upper - lower) / self._num_partitions
+            return sorted({(lower + step * i).to_pydatetime() for i in range(1, self._num_partitions)})
+
+        if upper_bound <= lower_bound:
+            return []
+        if isinstance(lower_bound, int) and isinstance(upper_bound, int):
+            step = -(-(upper_bound - lower_bound + 1) // self._num_partitions)
+            return [lower_bound + step * i for i in range(1, self._num_partitions)
+                    if lower_bound + step * i <= upper_bound]
+
+        lower, upper = float(lower_bound), float(upper_bound)
+        step = (upper - lower) / self._num_partitions
+        return sorted({lower + step * i for i in range(1, self._num_partitions)})
@@ -3,20 +3,128 @@
 
 import logging
 
+import numpy as np
 import pandas as pd
+from pymysql.constants import FIELD_TYPE
+from pymysql.cursors import SSCursor
 
 log = logging.getLogger()
 
+DEFAULT_FETCH_SIZE = 10000
+
+INTEGER_TYPES = {FIELD_TYPE.TINY, FIELD_TYPE.SHORT, FIELD_TYPE.LONG, FIELD_TYPE.LONGLONG, FIELD_TYPE.INT24,
+                 FIELD_TYPE.YEAR}
+FLOAT_TYPES = {FIELD_TYPE.FLOAT, FIELD_TYPE.DOUBLE}
+DECIMAL_TYPES = {FIELD_TYPE.DECIMAL, FIELD_TYPE.NEWDECIMAL}
+DATETIME_TYPES = {FIELD_TYPE.DATETIME, FIELD_TYPE.TIMESTAMP, FIELD_TYPE.DATE, FIELD_TYPE.NEWDATE}
+STRING_TYPES = {FIELD_TYPE.VARCHAR, FIELD_TYPE.VAR_STRING, FIELD_TYPE.STRING, FIELD_TYPE.ENUM, FIELD_TYPE.SET,
+                FIELD_TYPE.JSON}
+
+
+def to_column_array(values, type_code, null_ok, decimal_as='float', string_storage='python'):
+    """
+    Converts the values of one result set column to a typed array, using the MySQL type of the column
+    :param values: sequence of column values as returned by the cursor
+    :param type_code: MySQL field type from the cursor description
+    :param null_ok: True if the column is nullable
+    :param decimal_as: 'float' to read DECIMAL columns as float64, 'decimal' to keep decimal.Decimal objects
+    :param string_storage: storage of the pandas string dtype used for character columns, 'python' or 'pyarrow'
+    :return: numpy or pandas extension array
+    """
+    try:
+        if type_code in INTEGER_TYPES:
+            return pd.array(values, dtype='Int64') if null_ok else np.array(values, dtype=np.int64)
+        if type_code in FLOAT_TYPES or (type_code in DECIMAL_TYPES and decimal_as == 'float'):
+            return np.array(values, dtype=np.float64)
+        if type_code in DATETIME_TYPES:
+            return pd.to_datetime(pd.Series(values, dtype=object)).to_numpy()
+        if type_code == FIELD_TYPE.TIME:
+            return pd.to_timedelta(pd.Series(values, dtype=object)).to_numpy()
+        if type_code in STRING_TYPES:
+            return pd.array(values, dtype=pd.StringDtype(string_storage))
+    except (TypeError, ValueError, OverflowError) as e:
+        log.debug(f"Could not convert column of type {type_code} to a typed array, keeping objects: {e}")
+    return np.array(values, dtype=object)
+
 
 class MYSQLReader:
-    def __init__(self, connection):
+    def __init__(self, connection, fetch_size=None, columnar=None):
+        """
+        :param connection: pymysql connection used to run the query, closed once the query is read
+        :param fetch_size: when set, the result set is streamed through an unbuffered server-side cursor
+                           and fetched in batches of at most fetch_size rows
+        :param columnar: when set, every fetched batch is converted straight into typed column arrays picked from
+                         the cursor description. Dict with optional 'decimal_as' and 'string_storage', see
+                         to_column_array
+        """
         self._connection = connection
+        self._fetch_size = fetch_size
+        self._columnar = columnar
 
-    def execute(self, sql):
-        log.info(f"Running query: {sql}")
+    def execute(self, sql, params=None):
         try:
-            dataframe = pd.read_sql(sql, self._connection)
-            log.info(f"TOTAL RECORDS IN DATAFRAME FROM MYSQL: {len(dataframe)}")
-            return dataframe
+            return self.read(sql, params)
         finally:
             self._connection.close()
+
+    def read(self, sql, params=None):
+        """
+        Runs the query without closing the connection, so that the connection can be reused for another query
+        :param sql: SQL query
+        :param params: optional list of values bound to the '%s' placeholders of the query
+        :return: A DataFrame created using the result of the query
+        """
+        log.info(f"Running query: {sql}")
+        if self._fetch_size or self._columnar:
+            dataframe = self._concat_batches(self._stream(sql, params))
+        else:
+            dataframe = pd.read_sql(sql, self._connection, params=params)
+        log.info(f"TOTAL RECORDS IN DATAFRAME FROM MYSQL: {len(dataframe)}")
+        return dataframe
+
+    def _stream(self, sql, params=None):
+        fetch_size = self._fetch_size or DEFAULT_FETCH_SIZE
+        cursor = self._connection.cursor(SSCursor)
+        try:
+            cursor.execute(sql, params)
+            if cursor.description is None:
+                return
+            description = cursor.description
+            columns = [column[0] for column in description]
+            batch_count = 0
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                batch_count += 1
+                log.info(f"Fetched batch {batch_count} of {len(rows)} records from MYSQL")
+                yield self._to_dataframe(rows, description)
+            if batch_count == 0:
+                yield self._to_dataframe([], description)
+        finally:
+            cursor.close()
+
+    def _to_dataframe(self, rows, description):
+        columns = [column[0] for column in description]
+        if not self._columnar:
+            if not rows:
+                return pd.DataFrame(columns=columns)
+            return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+        options = self._columnar if isinstance(self._columnar, dict) else {}
+        column_values = list(zip(*rows)) if rows else [()] * len(description)
+        arrays = [to_column_array(values, column[1], column[6],
+                                  options.get('decimal_as', 'float'),
+                                  options.get('string_storage', 'python'))
+                  for values, column in zip(column_values, description)]
+        dataframe = pd.DataFrame(dict(enumerate(arrays)), copy=False)
+        dataframe.columns = columns
+        return dataframe
+
+    def _concat_batches(self, batches):
+        batches = list(batches)
+        if not batches:
+            return pd.DataFrame()
+        if len(batches) == 1:
+            return batches[0]
+        return pd.concat(batches, ignore_index=True)
@@ -3,16 +3,28 @@
 
 import asyncio
 import logging
+import random
+import time
 from collections import namedtuple
+from contextlib import nullcontext
 
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientError, ClientTimeout
 
+from ingen.utils.app_http.circuit_breaker import PROBE
+from ingen.utils.app_http.rate_limit import parse_retry_after
 from ingen.utils.app_http.success_criterias import status_criteria, DEFAULT_STATUS_CRITERIA_OPTIONS
 
 logger = logging.getLogger()
 
 HTTPResponse = namedtuple('HTTPResponse', ['status', 'headers', 'data'])
 
+RETRY_AFTER_STATUSES = {429, 503}
+JITTER_RATIO = 0.1
+EXPONENTIAL_BACKOFF = 'exponential'
+LINEAR_BACKOFF = 'linear'
+DEFAULT_BACKOFF = LINEAR_BACKOFF
+DEFAULT_MAX_BACKOFF = 60
+
 
 async def http_retry_request(
         session: ClientSession,
@@ -23,23 +35,38 @@ async def http_retry_request(
         interval_increment=2,
         success_criteria=status_criteria,
         criteria_options=DEFAULT_STATUS_CRITERIA_OPTIONS,
+        limiter=None,
+        rate_limiter=None,
+        backoff=DEFAULT_BACKOFF,
+        max_backoff=DEFAULT_MAX_BACKOFF,
+        circuit_breaker=None,
+        metrics=None,
         **kwargs):
     """
     Asynchronously retries the HTTP call until the given success_criteria (a callable) is succeeded or
-    number of retries reaches to zero
+    number of retries reaches to zero. Timeouts and connection errors are retried as well.
     :param session: aiohttp ClientSession
     :param method: HTTP Methods
     :param url: Request URL
     :param retries: How many times to retry
-    :param interval: How long to wait before retrying (in seconds)
-    :param interval_increment: Number of seconds added to interval when retrying.
+    :param interval: Base wait before retrying (in seconds)
+    :param interval_increment: Number of seconds added to interval for every retry, when backoff is 'linear'.
                                So if a request fails with following params:
                                retires = 4, interval = 2, interval_increment = 2
                                4 retries will be made after 2, 4, 6, and 8 seconds.
     :param success_criteria: a callable that defines the success_criteria,
                              see 'src.utils.app_http.success_criterias.py' for more
     :param criteria_options: dict-like options required by success_criteria method
-    :param kwargs: additional kwargs for HTTP methods, eg., headers, auth, data etc
+    :param limiter: optional AdaptiveConcurrencyLimiter, every attempt waits for a free slot of the limiter
+    :param rate_limiter: optional TokenBucket of the host, every attempt waits for a token. When a 429 or 503
+                         response has a Retry-After header, the retry waits for the given time and the whole host
+                         is paused for that time
+    :param backoff: 'linear' (default) waits interval + (n - 1) * interval_increment before the n-th retry,
+                    'exponential' waits a random time between 0 and interval * 2^n (full jitter)
+    :param max_backoff: maximum wait before a retry (in seconds)
+    :param circuit_breaker: optional CircuitBreaker of the host, no attempt is made while the circuit is open
+    :param metrics: optional HTTPMetrics recording the latency, bytes, decode time and retries of the attempts
+    :param kwargs: additional kwargs for HTTP methods, eg., headers, auth, data, timeout etc
     :return: If successful, returns a namedtuple HTTPResponse containing response status, headers and body,
              otherwise None
     """
@@ -47,37 +74,109 @@ async def http_retry_request(
     _method = method.lower()
     if _method not in ["get", "post", "put", "patch", "delete"]:
         raise ValueError("Unsupported HTTP method passed for retry")
+    body = kwargs.get('data')
+    bytes_out = len(body.encode('utf-8')) if isinstance(body, str) else len(body) if isinstance(body, bytes) else 0
+
+    for attempt in range(retries + 1):
+        permit = circuit_breaker.allow() if circuit_breaker is not None else True
+        if not permit:
+            logger.warning(f"Circuit of {circuit_breaker.name} is open, skipping {_method.upper()} {url}")
+            return None
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        http_response = None
+        retry_reason = None
+        start = None
+        decode_time = 0.0
+        bytes_in = 0
+        try:
+            async with limiter.attempt() if limiter else nullcontext() as slot:
+                start = time.monotonic()
+                async with getattr(session, _method)(url, **kwargs) as response:
+                    logger.info(f"awaiting {_method.upper()} {url}")
+
+                    try:
+                        status = response.status
+                        if slot is not None:
+                            slot.status = status
+                        headers = response.headers
+
+                        # the body is read once, decompressed, and kept by the response for json() and text()
+                        body = await response.read()
+                        bytes_in = len(body) if body else 0
+                        decode_start = time.monotonic()
+                        if headers.get('Content-Type') and 'application/json' in headers.get('Content-Type', ''):
+                            data = await response.json()
+                        else:
+                            data = await response.text()
+                        decode_time = time.monotonic() - decode_start
+                    except (asyncio.TimeoutError, ClientError):
+                        raise
+                    except Exception as e:
+                        raise ConnectionError(f"Error occurred while getting response from url {url}: {e}")
+
+                    http_response = HTTPResponse(status, headers, data)
+                    logger.info(f"Response {status} for {_method.upper()} {url}")
+                    logger.debug(f"Response for {url}: {http_response}")
+        except asyncio.TimeoutError:
+            logger.warning(f"Request to {url} timed out")
+            retry_reason = 'timeout'
+        except ClientError as e:
+            logger.warning(f"Request to {url} failed: {e!r}")
+            retry_reason = 'connection_error'
+        except Exception:
+            if circuit_breaker is not None:
+                circuit_breaker.record(False, permit is PROBE)
+            raise
+        finally:
+            if metrics is not None and start is not None:
+                metrics.record_attempt(time.monotonic() - start, bytes_in, bytes_out, decode_time)
+        if circuit_breaker is not None:
+            circuit_breaker.record(http_response is not None and http_response.status < 500
+                                   and http_response.status != 429, permit is PROBE)
+
+        if http_response is not None and success_criteria(http_response, criteria_options):
+            return http_response
+
+        if attempt == retries or (circuit_breaker is not None and circuit_breaker.is_open()):
+            break
+        if metrics is not None:
+            if retry_reason is None:
+                retry_reason = f'status_{http_response.status}' if http_response.status >= 400 else 'criteria'
+            metrics.record_retry(retry_reason)
+        wait_time = backoff_time(attempt + 1, interval, interval_increment, backoff, max_backoff)
+        retry_after = parse_retry_after(http_response.headers.get('Retry-After')) \
+            if http_response is not None and http_response.status in RETRY_AFTER_STATUSES else None
+        if retry_after is not None:
+            # jitter spreads the retries of concurrent requests that were throttled together
+            wait_time = retry_after + random.uniform(0, retry_after * JITTER_RATIO)
+            if rate_limiter is not None:
+                rate_limiter.pause(retry_after)
+        logger.info(f"Retrying in {wait_time:.2f} seconds")
+        await asyncio.sleep(wait_time)
 
-    attempt = retries + 1
-    should_retry = None
-
-    while attempt != 0:
-        attempt -= 1
-        wait_time = interval
-        if should_retry:
-            wait_time = wait_time + interval_increment
-            await asyncio.sleep(wait_time)
-        async with getattr(session, _method)(url, **kwargs) as response:
-            logger.info(f"awaiting {_method.upper()} {url}")
-
-            try:
-                status = response.status
-                headers = response.headers
-
-                if headers.get('Content-Type') and 'application/json' in headers.get('Content-Type', ''):
-                    data = await response.json()
-                else:
-                    data = await response.text()
-            except Exception as e:
-                raise ConnectionError(f"Error occurred while getting response from url {url}: {e}")
+    logger.error(f"Could not get a successful response for url: {url} after {retries} retries.")
 
-            http_response = HTTPResponse(status, headers, data)
-            logger.info(f"Response for {url}: {http_response}")
 
-            if success_criteria(http_response, criteria_options):
-                return http_response
+def backoff_time(retry, interval, interval_increment, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF):
+    """
+    Returns the wait before the given retry
+    :param retry: number of the retry, starting at 1
+    :return: wait time in seconds
+    """
+    if backoff == LINEAR_BACKOFF:
+        wait_time = min(interval + (retry - 1) * interval_increment, max_backoff)
+        return wait_time + random.uniform(0, wait_time * JITTER_RATIO)
+    return random.uniform(0, min(interval * 2 ** retry, max_backoff))
 
-            should_retry = True
-            logger.info(f"Retrying in {wait_time} seconds")
 
-    logger.error(f"Could not get a successful response for url: {url} after {retries} retries.")
+def client_timeout(config):
+    """
+    Creates the timeout of a request
+    :param config: dict with optional 'connect', 'read' and 'total' timeouts in seconds
+    :return: aiohttp ClientTimeout, None if no timeout is configured
+    """
+    if not config:
+        return None
+    return ClientTimeout(total=config.get('total'), sock_connect=config.get('connect'),
+                         sock_read=config.get('read'))
@@ -0,0 +1,124 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import logging
+import time
+from collections import deque
+
+log = logging.getLogger()
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+# value of allow for the probe request of a half-open circuit
+PROBE = 'probe'
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of a host. The circuit opens when at least 'min_requests' attempts were made in the last
+    'window' seconds and the share of failed attempts reaches 'error_rate'. While the circuit is open, requests to
+    the host fail immediately instead of being retried. After 'open_seconds', a single probe request is let through
+    (half-open): the circuit closes if it succeeds and opens again if it fails. The outcomes of the other requests,
+    eg. sent before the circuit opened, are ignored until the outcome of the probe is recorded.
+    An attempt fails when it times out, cannot connect, or gets a 429 or 5xx response.
+    """
+
+    def __init__(self, name, error_rate=0.5, window=60, min_requests=10, open_seconds=30):
+        """
+        :param name: name of the circuit used in the logs, eg. the host
+        """
+        if not 0 < error_rate <= 1:
+            raise ValueError("error_rate should be between 0 and 1")
+        self.name = name
+        self._error_rate = error_rate
+        self._window = window
+        self._min_requests = min_requests
+        self._open_seconds = open_seconds
+        self._outcomes = deque()
+        self._failures = 0
+        self._state = CLOSED
+        self._opened_at = None
+        self._probing = False
+
+    @classmethod
+    def from_config(cls, name, config):
+        """
+        :param name: name of the circuit
+        :param config: True, or dict with optional 'error_rate', 'window', 'min_requests' and 'open_seconds'
+        :return: CircuitBreaker, None if no circuit breaker is configured
+        """
+        if not config:
+            return None
+        if not isinstance(config, dict):
+            config = {}
+        return cls(name,
+                   error_rate=config.get('error_rate', 0.5),
+                   window=config.get('window', 60),
+                   min_requests=config.get('min_requests', 10),
+                   open_seconds=config.get('open_seconds', 30))
+
+    @property
+    def state(self):
+        return self._state
+
+    def is_open(self):
+        """
+        :return: True while requests are rejected, ie. the circuit is open and not ready for a probe
+        """
+        return self._state == OPEN and time.monotonic() < self._opened_at + self._open_seconds
+
+    def allow(self):
+        """
+        :return: True if a request can be sent, PROBE if it is sent as the probe of the half-open circuit, False if
+                 it has to fail immediately
+        """
+        if self._state == CLOSED:
+            return True
+        if self._state == OPEN:
+            if self.is_open():
+                return False
+            log.info(f"Circuit of {self.name} half-open, sending a probe request")
+            self._state = HALF_OPEN
+            self._probing = False
+        if self._probing:
+            return False
+        self._probing = True
+        return PROBE
+
+    def record(self, success, probe=False):
+        """
+        Records the outcome of an attempt let through by allow
+        :param probe: True if allow returned PROBE for the attempt
+        """
+        now = time.monotonic()
+        if self._state == HALF_OPEN:
+            if not probe:
+                return
+            self._probing = False
+            if success:
+                log.info(f"Probe request to {self.name} succeeded, closing the circuit")
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._failures = 0
+            else:
+                self._open(now)
+            return
+        if self._state == OPEN:
+            return
+
+        self._outcomes.append((now, success))
+        self._failures += 0 if success else 1
+        while self._outcomes and self._outcomes[0][0] < now - self._window:
+            _, old_success = self._outcomes.popleft()
+            self._failures -= 0 if old_success else 1
+        if len(self._outcomes) >= self._min_requests and self._failures / len(self._outcomes) >= self._error_rate:
+            log.warning(f"{self._failures} of the last {len(self._outcomes)} requests to {self.name} failed")
+            self._open(now)
+
+    def _open(self, now):
+        log.warning(f"Circuit of {self.name} open, requests fail immediately for {self._open_seconds} seconds")
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._failures = 0
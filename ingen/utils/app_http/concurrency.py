@@ -0,0 +1,118 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+log = logging.getLogger()
+
+ADAPTIVE_CONCURRENCY = 'adaptive'
+THROTTLE_STATUSES = {429, 503}
+DEFAULT_MAX_TASKS = 32
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of HTTP requests in flight using additive increase / multiplicative decrease (AIMD).
+    The limit grows by one every 'limit' healthy responses, a response is healthy when it is not throttled and its
+    latency stays within 'latency_tolerance' times the lowest latency seen. The limit is multiplied by
+    'backoff_ratio' when a request is throttled (429 or 503), times out or fails to connect.
+    """
+
+    def __init__(self, min_limit=1, max_limit=DEFAULT_MAX_TASKS, initial_limit=None, latency_tolerance=2.0,
+                 backoff_ratio=0.5):
+        if min_limit < 1 or max_limit < min_limit:
+            raise ValueError("adaptive concurrency needs 1 <= min_tasks <= max_tasks")
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._limit = float(min(max(initial_limit or min_limit, min_limit), max_limit))
+        self._latency_tolerance = latency_tolerance
+        self._backoff_ratio = backoff_ratio
+        self._in_flight = 0
+        self._condition = None
+        self._min_latency = None
+        self._last_decrease = None
+        self.peak_in_flight = 0
+        self.decreases = 0
+
+    @classmethod
+    def from_config(cls, config, tasks_len=1):
+        """
+        :param config: 'adaptive', or dict with 'type': 'adaptive' and optional 'min_tasks', 'max_tasks',
+                       'latency_tolerance' and 'backoff_ratio'
+        :param tasks_len: initial concurrency
+        :return: AdaptiveConcurrencyLimiter, None if concurrency is not adaptive
+        """
+        if isinstance(config, str):
+            config = {'type': config}
+        if not config or config.get('type') != ADAPTIVE_CONCURRENCY:
+            return None
+        min_limit = config.get('min_tasks', 1)
+        return cls(min_limit=min_limit,
+                   max_limit=config.get('max_tasks', max(DEFAULT_MAX_TASKS, min_limit)),
+                   initial_limit=tasks_len,
+                   latency_tolerance=config.get('latency_tolerance', 2.0),
+                   backoff_ratio=config.get('backoff_ratio', 0.5))
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def max_limit(self):
+        return self._max_limit
+
+    @asynccontextmanager
+    async def attempt(self):
+        """
+        Waits for a free slot, and records the outcome of the HTTP attempt made in the context.
+        The status of the response has to be set on the yielded attempt.
+        """
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self._in_flight)
+
+        attempt = Attempt()
+        start = time.monotonic()
+        failed = False
+        try:
+            yield attempt
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self._update(attempt.status, time.monotonic() - start, failed)
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def _update(self, status, latency, failed):
+        now = time.monotonic()
+        if failed or status in THROTTLE_STATUSES:
+            # requests in flight when the server starts throttling fail together, back off once per round trip
+            if self._last_decrease is None or now - self._last_decrease > (self._min_latency or 0):
+                self._limit = max(self._min_limit, self._limit * self._backoff_ratio)
+                self._last_decrease = now
+                self.decreases += 1
+            return
+        if status is None:
+            return
+        self._min_latency = latency if self._min_latency is None else min(self._min_latency, latency)
+        if latency <= self._min_latency * self._latency_tolerance:
+            self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+
+    def summary(self):
+        if self._min_limit == self._max_limit:
+            return f"concurrency limit {self.limit}, peak {self.peak_in_flight} requests in flight"
+        return (f"adaptive concurrency limit {self.limit} (min {self._min_limit}, max {self._max_limit}), "
+                f"peak {self.peak_in_flight} requests in flight, backed off {self.decreases} times")
+
+
+class Attempt:
+    """Outcome of an HTTP attempt made through an AdaptiveConcurrencyLimiter"""
+    status = None
@@ -0,0 +1,107 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import defaultdict
+
+from ingen.utils.app_http.aiohttp_retry import HTTPResponse
+
+log = logging.getLogger()
+
+RECORD = 'record'
+REPLAY = 'replay'
+
+
+class HTTPArchive:
+    """
+    Archive of the HTTP exchanges of a run, stored as gzip compressed JSON lines. In record mode, the response of
+    every request is kept and written to the archive when the run ends. In replay mode, requests are answered from
+    the archive and no request is sent over the network. A request sent more than once gets the recorded responses
+    in the order they were recorded, the last one being repeated.
+    """
+
+    def __init__(self, path, mode):
+        """
+        :param path: path of the archive
+        :param mode: 'record' or 'replay'
+        """
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown HTTP archive mode {mode}. Supported modes are {RECORD}, {REPLAY}")
+        self.path = path
+        self.mode = mode
+        self._exchanges = []
+        self._responses = defaultdict(list)
+        self._replayed = defaultdict(int)
+        if mode == REPLAY:
+            self._load()
+
+    @property
+    def replaying(self):
+        return self.mode == REPLAY
+
+    @staticmethod
+    def key(request):
+        """
+        :return: sha256 of the method, url and body of the request. Headers are left out, they may hold credentials
+        """
+        data = request.data
+        if isinstance(data, bytes):
+            data = hashlib.sha256(data).hexdigest()
+        key = json.dumps([request.method.upper(), request.url, data], default=str)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def record(self, request, response):
+        """
+        :param request: HTTPRequest
+        :param response: HTTPResponse, None for a failed request
+        """
+        exchange = {'key': self.key(request), 'method': request.method.upper(), 'url': request.url, 'response': None}
+        if response is not None:
+            exchange['response'] = {'status': response.status, 'headers': dict(response.headers),
+                                    'data': response.data}
+        self._exchanges.append(exchange)
+
+    def replay(self, request):
+        """
+        :param request: HTTPRequest
+        :return: the recorded HTTPResponse, None if the request failed or was not recorded
+        """
+        key = self.key(request)
+        responses = self._responses.get(key)
+        if not responses:
+            log.error(f"No recorded response for {request.method.upper()} {request.url} in {self.path}")
+            return None
+        index = min(self._replayed[key], len(responses) - 1)
+        self._replayed[key] += 1
+        response = responses[index]
+        if response is None:
+            return None
+        return HTTPResponse(response['status'], response['headers'], response['data'])
+
+    def save(self):
+        """
+        Writes the recorded exchanges to the archive
+        """
+        if self.mode != RECORD:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # written to a temporary file first, so that a failed run does not leave a truncated archive
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(file_descriptor, 'wb') as raw_file, gzip.open(raw_file, 'wt', encoding='utf-8') as file:
+            for exchange in self._exchanges:
+                file.write(json.dumps(exchange, default=str) + '\n')
+        os.replace(temp_path, self.path)
+        log.info(f"Recorded {len(self._exchanges)} HTTP exchanges to {self.path}")
+
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as file:
+            for line in file:
+                exchange = json.loads(line)
+                self._responses[exchange['key']].append(exchange['response'])
+        log.info(f"Replaying {sum(map(len, self._responses.values()))} HTTP exchanges from {self.path}")
@@ -0,0 +1,177 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import asyncio
+import atexit
+import logging
+from collections import Counter
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import ClientSession
+
+from ingen.utils.app_http.circuit_breaker import CircuitBreaker
+from ingen.utils.app_http.rate_limit import TokenBucket, parse_rate_limit
+from ingen.utils.properties import properties
+
+log = logging.getLogger()
+
+# aiohttp defaults, except for a longer keep-alive and DNS cache, so that connections and DNS lookups are reused
+# between the batches of a high-fanout fetch
+DEFAULT_CONNECTION = {
+    'limit': 100,
+    'limit_per_host': 0,
+    'keepalive_timeout': 30,
+    'ttl_dns_cache': 300,
+    'read_bufsize': 2 ** 16
+}
+
+
+class HTTPClientManager:
+    """
+    Run-scoped owner of the event loop and the aiohttp ClientSessions used by API sources and destinations.
+    The loop and the sessions are kept alive between requests, so that keep-alive connections to the same hosts
+    are reused by every API read and write of the run instead of redoing the TCP and TLS handshakes.
+    It also holds the per-host rate limiters, so that a host quota is shared by all the sources and destinations
+    calling the host, the per-host circuit breakers, the counters of the run metrics and the optional HTTPArchive
+    recording or replaying the HTTP exchanges of the run.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._sessions = {}
+        self._rate_limiters = {}
+        self._circuit_breakers = {}
+        self.metrics = Counter()
+        self.archive = None
+
+    @property
+    def loop(self):
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def run(self, coroutine):
+        """
+        Runs the coroutine until it completes on the loop of the run
+        :param coroutine: coroutine to run
+        :return: result of the coroutine
+        """
+        return self.loop.run_until_complete(coroutine)
+
+    async def session(self, ssl=True, connection=None):
+        """
+        Returns the session of the given connector settings, creating it on first use. Must be awaited from a
+        coroutine run by this manager, as sessions are bound to the loop of the run.
+        :param ssl: False to turn off SSL certificate validation
+        :param connection: dict with optional 'limit', 'limit_per_host', 'keepalive_timeout', 'ttl_dns_cache' and
+                           'read_bufsize', see DEFAULT_CONNECTION
+        :return: aiohttp ClientSession
+        """
+        settings = connection_settings(connection)
+        key = (ssl, tuple(sorted(settings.items())))
+        session = self._sessions.get(key)
+        if session is None or session.closed:
+            log.info(f"Creating HTTP session with ssl={ssl}, {settings}")
+            connector = aiohttp.TCPConnector(ssl=ssl,
+                                             limit=settings['limit'],
+                                             limit_per_host=settings['limit_per_host'],
+                                             keepalive_timeout=settings['keepalive_timeout'],
+                                             ttl_dns_cache=settings['ttl_dns_cache'])
+            session = ClientSession(connector=connector, read_bufsize=settings['read_bufsize'])
+            self._sessions[key] = session
+        return session
+
+    def rate_limiter(self, url, rate_limit=None):
+        """
+        Returns the rate limiter of the host of the url. The limit of a host is the most restrictive of the
+        'rate_limit' given by the sources and destinations calling it and the 'http.rate_limit.<host>' property.
+        :param url: request URL
+        :param rate_limit: requests per second, or dict with 'requests_per_second' and optional 'burst'
+        :return: TokenBucket, None if the host has no rate limit
+        """
+        host = urlsplit(url).netloc
+        limiter = self._rate_limiters.get(host)
+        host_rate_limit = properties.get_property(f'http.rate_limit.{host}')
+        for limit in (parse_rate_limit(rate_limit), parse_rate_limit(host_rate_limit)):
+            if limit is None:
+                continue
+            if limiter is None:
+                log.info(f"Rate limiting {host} to {limit[0]} requests per second")
+                limiter = self._rate_limiters[host] = TokenBucket(*limit)
+            else:
+                limiter.tighten(*limit)
+        return limiter
+
+    def circuit_breaker(self, url, config=None):
+        """
+        Returns the circuit breaker of the host of the url, created from the config of the first source or
+        destination configuring one for the host
+        :param url: request URL
+        :param config: True, or dict with optional 'error_rate', 'window', 'min_requests' and 'open_seconds'
+        :return: CircuitBreaker, None if the host has no circuit breaker
+        """
+        host = urlsplit(url).netloc
+        breaker = self._circuit_breakers.get(host)
+        if breaker is None and config:
+            breaker = self._circuit_breakers[host] = CircuitBreaker.from_config(host, config)
+        return breaker
+
+    def record(self, name, count=1):
+        """
+        Adds count to the run metric of the given name
+        """
+        self.metrics[name] += count
+
+    def close(self):
+        """
+        Logs the run metrics, saves the recorded HTTP exchanges, and closes the sessions and their connection pools,
+        and then the loop. The manager can be used again after closing, a new loop and new sessions are created on
+        demand.
+        """
+        if self.archive is not None:
+            self.archive.save()
+        if self.metrics:
+            metrics = ", ".join(f"{name}={count}" for name, count in sorted(self.metrics.items()))
+            log.info(f"HTTP run metrics: {metrics}")
+            self.metrics.clear()
+        if self._loop is None or self._loop.is_closed():
+            self._sessions.clear()
+            self._rate_limiters.clear()
+            self._circuit_breakers.clear()
+            return
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._rate_limiters.clear()
+        self._circuit_breakers.clear()
+        try:
+            self._loop.run_until_complete(self._close_sessions(sessions))
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    @staticmethod
+    async def _close_sessions(sessions):
+        for session in sessions:
+            await session.close()
+        if sessions:
+            # gives the transports of the closed connections a chance to shut down before the loop is closed
+            await asyncio.sleep(0.25)
+
+
+def connection_settings(connection):
+    """
+    :param connection: dict of connection settings, None for the defaults
+    :return: DEFAULT_CONNECTION updated with the given settings
+    """
+    connection = connection or {}
+    unknown_settings = set(connection) - set(DEFAULT_CONNECTION)
+    if unknown_settings:
+        raise ValueError(f"Unknown connection settings {', '.join(sorted(unknown_settings))}. "
+                         f"Supported settings are {', '.join(DEFAULT_CONNECTION)}")
+    return {**DEFAULT_CONNECTION, **connection}
+
+
+client_manager = HTTPClientManager()
+atexit.register(client_manager.close)
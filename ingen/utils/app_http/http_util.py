@@ -3,12 +3,20 @@
 
 import asyncio
 import logging
+import time
 from asyncio import CancelledError
+from dataclasses import replace
+from urllib.parse import urlsplit
 
-import aiohttp
-from aiohttp import ClientSession, BasicAuth
+from aiohttp import BasicAuth
 
-from ingen.utils.app_http.aiohttp_retry import http_retry_request, HTTPResponse
+from ingen.utils.app_http.aiohttp_retry import http_retry_request, HTTPResponse, client_timeout, \
+    DEFAULT_BACKOFF, DEFAULT_MAX_BACKOFF
+from ingen.utils.app_http.concurrency import AdaptiveConcurrencyLimiter
+from ingen.utils.app_http.http_client import client_manager
+from ingen.utils.app_http.metrics import HTTPMetrics
+from ingen.utils.app_http.pagination import get_paginator
+from ingen.utils.app_http.response_cache import ResponseCache
 from ingen.utils.app_http.success_criterias import status_criteria, DEFAULT_STATUS_CRITERIA_OPTIONS
 from ingen.utils.properties import Properties
 
@@ -17,100 +25,349 @@ log = logging.getLogger()
 
 def execute_requests(requests, request_params):
     """
-    Asynch execution of requests
+    Asynch execution of requests, on the event loop and sessions shared by the whole run
     :param requests:        list of HTTPRequests
-    :param request_params:  additional config parameters for app_http request like retries, intervals, etc
-    :return: list of response body
-    """
-    http_responses = asyncio.run(execute(requests, request_params))
-    log.info(f"responses length: {len(http_responses)}")
-    data = list(map(lambda res: res.data, filter(lambda res: type(res) is HTTPResponse, http_responses)))
-    log.info(f"data len after filtering errors: {len(data)}")
-    failed_responses = list((filter(lambda res: type(res) is not HTTPResponse, http_responses)))
+    :param request_params:  additional config parameters for app_http request like retries, intervals, etc. In
+                            streaming mode, an 'on_ready' function is called with the bodies of every contiguous run
+                            of successful responses as soon as all the responses before it are received
+    :return: list of response body, in the order of the requests. Empty in streaming mode, as the bodies are passed
+             to on_ready
+    """
+    metrics = HTTPMetrics()
+    request_params = {**request_params, 'metrics': metrics}
+    on_ready = request_params.get('on_ready')
+    streamed = {'received': 0, 'failed': []}
+    if on_ready is not None:
+        def emit(responses):
+            streamed['received'] += len(responses)
+            streamed['failed'].extend(res for res in responses if type(res) is not HTTPResponse)
+            on_ready([res.data for res in responses if type(res) is HTTPResponse])
+
+        request_params['on_ready'] = emit
+    if request_params.get('pagination'):
+        http_responses = client_manager.run(execute_paginated(requests, request_params))
+    else:
+        http_responses = client_manager.run(execute(requests, request_params))
+    if on_ready is None:
+        log.info(f"responses length: {len(http_responses)}")
+        data = list(map(lambda res: res.data, filter(lambda res: type(res) is HTTPResponse, http_responses)))
+        log.info(f"data len after filtering errors: {len(data)}")
+        failed_responses = list((filter(lambda res: type(res) is not HTTPResponse, http_responses)))
+    else:
+        log.info(f"responses length: {streamed['received']}, streamed to on_ready")
+        data = []
+        failed_responses = streamed['failed']
     log.error(f"{len(failed_responses)} error in app_http responses: {failed_responses}")
+    log.info(f"HTTP metrics of {len(requests)} requests to {request_hosts(requests)}: {metrics.summary()}")
+    for name, count in metrics.counters().items():
+        client_manager.record(name, count)
     if failed_responses and not request_params.get('ignore_failure', True):
         raise Exception("Failure in executing requests.")
     return data
 
 
-async def execute(requests, request_params):
+async def execute(requests, request_params, limiter=None):
+    """
+    Executes the requests concurrently, see 'throttling' in the config reference
+    :param requests: list of HTTPRequests
+    :param request_params: additional config parameters for app_http request like retries, intervals, etc
+    :param limiter: optional AdaptiveConcurrencyLimiter shared with other requests, by default one is created from
+                    the 'concurrency' config
+    :return: list of HTTPResponses in the order of the requests, None for a failed request or a response passed to
+             the 'on_ready' function of request_params, see OrderedResults
+    """
     request_params['size'] = len(requests)
     log.info(f"Starting to process {len(requests)} requests")
-    results = []
+    results = OrderedResults(len(requests), request_params.get('on_ready'))
     queue = asyncio.Queue(maxsize=request_params.get('queue_size', 1))
     ssl = request_params.get('ssl', True)
     if not ssl:
         log.warning("SSL is turned off")
-    connector = aiohttp.TCPConnector(ssl=request_params.get('ssl', True))
-
-    async with ClientSession(connector=connector) as session:
-        # producer
-        fill_task = asyncio.create_task(fill_queue(requests, queue))
-        # consumers
-        tasks = []
-        tasks_len = request_params.get('tasks_len', 1)
-        log.info(f"PROC TASK: Creating {tasks_len} tasks to process queue")
-        for _ in range(tasks_len):
-            tasks.append(
-                asyncio.create_task(fetch(session, queue, request_params, results))
-            )
-
-        # wait for the producers to finish
-        await asyncio.gather(fill_task)
-
-        # wait for the remaining task to be processed
-        await queue.join()
-
-        # cancel the consumers
-        for task in tasks:
-            task.cancel()
+    session = await client_manager.session(ssl, request_params.get('connection'))
 
-    return results
+    # producer
+    fill_task = asyncio.create_task(fill_queue(requests, queue))
+    # consumers
+    tasks = []
+    tasks_len = request_params.get('tasks_len', 1)
+    if limiter is None:
+        limiter = AdaptiveConcurrencyLimiter.from_config(request_params.get('concurrency'), tasks_len)
+    if limiter is not None:
+        # the limiter decides how many of the consumers have a request in flight
+        tasks_len = limiter.max_limit
+    log.info(f"PROC TASK: Creating {tasks_len} tasks to process queue")
+    start = time.monotonic()
+    for _ in range(tasks_len):
+        tasks.append(
+            asyncio.create_task(fetch(session, queue, request_params, results, limiter))
+        )
+
+    # wait for the producers to finish
+    await asyncio.gather(fill_task)
+
+    # wait for the remaining task to be processed
+    await queue.join()
+
+    # cancel the consumers and wait for them, so that no task is left pending on the shared loop
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    elapsed = time.monotonic() - start
+    throughput = results.completed / elapsed if elapsed > 0 else 0
+    log.info(f"Processed {results.completed} requests in {elapsed:.2f} seconds ({throughput:.2f} requests/second) "
+             f"using " + (limiter.summary() if limiter else f"{tasks_len} tasks"))
+    if results.error is not None:
+        raise results.error
+    return results.responses
 
 
 async def fill_queue(requests, queue):
     log.info("FILL TASK: Starting to fill request queue with requests")
-    while len(requests) > 0:
-        await queue.put(requests.pop())
+    for index, request in enumerate(requests):
+        await queue.put((index, request, time.monotonic()))
 
 
-async def fetch(session, queue, request_params, results):
+async def fetch(session, queue, request_params, results, limiter=None):
     """
     Consumer method that is responsible for fetching requests from queue and executing them.
     :param session: aiohttp.ClientSession
-    :param queue: asyncio.Queue
+    :param queue: asyncio.Queue of tuples of request index, HTTPRequest and time the request was queued at
     :param request_params: additional config parameters for app_http request like retries, intervals, etc.
-    :param results: list of response body
+    :param results: OrderedResults
+    :param limiter: optional AdaptiveConcurrencyLimiter shared by the consumers
     :return: None
     """
     while True:
         try:
-            request = await queue.get()
-            response = await http_retry_request(session,
-                                                request.method,
-                                                request.url,
-                                                retries=request_params.get('retries', 2),
-                                                interval=request_params.get('interval', 1),
-                                                interval_increment=request_params.get('interval_increment', 2),
-                                                success_criteria=request_params.get('success_criteria',
-                                                                                    status_criteria),
-                                                criteria_options=request_params.get('criteria_options',
-                                                                                    DEFAULT_STATUS_CRITERIA_OPTIONS),
-                                                auth=api_auth(request.auth),
-                                                headers=request.headers,
-                                                data=request.data)
+            index, request, queued_at = await queue.get()
+        except CancelledError:
+            log.info("Task cancelled.")
+            break
+        # the request is marked done whatever happens, so that queue.join() returns
+        try:
+            if request_params.get('metrics') is not None:
+                request_params['metrics'].record_queue_wait(time.monotonic() - queued_at)
+            response = await send_request(session, request, request_params, limiter)
+            response = await transform_response(response, request_params)
         except CancelledError:
             log.info("Task cancelled.")
             break
         except Exception as e:
             log.exception(f"Error in fetch task:  {e}")
-            queue.task_done()
+            results.set(index, None)
         else:
-            results.append(response)
-            log.info(f"Processed request {len(results)} / {request_params.get('size')}")
+            results.set(index, response)
+            log.info(f"Processed request {results.completed} / {request_params.get('size')}")
+        finally:
             queue.task_done()
 
 
+class OrderedResults:
+    """
+    Responses of a list of requests, kept in the order of the requests whatever the order they are received in.
+    When an on_ready function is given, it is called with every contiguous run of responses as soon as all the
+    responses before it are received, so that results can be consumed in order before the last request completes.
+    The responses passed to on_ready are released. An error raised by on_ready is logged and kept in 'error', and
+    no more responses are passed to on_ready.
+    """
+
+    def __init__(self, size, on_ready=None):
+        self.responses = [None] * size
+        self.completed = 0
+        self.error = None
+        self._received = [False] * size
+        self._ready = 0
+        self._on_ready = on_ready
+
+    def set(self, index, response):
+        self.responses[index] = response
+        self._received[index] = True
+        self.completed += 1
+        if self._on_ready is None or self.error is not None:
+            return
+        start = self._ready
+        while self._ready < len(self._received) and self._received[self._ready]:
+            self._ready += 1
+        if self._ready == start:
+            return
+        ready = self.responses[start:self._ready]
+        self.responses[start:self._ready] = [None] * len(ready)
+        try:
+            self._on_ready(ready)
+        except Exception as e:
+            log.exception(f"Error while consuming responses {start} to {self._ready - 1}: {e}")
+            self.error = e
+
+
+async def transform_response(response, request_params):
+    """
+    Applies the 'transform' function of request_params to the body of a successful response. The transform runs in
+    a worker thread, so that a response is converted while the remaining requests are in flight, and its raw body
+    can be released as soon as it is converted.
+    :param response: HTTPResponse, or None for a failed request
+    :param request_params: additional config parameters for app_http request, with an optional 'transform'
+    :return: HTTPResponse with the transformed body
+    """
+    transform = request_params.get('transform')
+    if transform is None or type(response) is not HTTPResponse:
+        return response
+    start = time.monotonic()
+    data = await asyncio.to_thread(transform, response.data)
+    if request_params.get('metrics') is not None:
+        request_params['metrics'].record_transform(time.monotonic() - start)
+    return response._replace(data=data)
+
+
+async def send_request(session, request, request_params, limiter=None):
+    """
+    Executes a single request, retrying it as configured in request_params. When a 'cache' is configured, the
+    response is served from or stored in the response cache. When the run records or replays its HTTP exchanges,
+    the response is recorded to or replayed from the archive of the client manager.
+    :param session: aiohttp.ClientSession
+    :param request: HTTPRequest
+    :param request_params: additional config parameters for app_http request like retries, intervals, etc.
+    :param limiter: optional AdaptiveConcurrencyLimiter
+    :return: HTTPResponse if successful, otherwise None
+    """
+    archive = client_manager.archive
+    if archive is not None and archive.replaying:
+        response = archive.replay(request)
+    else:
+        response = await cached_request(session, request, request_params, limiter)
+        if archive is not None:
+            archive.record(request, response)
+    if request_params.get('metrics') is not None:
+        request_params['metrics'].record_request(type(response) is HTTPResponse)
+    return response
+
+
+async def cached_request(session, request, request_params, limiter):
+    success_criteria = request_params.get('success_criteria', status_criteria)
+    cache = ResponseCache.from_config(request_params.get('cache'))
+    if cache is None:
+        return await retry_request(session, request, request_params, limiter, success_criteria)
+
+    entry = await asyncio.to_thread(cache.get, request)
+    if entry is not None and cache.is_fresh(entry):
+        client_manager.record('cache_hits')
+        return HTTPResponse(entry['status'], entry['headers'], entry['data'])
+
+    conditional_request = request
+    if entry is not None:
+        conditional_request = replace(request, headers={**(request.headers or {}),
+                                                        **ResponseCache.conditional_headers(entry)})
+    response = await retry_request(session, conditional_request, request_params, limiter,
+                                   lambda res, options: res.status == 304 or success_criteria(res, options))
+    if response is not None and response.status == 304 and entry is not None:
+        client_manager.record('cache_hits')
+        return HTTPResponse(entry['status'], entry['headers'], entry['data'])
+
+    client_manager.record('cache_misses')
+    if response is not None and response.status != 304:
+        await asyncio.to_thread(cache.store, request, response)
+    return response
+
+
+async def retry_request(session, request, request_params, limiter, success_criteria):
+    timeout = client_timeout(request_params.get('timeout'))
+    kwargs = {'timeout': timeout} if timeout is not None else {}
+    return await http_retry_request(session,
+                                    request.method,
+                                    request.url,
+                                    retries=request_params.get('retries', 2),
+                                    interval=request_params.get('interval', 1),
+                                    interval_increment=request_params.get('interval_increment', 2),
+                                    success_criteria=success_criteria,
+                                    criteria_options=request_params.get('criteria_options',
+                                                                        DEFAULT_STATUS_CRITERIA_OPTIONS),
+                                    limiter=limiter,
+                                    rate_limiter=client_manager.rate_limiter(request.url,
+                                                                             request_params.get('rate_limit')),
+                                    backoff=request_params.get('backoff', DEFAULT_BACKOFF),
+                                    max_backoff=request_params.get('max_backoff', DEFAULT_MAX_BACKOFF),
+                                    circuit_breaker=client_manager.circuit_breaker(
+                                        request.url, request_params.get('circuit_breaker')),
+                                    metrics=request_params.get('metrics'),
+                                    auth=api_auth(request.auth),
+                                    headers=request.headers,
+                                    data=request.data,
+                                    **kwargs)
+
+
+async def execute_paginated(requests, request_params):
+    """
+    Walks all the pages of every request, see 'src.utils.app_http.pagination.py' for the pagination styles.
+    Resources are paginated concurrently, at most 'tasks_len' at a time, and the pages of all the resources share
+    one concurrency limiter, so that at most 'tasks_len' pages are in flight, or the adaptive limit when
+    'concurrency' is adaptive.
+    :param requests: list of HTTPRequests of the paginated resources
+    :param request_params: additional config parameters for app_http request, containing the 'pagination' config
+    :return: list of HTTPResponses of all the pages in order, None for a failed page
+    """
+    paginator = get_paginator(request_params['pagination'])
+    tasks_len = request_params.get('tasks_len', 1)
+    limiter = AdaptiveConcurrencyLimiter.from_config(request_params.get('concurrency'), tasks_len)
+    if limiter is None:
+        # without it, each of the 'tasks_len' resources would prefetch its pages with 'tasks_len' consumers
+        limiter = AdaptiveConcurrencyLimiter(min_limit=tasks_len, max_limit=tasks_len)
+    semaphore = asyncio.Semaphore(limiter.max_limit)
+    on_ready = request_params.get('on_ready')
+    # pages are passed to on_ready once all the pages of a resource are fetched, not by the prefetch of its pages
+    resources = OrderedResults(len(requests), (lambda runs: on_ready([page for pages in runs for page in pages]))
+                               if on_ready is not None else None)
+    page_params = {**request_params, 'on_ready': None}
+
+    async def paginate_resource(index, request):
+        async with semaphore:
+            resources.set(index, await paginate(paginator, request, page_params, limiter))
+
+    await asyncio.gather(*(paginate_resource(index, request) for index, request in enumerate(requests)))
+    if resources.error is not None:
+        raise resources.error
+    return [page for pages in resources.responses if pages is not None for page in pages]
+
+
+async def paginate(paginator, request, request_params, limiter=None):
+    """
+    Fetches the pages of a paginated resource. When the remaining pages are known from the first response, they are
+    fetched concurrently by the 'tasks_len' consumers, otherwise pages are fetched one after the other.
+    Pagination stops at the first failed page.
+    :param limiter: optional AdaptiveConcurrencyLimiter shared by the pages of all the resources
+    """
+    session = await client_manager.session(request_params.get('ssl', True), request_params.get('connection'))
+    max_pages = paginator.max_pages
+    results = []
+    request = paginator.first_request(request)
+    while request is not None and (max_pages is None or len(results) < max_pages):
+        try:
+            response = await send_request(session, request, request_params, limiter)
+        except Exception as e:
+            log.exception(f"Error while fetching page {request.url}: {e}")
+            response = None
+        if type(response) is not HTTPResponse:
+            results.append(response)
+            break
+        remaining_requests = paginator.remaining_requests(request, response) if not results else None
+        # the next page is found from the raw response, before it is transformed
+        next_request = paginator.next_request(request, response) if remaining_requests is None else None
+        results.append(await transform_response(response, request_params))
+        if remaining_requests is not None:
+            if max_pages is not None:
+                remaining_requests = remaining_requests[:max_pages - 1]
+            log.info(f"Prefetching {len(remaining_requests)} remaining pages of {request.url}")
+            # execute sets the number of requests in its params, which are shared by the resources
+            results.extend(await execute(remaining_requests, dict(request_params), limiter))
+            break
+        request = next_request
+    log.info(f"Fetched {len(results)} pages")
+    return results
+
+
+def request_hosts(requests):
+    return ", ".join(sorted({urlsplit(request.url).netloc or request.url for request in requests})) or "no host"
+
+
 def api_auth(auth):
     """
     Method responsible for authenticating API. aiohttp.BasicAuth is used for it.
@@ -0,0 +1,79 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import math
+from collections import Counter
+
+PERCENTILES = (50, 90, 99)
+
+
+class HTTPMetrics:
+    """
+    Metrics of the HTTP requests of a source or a destination: latency of every attempt, retries by reason, bytes
+    sent and received, time spent by requests in the queue, time spent reading and decoding response bodies and time
+    spent converting them (see 'transform' in http_util).
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.retries = Counter()
+        self.requests = 0
+        self.failures = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.queue_wait = 0.0
+        self.decode_time = 0.0
+        self.transform_time = 0.0
+
+    def record_attempt(self, latency, bytes_in=0, bytes_out=0, decode_time=0.0):
+        self.latencies.append(latency)
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.decode_time += decode_time
+
+    def record_retry(self, reason):
+        """
+        :param reason: why the attempt is retried, eg. 'timeout', 'connection_error', 'status_503' or 'criteria'
+        """
+        self.retries[reason] += 1
+
+    def record_request(self, success):
+        self.requests += 1
+        self.failures += 0 if success else 1
+
+    def record_queue_wait(self, seconds):
+        self.queue_wait += seconds
+
+    def record_transform(self, seconds):
+        self.transform_time += seconds
+
+    def percentile(self, percent):
+        """
+        :return: the given percentile of the attempt latencies (nearest rank), None if no attempt was made
+        """
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        rank = max(math.ceil(percent / 100 * len(latencies)), 1)
+        return latencies[rank - 1]
+
+    def counters(self):
+        """
+        :return: dict of the metrics that add up across sources, see HTTPClientManager.record
+        """
+        return {
+            'requests': self.requests,
+            'failed_requests': self.failures,
+            'attempts': len(self.latencies),
+            'retries': sum(self.retries.values()),
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out
+        }
+
+    def summary(self):
+        latencies = ", ".join(f"p{percent}={self.percentile(percent) or 0:.3f}s" for percent in PERCENTILES)
+        retries = ", ".join(f"{reason}={count}" for reason, count in sorted(self.retries.items())) or "none"
+        return (f"{self.requests} requests ({self.failures} failed), {len(self.latencies)} attempts, "
+                f"latency {latencies}, retries: {retries}, {self.bytes_in} bytes in, {self.bytes_out} bytes out, "
+                f"queue wait {self.queue_wait:.2f}s, decode time {self.decode_time:.2f}s, "
+                f"transform time {self.transform_time:.2f}s")
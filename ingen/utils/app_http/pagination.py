@@ -0,0 +1,192 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+"""
+HTTP Pagination
+
+This module contains the paginators used to walk the pages of a paginated API. A paginator creates the request of
+the first page, and the requests of the following pages using the response of the previous page. Paginators only
+build requests, the requests are executed by 'http_util'.
+"""
+
+import math
+import re
+from dataclasses import replace
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit
+
+LINK_NEXT_PATTERN = re.compile(r'<([^>]*)>\s*;[^,]*rel\s*=\s*"?next"?', re.IGNORECASE)
+
+
+def get_path(data, path):
+    """
+    Returns the value at the given path of a JSON response
+    :param data: JSON response
+    :param path: dot separated string or list of keys, None for the response itself
+    :return: the value, None if the path is not present
+    """
+    if path is None:
+        return data
+    keys = path.split('.') if isinstance(path, str) else path
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def set_query_param(url, name, value):
+    """
+    Sets a query parameter of the url, replacing its current value. The other query parameters are kept as they are.
+    """
+    parts = urlsplit(url)
+    query = [param for param in parts.query.split('&') if param and param.split('=', 1)[0] != name]
+    query.append(f"{name}={quote(str(value), safe='')}")
+    return urlunsplit(parts._replace(query='&'.join(query)))
+
+
+class Paginator:
+    """
+    A Paginator represents a pagination style. All paginators must implement next_request
+    """
+
+    def __init__(self, config):
+        self.max_pages = config.get('max_pages')
+
+    def first_request(self, request):
+        """
+        :param request: HTTPRequest of the paginated resource
+        :return: HTTPRequest of the first page
+        """
+        return request
+
+    def remaining_requests(self, request, response):
+        """
+        Returns the requests of all the remaining pages when they are known from the first page, so that they can
+        be fetched concurrently
+        :param request: HTTPRequest of the first page
+        :param response: HTTPResponse of the first page
+        :return: list of HTTPRequests, None if the remaining pages are not known in advance
+        """
+        return None
+
+    def next_request(self, request, response):
+        """
+        :param request: HTTPRequest of the current page
+        :param response: HTTPResponse of the current page
+        :return: HTTPRequest of the next page, None if the current page is the last one
+        """
+        pass
+
+
+class OffsetPaginator(Paginator):
+    """
+    offset/limit pagination, or page number pagination when 'type' is 'page'. When 'total_key' (total number of
+    records) or 'total_pages_key' is configured, all remaining pages are known from the first response.
+    Otherwise, pages are walked until a page has less than 'limit' records.
+    """
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._by_page = config.get('type') == 'page'
+        self._param = config.get('page_param', 'page') if self._by_page else config.get('offset_param', 'offset')
+        self._limit_param = config.get('limit_param', None if self._by_page else 'limit')
+        self._limit = config.get('limit')
+        self._start = config.get('start', 1 if self._by_page else 0)
+        self._total_key = config.get('total_key')
+        self._total_pages_key = config.get('total_pages_key')
+        self._records_key = config.get('records_key')
+        if not self._by_page and not self._limit:
+            raise ValueError("limit is required for offset pagination")
+
+    def first_request(self, request):
+        return self._page_request(request, 0)
+
+    def remaining_requests(self, request, response):
+        total_pages = self._total_pages(response.data)
+        if total_pages is None:
+            return None
+        return [self._page_request(request, index) for index in range(1, total_pages)]
+
+    def next_request(self, request, response):
+        records = get_path(response.data, self._records_key)
+        count = len(records) if isinstance(records, list) else 0
+        if count == 0 or (self._limit and count < self._limit):
+            return None
+        return self._page_request(request, self._page_index(request) + 1)
+
+    def _total_pages(self, data):
+        if self._total_pages_key:
+            total_pages = get_path(data, self._total_pages_key)
+            return int(total_pages) if total_pages is not None else None
+        if self._total_key and self._limit:
+            total = get_path(data, self._total_key)
+            return math.ceil(int(total) / self._limit) if total is not None else None
+        return None
+
+    def _page_request(self, request, index):
+        value = self._start + index if self._by_page else self._start + index * self._limit
+        url = set_query_param(request.url, self._param, value)
+        if self._limit_param and self._limit:
+            url = set_query_param(url, self._limit_param, self._limit)
+        return replace(request, url=url)
+
+    def _page_index(self, request):
+        for param in urlsplit(request.url).query.split('&'):
+            name, _, value = param.partition('=')
+            if name == self._param:
+                return (int(value) - self._start) // (1 if self._by_page else self._limit)
+        return 0
+
+
+class CursorPaginator(Paginator):
+    """
+    Cursor pagination, the cursor of the next page is read at 'cursor_key' of the response and sent as the
+    'cursor_param' query parameter. Pages are walked until the response has no cursor.
+    """
+
+    def __init__(self, config):
+        super().__init__(config)
+        self._cursor_param = config.get('cursor_param', 'cursor')
+        self._cursor_key = config.get('cursor_key')
+        if not self._cursor_key:
+            raise ValueError("cursor_key is required for cursor pagination")
+
+    def next_request(self, request, response):
+        cursor = get_path(response.data, self._cursor_key)
+        if cursor is None or cursor == '':
+            return None
+        return replace(request, url=set_query_param(request.url, self._cursor_param, cursor))
+
+
+class LinkHeaderPaginator(Paginator):
+    """
+    Pagination using the 'rel="next"' URL of the Link response header (RFC 8288)
+    """
+
+    def next_request(self, request, response):
+        if not response.headers:
+            return None
+        # a response can have more than one Link header
+        links = response.headers.getall('Link', []) if hasattr(response.headers, 'getall') else \
+            [response.headers.get('Link')]
+        link = ', '.join(link for link in links if link)
+        match = LINK_NEXT_PATTERN.search(link) if link else None
+        if match is None:
+            return None
+        return replace(request, url=urljoin(request.url, match.group(1)))
+
+
+PAGINATORS = {
+    'offset': OffsetPaginator,
+    'page': OffsetPaginator,
+    'cursor': CursorPaginator,
+    'link': LinkHeaderPaginator
+}
+
+
+def get_paginator(config):
+    paginator = PAGINATORS.get(config.get('type'))
+    if paginator is None:
+        raise ValueError(f"Unknown pagination type {config.get('type')}. "
+                         f"Supported types are {', '.join(PAGINATORS)}")
+    return paginator(config)
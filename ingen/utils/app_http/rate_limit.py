@@ -0,0 +1,104 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+log = logging.getLogger()
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter. Tokens are added at 'rate' tokens per second up to 'burst' tokens, and every request
+    takes one token. A request that finds the bucket empty reserves the next token and sleeps until it is available,
+    so that waiting requests are served in the order they arrived without holding a lock. Once a pause ends,
+    requests are sent one token at a time at 'rate' tokens per second.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: requests per second
+        :param burst: maximum number of requests sent at once after an idle period. Default: max(rate, 1)
+        """
+        if rate <= 0:
+            raise ValueError("requests_per_second should be greater than 0")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+
+    def tighten(self, rate, burst=None):
+        """
+        Keeps the most restrictive of the current and the given rate and burst
+        """
+        self._refill()
+        self.rate = min(self.rate, float(rate))
+        self.burst = min(self.burst, float(burst if burst is not None else max(rate, 1)))
+        self._tokens = min(self._tokens, self.burst)
+
+    def reserve(self):
+        """
+        Takes a token
+        :return: number of seconds to wait before the token can be used
+        """
+        self._refill()
+        self._tokens -= 1
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    async def acquire(self):
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+    def pause(self, seconds):
+        """
+        Holds every request back for the given number of seconds, eg. when the server answers with Retry-After.
+        The bucket is emptied so that the first token is available when the pause ends, and the next ones follow
+        at the refill rate.
+        """
+        now = self._refill()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = min(self._tokens, 1 - (self._paused_until - now) * self.rate)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+        return now
+
+
+def parse_rate_limit(config):
+    """
+    :param config: requests per second, or dict with 'requests_per_second' and optional 'burst'
+    :return: tuple of rate and burst, None if no rate limit is configured
+    """
+    if config is None or config == '':
+        return None
+    if isinstance(config, dict):
+        return float(config['requests_per_second']), config.get('burst')
+    return float(config), None
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header, given either in seconds or as an HTTP-date
+    :return: number of seconds to wait, None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        log.warning(f"Invalid Retry-After header: {value}")
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
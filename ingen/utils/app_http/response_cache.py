@@ -0,0 +1,115 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+
+from ingen.utils.properties import properties
+
+log = logging.getLogger()
+
+DEFAULT_CACHE_DIR = '.ingen_http_cache'
+
+
+class ResponseCache:
+    """
+    On-disk cache of HTTP responses. A response is stored when it has an ETag or a Last-Modified validator, or when a
+    'ttl' is configured. Stored responses are revalidated with If-None-Match/If-Modified-Since and reused when the
+    server answers 304 Not Modified. In TTL mode, a stored response younger than 'ttl' seconds is reused without
+    calling the server.
+    """
+
+    def __init__(self, cache_dir=None, ttl=None, key_headers=None):
+        """
+        :param cache_dir: directory of the cache. Default: 'http.cache.dir' property or '.ingen_http_cache'
+        :param ttl: optional number of seconds a stored response is reused without calling the server
+        :param key_headers: names of the request headers that are part of the cache key
+        """
+        self._cache_dir = cache_dir or properties.get_property('http.cache.dir', DEFAULT_CACHE_DIR)
+        self._ttl = ttl
+        self._key_headers = key_headers or []
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        :param config: True, or dict with optional 'dir', 'ttl' and 'key_headers'
+        :return: ResponseCache, None if the cache is not configured
+        """
+        if not config:
+            return None
+        if not isinstance(config, dict):
+            config = {}
+        return cls(config.get('dir'), config.get('ttl'), config.get('key_headers'))
+
+    def key(self, request):
+        """
+        :param request: HTTPRequest
+        :return: sha256 of the method, url, body and key headers of the request
+        """
+        headers = request.headers or {}
+        key_headers = {name: headers.get(name) for name in sorted(self._key_headers)}
+        key = json.dumps([request.method.upper(), request.url, request.data, key_headers], default=str)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def get(self, request):
+        """
+        :return: the stored entry of the request as a dict with 'status', 'headers', 'data', 'etag', 'last_modified'
+                 and 'stored_at', None if the request is not cached
+        """
+        path = self._path(self.key(request))
+        try:
+            with open(path, 'r') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable HTTP cache entry {path}: {e}")
+            return None
+
+    def is_fresh(self, entry):
+        return self._ttl is not None and time.time() - entry['stored_at'] < self._ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        :return: dict of the If-None-Match and If-Modified-Since headers revalidating the entry
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, request, response):
+        """
+        Stores the response of the request if it can be revalidated or a ttl is configured
+        :param request: HTTPRequest
+        :param response: HTTPResponse
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag is None and last_modified is None and self._ttl is None:
+            return
+        entry = {
+            'status': response.status,
+            'headers': dict(response.headers),
+            'data': response.data,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time()
+        }
+        os.makedirs(self._cache_dir, exist_ok=True)
+        path = self._path(self.key(request))
+        # written to a temporary file first, so that a reader never sees a partially written entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+        with os.fdopen(file_descriptor, 'w') as file:
+            json.dump(entry, file)
+        os.replace(temp_path, path)
+
+    def _path(self, key):
+        return os.path.join(self._cache_dir, f"{key}.json")
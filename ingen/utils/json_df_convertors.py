@@ -55,6 +55,18 @@ def response_to_list(responses, data_node, data_key, meta):
     return pd.DataFrame()
 
 
+def concat_frames(frames):
+    """
+    Concatenates the DataFrames converted from each response, see 'normalize_per_response' of API sources
+    """
+    non_empty_frames = [frame for frame in frames if not frame.empty]
+    if not non_empty_frames:
+        return frames[0] if frames else pd.DataFrame()
+    if len(non_empty_frames) == 1:
+        return non_empty_frames[0].reset_index(drop=True)
+    return pd.concat(non_empty_frames, ignore_index=True)
+
+
 CONVERTORS = {
     "pandas_normalize": pandas_normalize,
     "response_to_list": response_to_list
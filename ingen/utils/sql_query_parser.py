@@ -5,10 +5,62 @@ import logging
 from datetime import date
 
 import numpy as np
+from pymysql.converters import escape_item
 
 from ingen.reader.file_reader import ReaderFactory
 from ingen.utils.path_parser import PathParser
 
+DEFAULT_INSERT_BATCH_SIZE = 1000
+LIKE_ESCAPE = '!'
+
+
+def quote_identifier(name):
+    return f"`{name.replace('`', '``')}`"
+
+
+def in_predicate(expression, values):
+    """
+    Creates a predicate matching the rows where the expression is one of the values. None and NaN values match NULL.
+    :param expression: column or SQL expression to compare
+    :param values: list of values
+    :return: tuple of the predicate with '%s' placeholders and the list of its params
+    """
+    params = [value for value in values if not _is_null(value)]
+    clauses = []
+    if params:
+        clauses.append(f"{expression} IN ({', '.join(['%s'] * len(params))})")
+    if len(params) < len(values):
+        clauses.append(f"{expression} IS NULL")
+    if not clauses:
+        return "1 = 0", []
+    return (clauses[0] if len(clauses) == 1 else f"({' OR '.join(clauses)})"), params
+
+
+def contains_predicate(expression, values):
+    """
+    Creates a predicate matching the rows where the expression contains one of the str values. It matches at least
+    the rows where the expression stripped of any whitespace, as by str.strip, is one of the values.
+    :param expression: column or SQL expression to compare
+    :param values: list of str values
+    :return: tuple of the predicate with '%s' placeholders and the list of its params
+    """
+    if not values:
+        return "1 = 0", []
+    params = [f"%{_escape_like(value)}%" for value in values]
+    clauses = [f"{expression} LIKE %s ESCAPE '{LIKE_ESCAPE}'"] * len(params)
+    return (clauses[0] if len(clauses) == 1 else f"({' OR '.join(clauses)})"), params
+
+
+def _escape_like(value):
+    for character in (LIKE_ESCAPE, '%', '_'):
+        value = value.replace(character, LIKE_ESCAPE + character)
+    return value
+
+
+def _is_null(value):
+    # NaN and NaT are the only values not equal to themselves
+    return value is None or value != value
+
 
 class SqlQueryParser:
     """
@@ -35,10 +87,11 @@ class SqlQueryParser:
             query_param_mapping = {}
             if cls.cmd_line_query_params is not None:
                 query_param_mapping.update(cls.cmd_line_query_params)
+            query = query.format(**query_param_mapping)
             if temp_table_params_config is not None:
                 temp_table_query = cls.create_temp_table(temp_table_params_config)
                 query = temp_table_query + query
-            return query.format(**query_param_mapping)
+            return query
 
         except KeyError as error:
             logging.error('Error parsing sql query. Required query params not provided')
@@ -72,12 +125,13 @@ class SqlQueryParser:
     def insert_values(cls, temp_table_config):
         """
         Parse the temp table config, read the config from file , insert the data from file to temp table and return a
-        list of queries
+        list of queries. Rows are inserted using multi-row INSERT statements of at most 'insert_batch_size' rows.
         :param  temp_table_config    describes the config to create temp table
         :return: list of temp table queries
         """
         temp_table_name = temp_table_config['temp_table_name']
         temp_table_cols = temp_table_config['temp_table_cols']
+        batch_size = temp_table_config.get('insert_batch_size', DEFAULT_INSERT_BATCH_SIZE)
         col_config = ''
         col_list = ''
         file_cols = []
@@ -96,7 +150,8 @@ class SqlQueryParser:
 
         # create temptable query.
         temp_table_queries = [f"create table #{temp_table_name} ({col_config})"]
-        insert_string = f"INSERT INTO #{temp_table_name} ({col_list}) VALUES"
+        insert_string = f"INSERT INTO #{temp_table_name} ({col_list}) VALUES "
+        row_placeholder = f"({', '.join(['%s'] * len(file_cols))})"
         # read the data via file reader
         file_data = cls.read_data(temp_table_config)
         for key in file_cols:
@@ -104,16 +159,24 @@ class SqlQueryParser:
                 raise KeyError(f"Column '{key}' not found in input file or input file does not have header")
         file_df = file_data[file_cols].replace(np.nan, default_values)
 
-        if len(file_df) > 0:
-            for row in zip(*file_df.to_dict("list").values()):
-                df_col_val = F" {row}"
-                if len(temp_table_cols) == 1:
-                    col_val = df_col_val.replace(',', '')
-                else:
-                    col_val = df_col_val
-                temp_table_queries.append(f"{insert_string + col_val}")
+        rows = file_df.astype(object).where(file_df.notna(), None).values.tolist()
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start: start + batch_size]
+            statement = insert_string + ', '.join([row_placeholder] * len(batch))
+            temp_table_queries.append(cls.bind_params(statement, [value for row in batch for value in row]))
         return temp_table_queries
 
+    @classmethod
+    def bind_params(cls, statement, params):
+        """
+        Binds the params to the '%s' placeholders of the statement, escaping every value the same way
+        the MySQL driver does for parameterized queries
+        :param statement: SQL statement with one '%s' placeholder per param
+        :param params: list of values
+        :return: SQL statement with the escaped values
+        """
+        return statement % tuple(escape_item(param, 'utf8') for param in params)
+
     @classmethod
     def create_temp_table(cls, temp_table_params):
         """
@@ -127,3 +190,24 @@ class SqlQueryParser:
                 temp_table_query.extend(cls.insert_values(temp_table_config))
 
         return ';'.join(temp_table_query) + ';'
+
+    @classmethod
+    def wrap_query(cls, query, query_params, alias, predicate, predicate_params, select='*'):
+        """
+        Wraps the query as a derived table and filters it with the given predicate
+        :param query: SQL query to wrap
+        :param query_params: values bound to the '%s' placeholders of the query, None if the query is not
+                             parameterized yet
+        :param alias: alias of the derived table
+        :param predicate: WHERE clause applied on the derived table, with '%s' placeholders for its values
+        :param predicate_params: values bound to the placeholders of the predicate
+        :param select: select list of the wrapping query
+        :return: tuple of the wrapped query and the list of its params
+        """
+        query = query.strip().rstrip(';')
+        if query_params is None:
+            # literal '%' in a query that is not parameterized yet has to be escaped before binding values
+            query = query.replace('%', '%%')
+            query_params = []
+        wrapped_query = f"SELECT {select} FROM ({query}) AS {alias} WHERE {predicate}"
+        return wrapped_query, list(query_params) + list(predicate_params)
@@ -1,12 +1,64 @@
 #  Copyright (c) 2023 BlackRock, Inc.
 #  All Rights Reserved.
 
+import json
+import logging
+import os
 from datetime import date
 from urllib.parse import quote
 
+from ingen.data_source.data_source_type import DataSourceType
 from ingen.data_source.file_source import FileSource
 from ingen.data_source.source_factory import SourceFactory
 
+log = logging.getLogger()
+
+# characters that quote leaves as they are
+URL_SAFE_PATTERN = r"[A-Za-z0-9_.~/-]*"
+# sources whose data is cached for the run, the data of other sources can change during the run
+CACHED_SOURCE_TYPES = {DataSourceType.File.value, DataSourceType.MYSQL.value}
+
+# values of the URL params read during the run, shared by all the API sources
+_param_cache = {}
+
+
+def clear_param_cache():
+    """
+    Forgets the values of the URL params read during the run
+    """
+    _param_cache.clear()
+
+
+def param_cache_key(kind, config):
+    """
+    Returns the cache key of the values read from a source. The key of a file contains its modification time and
+    size, so that a file written during the run is read again.
+    :param kind: what is cached, eg. 'file_param'
+    :param config: source config, with the file path already resolved
+    :return: tuple, None if the values cannot be cached
+    """
+    key = (kind, json.dumps(config, sort_keys=True, default=str))
+    if config.get('type') == DataSourceType.File.value:
+        try:
+            stat = os.stat(config.get('file_path'))
+        except (OSError, TypeError):
+            return None
+        key += (stat.st_mtime_ns, stat.st_size)
+    return key
+
+
+def quote_values(values):
+    """
+    URL quotes the values, only the values having characters to escape are passed to quote
+    :param values: pandas Series
+    :return: list of quoted strings
+    """
+    values = values.astype(str)
+    unsafe = ~values.str.fullmatch(URL_SAFE_PATTERN)
+    if unsafe.any():
+        values = values.where(~unsafe, values[unsafe].map(quote))
+    return values.tolist()
+
 
 class UrlConstructor:
     """
@@ -83,16 +135,26 @@ class UrlConstructor:
         if source_config:
             data = self.get_data_from_source(source_config)
 
-        urls = []
-        if data is not None:
-            for path_param in data[path_param_name]:
-                urls.append(f"{url}/{path_param}")
-
-        return urls
+        if data is None:
+            return []
+        return (url + '/' + data[path_param_name].astype(str)).tolist()
 
     def get_data_from_source(self, source_config, params=None):
-        data_source = self.source_factory.parse_source(source_config, params)
+        data_source = None
+        if source_config.get('type') == DataSourceType.File.value:
+            # the file path of source_config is resolved by FileSource
+            data_source = self.source_factory.parse_source(source_config, params)
+        key = param_cache_key('path_param', source_config) \
+            if source_config.get('type') in CACHED_SOURCE_TYPES else None
+        if key is not None and key in _param_cache:
+            log.info(f"Reusing path params of source {source_config.get('id')}")
+            return _param_cache[key]
+        # other sources are only built when they are read, eg. a mysql source opens its connection when built
+        if data_source is None:
+            data_source = self.source_factory.parse_source(source_config, params)
         data = data_source.fetch()
+        if key is not None:
+            _param_cache[key] = data
         return data
 
     def get_query_param_batch_urls(self, url, batch_id, batch_size):
@@ -152,17 +214,24 @@ class UrlConstructor:
 
     def get_file_value(self, param):
         source = FileSource(param, self.params_map)
+        # the file path of param is resolved by FileSource
+        key = param_cache_key('file_param', param)
+        if key is not None and key in _param_cache:
+            log.info(f"Reusing url param {param.get('id')} read from {param.get('file_path')}")
+            return _param_cache[key]
         data = source.fetch()
-        return self.dest_column_of_data(data, param.get("dest_column"))
+        value = self.dest_column_of_data(data, param.get("dest_column"))
+        if key is not None:
+            _param_cache[key] = value
+        return value
 
     def dest_column_of_data(self, data, dest_column):
         if data is not None and len(data) != 0:
             if dest_column is None:
-                values = list(data.iloc[:, 0])  # converting first column of df to list
+                values = data.iloc[:, 0]  # first column of df
             else:
-                values = data[dest_column].tolist()  # converting destination column of df to list
-            values = [quote(str(value)) for value in values]
-            return ','.join(values)
+                values = data[dest_column]
+            return ','.join(quote_values(values))
 
     def is_batch_query_param(self, key):
         if self.batch_config is not None:
@@ -1,10 +1,12 @@
 #  Copyright (c) 2023 BlackRock, Inc.
 #  All Rights Reserved.
 
+import gzip
 import json
 import logging
 
 from ingen.reader.api_reader import APIReader
+from ingen.utils.app_http.aiohttp_retry import DEFAULT_BACKOFF, DEFAULT_MAX_BACKOFF
 from ingen.utils.app_http.http_request import HTTPRequest
 from ingen.utils.app_http.success_criterias import DEFAULT_STATUS_CRITERIA_OPTIONS, get_criteria_by_name
 from ingen.utils.interpolators.Interpolator import Interpolator
@@ -13,6 +15,14 @@ from ingen.writer.dataframe_writer import DataFrameWriter
 
 log = logging.getLogger()
 
+JSON_ARRAY_FORMAT = 'json_array'
+NDJSON_FORMAT = 'ndjson'
+GZIP_COMPRESSION = 'gzip'
+BATCH_CONTENT_TYPES = {
+    JSON_ARRAY_FORMAT: 'application/json',
+    NDJSON_FORMAT: 'application/x-ndjson'
+}
+
 
 def parse_headers(headers, params):
     """
@@ -23,6 +33,46 @@ def parse_headers(headers, params):
     return {key: Interpolator(params).interpolate(value) for key, value in headers.items()} if headers else None
 
 
+def batch_payloads(json_strings, batch_size=None, max_batch_bytes=None, batch_format=JSON_ARRAY_FORMAT):
+    """
+    Groups JSON strings into request bodies of up to batch_size records and up to max_batch_bytes bytes.
+    A record larger than max_batch_bytes is sent in a body of its own.
+    :param json_strings: list of valid JSON strings
+    :param batch_size: maximum number of records per body, None for no limit
+    :param max_batch_bytes: maximum size of a body in bytes, None for no limit
+    :param batch_format: 'json_array' to send a JSON array of the records, 'ndjson' to send one record per line
+    :return: list of request bodies
+    """
+    if batch_format not in BATCH_CONTENT_TYPES:
+        raise ValueError(f"Unknown batch_format {batch_format}. Supported formats are "
+                         f"{', '.join(BATCH_CONTENT_TYPES)}")
+    if batch_format == NDJSON_FORMAT:
+        # a record of an NDJSON body has to fit on one line
+        json_strings = [json.dumps(json.loads(json_string)) if '\n' in json_string else json_string
+                        for json_string in json_strings]
+    # every record is followed by a '\n' or a ',', and a JSON array is enclosed in '[' and ']'
+    overhead = 0 if batch_format == NDJSON_FORMAT else 2
+
+    batches = []
+    batch = []
+    batch_bytes = overhead
+    for json_string in json_strings:
+        record_bytes = len(json_string.encode('utf-8')) + 1
+        if batch and ((batch_size and len(batch) >= batch_size) or
+                      (max_batch_bytes and batch_bytes + record_bytes > max_batch_bytes)):
+            batches.append(batch)
+            batch = []
+            batch_bytes = overhead
+        batch.append(json_string)
+        batch_bytes += record_bytes
+    if batch:
+        batches.append(batch)
+
+    if batch_format == NDJSON_FORMAT:
+        return ['\n'.join(batch) + '\n' for batch in batches]
+    return ['[' + ','.join(batch) + ']' for batch in batches]
+
+
 class ApiDestination:
     def __init__(self, params=None):
         self._params = params
@@ -41,24 +91,49 @@ class ApiDestination:
                 log.error(f"Invalid JSON strings: {str(err)}")
                 raise ValueError("Invalid JSON strings")
 
+        headers = parse_headers(api_request_props.get('headers'), self._params)
+        payloads = json_strings
+        batch_size = api_request_props.get('batch_size')
+        max_batch_bytes = api_request_props.get('max_batch_bytes')
+        if batch_size or max_batch_bytes:
+            batch_format = api_request_props.get('batch_format', JSON_ARRAY_FORMAT)
+            payloads = batch_payloads(json_strings, batch_size, max_batch_bytes, batch_format)
+            log.info(f"Sending {len(json_strings)} records in {len(payloads)} {batch_format} requests")
+            headers = dict(headers or {})
+            if not any(name.lower() == 'content-type' for name in headers):
+                headers['Content-Type'] = BATCH_CONTENT_TYPES[batch_format]
+
+        compression = api_request_props.get('compression')
+        if compression is not None:
+            if compression != GZIP_COMPRESSION:
+                raise ValueError(f"Unsupported compression {compression}. Supported compression is gzip")
+            payloads = [gzip.compress(payload.encode('utf-8')) for payload in payloads]
+            headers = {**(headers or {}), 'Content-Encoding': 'gzip'}
+
         path_parser = PathParser()
         requests = [HTTPRequest(url=path_parser.parse(api_request_props.get('url')),
                                 method=api_request_props.get('method'),
-                                headers=parse_headers(api_request_props.get('headers'), self._params),
+                                headers=headers,
                                 auth=api_request_props.get('auth'),
-                                data=json_string) for json_string in json_strings]
+                                data=payload) for payload in payloads]
 
         api_response_props = destination_props.get('api_response_props')
 
         reader_props = {
             'retries': api_request_props.get('retries', 2),
             'interval': api_request_props.get('interval', 1),
-            'success_criteria': get_criteria_by_name(api_request_props.get('success_criteria',
-                                                                           get_criteria_by_name('status_criteria'))),
+            'success_criteria': get_criteria_by_name(api_request_props.get('success_criteria', 'status_criteria')),
             'criteria_options': api_request_props.get('criteria_options', DEFAULT_STATUS_CRITERIA_OPTIONS),
             'tasks_len': api_request_props.get('tasks_len', 1),
+            'concurrency': api_request_props.get('concurrency'),
+            'rate_limit': api_request_props.get('rate_limit'),
+            'timeout': api_request_props.get('timeout'),
+            'backoff': api_request_props.get('backoff', DEFAULT_BACKOFF),
+            'max_backoff': api_request_props.get('max_backoff', DEFAULT_MAX_BACKOFF),
+            'circuit_breaker': api_request_props.get('circuit_breaker'),
             'queue_size': api_request_props.get('queue_size', 1),
             'ssl': api_request_props.get('ssl', True),
+            'connection': api_request_props.get('connection'),
             'ignore_failure': api_request_props.get('ignore_failure', True)
         }
 
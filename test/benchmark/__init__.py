@@ -0,0 +1,3 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
@@ -0,0 +1,40 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import unittest
+
+from ingen.benchmark.api_benchmark import run_source_benchmark, run_destination_benchmark, format_results
+from ingen.benchmark.stub_server import StubServer
+from ingen.utils.app_http.http_client import client_manager
+
+
+class TestApiBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubServer(records=250, page_size=50, record_size=10, throttle_every=4, throttle_burst=1)
+        self.server.start()
+
+    def tearDown(self):
+        client_manager.close()
+        self.server.stop()
+
+    def test_source_benchmark_fetches_every_record(self):
+        result = run_source_benchmark(self.server, tasks_len=2, queue_size=2)
+
+        self.assertEqual(250, result['rows'])
+        # 5 pages, and the 429 responses that were retried
+        self.assertEqual(5, self.server.statuses[200])
+        self.assertEqual(result['requests'], sum(self.server.statuses.values()))
+        self.assertGreater(self.server.statuses[429], 0)
+
+    def test_destination_benchmark_sends_every_record(self):
+        result = run_destination_benchmark(self.server, records=30, tasks_len=2, queue_size=2,
+                                           request_overrides={'batch_size': 10, 'compression': 'gzip'})
+
+        self.assertEqual(30, result['rows'])
+        self.assertEqual(30, self.server.received_records)
+        self.assertIn('destination', format_results([result]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,9 +44,19 @@ class TestAPISource(unittest.TestCase):
             'success_criteria': status_criteria,
             'criteria_options': DEFAULT_STATUS_CRITERIA_OPTIONS,
             'tasks_len': 1,
+            'concurrency': None,
+            'rate_limit': None,
+            'timeout': None,
+            'backoff': 'linear',
+            'max_backoff': 60,
+            'cache': None,
+            'circuit_breaker': None,
             'queue_size': 1,
             'ssl': True,
-            'ignore_failure': True
+            'connection': None,
+            'ignore_failure': True,
+            'pagination': None,
+            'normalize_per_response': False
         }
         self.source = APISource(self._src)
 
@@ -90,6 +100,11 @@ class TestAPISource(unittest.TestCase):
         expected = source.fetch_validations()
         self.assertEqual(config.get('src_data_checks'), expected)
 
+    def test_pagination_records_key_defaults_to_data_node(self):
+        source = APISource({**self._src, 'pagination': {'type': 'offset', 'limit': 100}})
+        self.assertEqual({'records_key': ['holdings'], 'type': 'offset', 'limit': 100},
+                         source.reader_params['pagination'])
+
 
 if __name__ == '__main__':
     unittest.main()
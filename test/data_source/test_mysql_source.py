@@ -34,6 +34,30 @@ class MYSQLSourceTest(unittest.TestCase):
         data = source.fetch()
         assert data.size == 0
 
+    @patch('ingen.data_source.mysql_source.MYSQLPartitionedReader')
+    @patch('ingen.data_source.mysql_source.pymysql')
+    @patch('ingen.data_source.mysql_source.SqlQueryParser')
+    @patch('ingen.data_source.mysql_source.properties')
+    def test_fetch_with_partition_uses_connection_pool(self, mock_property, mock_sql_parser, mock_pymysql,
+                                                       mock_reader):
+        partition = {'column': 'id', 'num_partitions': 4, 'max_connections': 2}
+        mock_reader.return_value.execute.return_value = DataFrame()
+        source = MYSQLSource({**self.input_source, 'partition': partition})
+        source.fetch()
+
+        connections = mock_reader.call_args[0][0]
+        self.assertEqual(2, len(connections))
+        self.assertEqual(2, mock_pymysql.connect.call_count)
+        mock_reader.assert_called_with(connections, partition, None, None)
+
+    @patch('ingen.data_source.mysql_source.pymysql')
+    @patch('ingen.data_source.mysql_source.SqlQueryParser')
+    @patch('ingen.data_source.mysql_source.properties')
+    def test_partition_with_temp_table_params_raises_error(self, mock_property, mock_sql_parser, mock_pymysql):
+        source = {**self.input_source, 'partition': {'column': 'id'}, 'temp_table_params': [{'type': 'file'}]}
+        with self.assertRaisesRegex(ValueError, 'partition cannot be used with temp_table_params'):
+            MYSQLSource(source)
+
     @patch('ingen.data_source.mysql_source.pymysql')
     @patch('ingen.data_source.mysql_source.SqlQueryParser')
     @patch('ingen.data_source.mysql_source.properties')
@@ -42,5 +66,28 @@ class MYSQLSourceTest(unittest.TestCase):
         assert len(source.fetch_validations()) == 0
 
 
+    @patch('ingen.data_source.mysql_source.MYSQLReader')
+    @patch('ingen.data_source.mysql_source.pymysql')
+    @patch('ingen.data_source.mysql_source.properties')
+    def test_fetch_with_pushed_down_predicate(self, mock_property, mock_pymysql, mock_reader):
+        source = MYSQLSource({**self.input_source, 'query': "select * from SAMPLE_TABLE where name like 'A%'"})
+        self.assertTrue(source.can_push_down())
+
+        source.push_down("`id` IN (%s, %s)", [1, 2])
+        source.fetch()
+
+        mock_reader.return_value.execute.assert_called_with(
+            "SELECT * FROM (select * from SAMPLE_TABLE where name like 'A%%') AS ingen_pushdown "
+            "WHERE `id` IN (%s, %s)", [1, 2])
+
+    @patch('ingen.data_source.mysql_source.pymysql')
+    @patch('ingen.data_source.mysql_source.SqlQueryParser')
+    @patch('ingen.data_source.mysql_source.properties')
+    def test_push_down_can_be_disabled(self, mock_property, mock_sql_parser, mock_pymysql):
+        self.assertFalse(MYSQLSource({**self.input_source, 'push_down_filters': False}).can_push_down())
+        MYSQLSource._connection = None
+        self.assertFalse(MYSQLSource({**self.input_source, 'temp_table_params': [{'type': 'file'}]}).can_push_down())
+
+
 if __name__ == '__main__':
     unittest.main()
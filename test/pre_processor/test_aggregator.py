@@ -59,3 +59,51 @@ class TestAggregator(unittest.TestCase):
         expected_result = df1.groupby(['acc', 'cusip']).agg('sum', 'quantity').reset_index()
 
         self.assertTrue(pd.DataFrame.equals(result, expected_result))
+
+    def test_named_aggregations(self):
+        config = {'type': 'aggregate', 'groupby': {'cols': ['acc']},
+                  'aggregations': {'total_quantity': {'col': 'quantity', 'operation': 'sum'},
+                                   'max_price': {'col': 'price', 'operation': 'max'},
+                                   'lots': {'col': 'cusip', 'operation': 'count'}}}
+        data = pd.DataFrame({
+            'acc': ['xyz', 'abcd', 'xyz', 'abcd', 'xyz'],
+            'cusip': ['ABC', 'ABC', 'DEF', 'DEF', 'GHI'],
+            'quantity': [1, 2, 3, 4, 5],
+            'price': [10.0, 20.0, 30.0, 40.0, 50.0]})
+
+        result = Aggregator().execute(config, None, data)
+
+        # groups are in the order they appear in
+        expected = pd.DataFrame({'acc': ['xyz', 'abcd'], 'total_quantity': [9, 6], 'max_price': [50.0, 40.0],
+                                 'lots': [3, 2]})
+        pd.testing.assert_frame_equal(expected, result)
+
+    def test_sorted_groups_and_observed_categories(self):
+        config = {'type': 'aggregate', 'groupby': {'cols': ['acc'], 'sort': True},
+                  'aggregations': {'total_quantity': {'col': 'quantity', 'operation': 'sum'}}}
+        data = pd.DataFrame({
+            'acc': pd.Categorical(['xyz', 'abcd', 'xyz'], categories=['abcd', 'unused', 'xyz']),
+            'quantity': [1, 2, 3]})
+
+        result = Aggregator().execute(config, None, data)
+
+        self.assertEqual(['abcd', 'xyz'], result['acc'].tolist())
+        self.assertEqual([2, 4], result['total_quantity'].tolist())
+
+    def test_partitioned_aggregation(self):
+        config = {'type': 'aggregate', 'groupby': {'cols': ['acc', 'cusip']},
+                  'aggregations': {'total_quantity': {'col': 'quantity', 'operation': 'sum'},
+                                   'mean_price': {'col': 'price', 'operation': 'mean'}}}
+        data = pd.DataFrame({
+            'acc': ['acc' + str(index % 7) for index in range(100)],
+            'cusip': ['cusip' + str(index % 5) for index in range(100)],
+            'quantity': range(100),
+            'price': [index / 3 for index in range(100)]})
+
+        expected = Aggregator().execute(config, None, data)
+        result = Aggregator().execute({**config, 'partitions': 4}, None, data)
+        sorted_result = Aggregator().execute({**config, 'partitions': 4,
+                                              'groupby': {'cols': ['acc', 'cusip'], 'sort': True}}, None, data)
+
+        pd.testing.assert_frame_equal(expected, result)
+        pd.testing.assert_frame_equal(expected.sort_values(['acc', 'cusip'], ignore_index=True), sorted_result)
@@ -37,6 +37,16 @@ class TestAggregators(unittest.TestCase):
 
         self.assertTrue(pd.DataFrame.equals(expected_result, result))
 
+    def test_aggregations(self):
+        config = {'total': {'col': 'quantity', 'operation': 'sum'}, 'lots': {'col': 'quantity', 'operation': 'count'}}
+        df1 = pd.DataFrame({'acc': ['abcd', 'xyz', 'abcd'], 'quantity': [1, 2, 3]})
+
+        result = aggregations(config, df1.groupby('acc'))
+
+        self.assertListEqual(['total', 'lots'], list(result.columns))
+        self.assertListEqual([4, 2], result['total'].tolist())
+        self.assertListEqual([2, 1], result['lots'].tolist())
+
     def test_get_aggregator(self):
         aggregator_type = 'groupby'
         self.assertEqual(get_aggregator(aggregator_type), groupby)
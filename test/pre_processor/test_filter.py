@@ -1,6 +1,7 @@
 #  Copyright (c) 2023 BlackRock, Inc.
 #  All Rights Reserved.
 
+import re
 import unittest
 
 import pandas as pd
@@ -56,3 +57,67 @@ class TestDFFilter(unittest.TestCase):
         pre_processor = Filter()
         actual_data = pre_processor.execute(config, sources_data=[data], data=data)
         pd.testing.assert_frame_equal(expected_data.reset_index(drop=True), actual_data.reset_index(drop=True))
+
+    def test_filter_trims_only_compared_columns(self):
+        config = {
+            'operator': 'and',
+            'cols': [{'col': 'name', 'val': ['Ashish']},
+                     {'col': 'code', 'val': [' A '], 'trim': False}]
+        }
+        data = pd.DataFrame({
+            'name': [' Ashish ', 'Aman', 'Ashish', 3],
+            'code': [' A ', ' A ', 'A', ' A '],
+            'subject': [' Science ', 'Hindi', 'Hindi', 'Maths']
+        })
+
+        actual_data = Filter().execute(config, sources_data=[data], data=data)
+
+        expected_data = pd.DataFrame({'name': ['Ashish'], 'code': [' A '], 'subject': [' Science ']})
+        pd.testing.assert_frame_equal(expected_data, actual_data.reset_index(drop=True))
+        self.assertEqual(' Ashish ', data['name'][0])
+
+    def test_filter_on_object_column_without_str_values(self):
+        config = {'operator': 'or', 'cols': [{'col': 'id', 'val': [1]}]}
+        data = pd.DataFrame({'id': pd.Series([1, 2], dtype=object)})
+
+        actual_data = Filter().execute(config, sources_data=[data], data=data)
+
+        self.assertListEqual([1], actual_data['id'].tolist())
+
+
+    def test_pushdown_predicate(self):
+        config = {
+            'operator': 'or',
+            'cols': [{'col': 'name', 'val': ['Ashish', None]},
+                     {'col': 'score', 'val': [75, 'x']}
+                     ]
+        }
+
+        predicate = Filter().pushdown_predicate(config, 'scores', {})
+
+        self.assertEqual(("(`name` LIKE %s ESCAPE '!' OR `name` IS NULL) OR "
+                          "(`score` LIKE %s ESCAPE '!' OR `score` IN (%s))",
+                          ['%Ashish%', '%x%', 75]), predicate)
+
+    def test_pushdown_predicate_keeps_values_padded_with_any_whitespace(self):
+        config = {'operator': 'and', 'cols': [{'col': 'name', 'val': ['50%_off!']}]}
+        data = pd.DataFrame({'id': [1, 2, 3, 4], 'name': ['50%_off!\t', '\n50%_off!\r\n', ' 50%_off! ', '50x_off!']})
+
+        predicate, params = Filter().pushdown_predicate(config, 'names', {})
+        # LIKE pattern of the param, '!' escaping the wildcards
+        pattern = re.compile(''.join('.*' if part == '%' else '.' if part == '_' else re.escape(part[-1])
+                                     for part in re.findall('!.|.', params[0], re.DOTALL)), re.DOTALL)
+        matched = data[[bool(pattern.fullmatch(value)) for value in data['name']]]
+        kept = Filter().execute(config, sources_data=[data.copy()], data=data.copy())
+
+        self.assertEqual("`name` LIKE %s ESCAPE '!'", predicate)
+        self.assertListEqual([1, 2, 3], kept['id'].tolist())
+        self.assertListEqual(kept['id'].tolist(), matched['id'].tolist())
+
+    def test_pushdown_predicate_without_trim(self):
+        config = {'operator': 'and', 'cols': [{'col': 'name', 'val': ['Ashish'], 'trim': False}]}
+        self.assertEqual(("`name` IN (%s)", ['Ashish']), Filter().pushdown_predicate(config, 'scores', {}))
+
+    def test_pushdown_predicate_without_operator(self):
+        config = {'cols': [{'col': 'name', 'val': ['Ashish']}]}
+        self.assertIsNone(Filter().pushdown_predicate(config, 'scores', {}))
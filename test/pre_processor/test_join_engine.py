@@ -0,0 +1,149 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from ingen.pre_processor.join_engine import JoinEngine, harmonise_keys, key_index
+from ingen.pre_processor.merger import Merger
+
+
+class TestJoinEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = JoinEngine()
+        self.left = pd.DataFrame({
+            'id': [3, 1, 2, 1, 5],
+            'name': ['C', 'A', 'B', 'A2', 'E'],
+            'value': [30, 10, 20, 11, 50]
+        })
+        self.right = pd.DataFrame({
+            'ref': [1, 2, 3, 4],
+            'value': [1.5, 2.5, 3.5, 4.5],
+            'desc': ['one', 'two', 'three', 'four']
+        })
+
+    def test_join_matches_pandas_merge(self):
+        for how in ['inner', 'left', 'right', 'outer']:
+            expected = pd.merge(self.left, self.right, left_on='id', right_on='ref', how=how)
+            actual = self.engine.join(self.left, self.right, 'id', 'ref', how)
+            pd.testing.assert_frame_equal(expected, actual)
+
+    def test_join_with_unique_left_keys_matches_pandas_merge(self):
+        left = pd.DataFrame({'id': [2, 4, 1], 'name': ['B', 'D', 'A']})
+        right = pd.DataFrame({'id': [1, 2, 1, 3, 2, 2], 'amount': [1, 2, 3, 4, 5, 6]})
+
+        expected = pd.merge(left, right, on='id', how='inner')
+        actual = self.engine.join(left, right, 'id', 'id', 'inner')
+
+        pd.testing.assert_frame_equal(expected, actual)
+
+    def test_join_on_multiple_keys(self):
+        left = pd.DataFrame({'a': ['x', 'x', 'y', None], 'b': [1, 2, 1, 1], 'value': [1, 2, 3, 4]})
+        right = pd.DataFrame({'a': ['x', 'y', None], 'c': [2, 1, 1], 'value': [20, 30, 40]})
+
+        for how in ['inner', 'left', 'outer']:
+            expected = pd.merge(left, right, left_on=['a', 'b'], right_on=['a', 'c'], how=how)
+            actual = self.engine.join(left, right, ['a', 'b'], ['a', 'c'], how)
+            pd.testing.assert_frame_equal(expected, actual)
+
+    def test_join_text_keys_with_numeric_keys(self):
+        left = pd.DataFrame({'id': ['1', '2', '3'], 'name': ['A', 'B', 'C']})
+        right = pd.DataFrame({'id': [1, 3], 'amount': [10, 30]})
+
+        actual = self.engine.join(left, right, 'id', 'id', 'inner')
+
+        expected = pd.DataFrame({'id': ['1', '3'], 'name': ['A', 'C'], 'amount': [10, 30]})
+        pd.testing.assert_frame_equal(expected, actual)
+
+    def test_harmonised_keys_keep_their_original_values_on_both_join_paths(self):
+        unique_left = pd.DataFrame({'id': ['001', '2', '3'], 'name': ['A', 'B', 'C']})
+        duplicated_left = pd.DataFrame({'id': ['001', '2', '2'], 'name': ['A', 'B', 'C']})
+        unique_right = pd.DataFrame({'id': [1, 2], 'amount': [10, 20]})
+        duplicated_right = pd.DataFrame({'id': [1, 2, 2], 'amount': [10, 20, 21]})
+
+        # the index of the unique right keys is probed
+        indexed = self.engine.join(unique_left, unique_right, 'id', 'id', 'inner')
+        # neither side is unique, the join is done by pandas.merge
+        merged = self.engine.join(duplicated_left, duplicated_right, 'id', 'id', 'inner')
+
+        self.assertListEqual(['001', '2'], indexed['id'].tolist())
+        self.assertListEqual(['001', '2', '2', '2', '2'], merged['id'].tolist())
+        self.assertListEqual([10, 20, 21, 20, 21], merged['amount'].tolist())
+
+    def test_harmonised_keys_of_different_names_keep_their_original_values(self):
+        left = pd.DataFrame({'id': ['001', '2', '2', '4']})
+        right = pd.DataFrame({'ref': [1, 2, 2, 3], 'amount': [10, 20, 21, 30]})
+
+        actual = self.engine.join(left, right, 'id', 'ref', 'outer')
+
+        self.assertListEqual(['001', '2', '2', '2', '2', None, '4'],
+                             actual['id'].astype(object).where(actual['id'].notna(), None).tolist())
+        self.assertListEqual([1, 2, 2, 2, 2, 3], actual['ref'].dropna().astype(int).tolist())
+
+    def test_harmonise_keys_as_text_when_values_are_not_numbers(self):
+        left_values, right_values = harmonise_keys([pd.Series(['1', 'A1'])], [pd.Series([1, 2])])
+
+        self.assertEqual(['1', 'A1'], left_values[0].tolist())
+        self.assertEqual(['1', '2'], right_values[0].tolist())
+
+    def test_categorical_keys(self):
+        left = pd.DataFrame({'name': ['b', 'a', 'c', 'a'], 'value': [1, 2, 3, 4]})
+        right = pd.DataFrame({'name': ['a', 'd', 'b'], 'score': [10, 40, 20]})
+
+        for how in ['inner', 'left', 'outer']:
+            expected = pd.merge(left, right, on='name', how=how)
+            actual = self.engine.join(left, right, 'name', 'name', how, categorical_keys=True)
+            pd.testing.assert_frame_equal(expected, actual)
+
+    def test_index_is_reused_for_the_same_source(self):
+        with patch('ingen.pre_processor.join_engine.key_index', wraps=key_index) as index_builder:
+            self.engine.join(self.left, self.right, 'id', 'ref', 'left')
+            self.engine.join(self.left.head(2), self.right, 'id', 'ref', 'left')
+
+        # one index of the right source, and one probe per join
+        self.assertEqual(3, index_builder.call_count)
+
+    def test_index_is_dropped_with_its_source(self):
+        right = self.right.copy()
+        self.engine.join(self.left, right, 'id', 'ref', 'left')
+        self.assertEqual(1, len(self.engine._indexes))
+
+        del right
+
+        self.assertEqual(0, len(self.engine._indexes))
+
+    def test_index_is_rebuilt_when_source_rows_change(self):
+        right = self.right.copy()
+        self.engine.join(self.left, right, 'id', 'ref', 'left')
+        right.loc[len(right)] = [5, 5.5, 'five']
+
+        expected = pd.merge(self.left, right, left_on='id', right_on='ref', how='left')
+        actual = self.engine.join(self.left, right, 'id', 'ref', 'left')
+
+        pd.testing.assert_frame_equal(expected, actual)
+
+    def test_join_random_frames(self):
+        random = np.random.default_rng(0)
+        for _ in range(50):
+            left = pd.DataFrame({'key': random.integers(0, 8, 10), 'value': random.random(10)})
+            right = pd.DataFrame({'key': random.permutation(12)[:6], 'value': random.random(6)})
+            for how in ['inner', 'left']:
+                expected = pd.merge(left, right, on='key', how=how)
+                actual = self.engine.join(left, right, 'key', 'key', how)
+                pd.testing.assert_frame_equal(expected, actual)
+
+    def test_merger_uses_join_engine(self):
+        config = {'type': 'merge', 'source': 'source2', 'left_key': 'id', 'right_key': 'ref',
+                  'categorical_keys': True}
+        with patch('ingen.pre_processor.merger.join_engine') as engine:
+            Merger().execute(config, {'source2': self.right}, self.left)
+
+        engine.join.assert_called_once_with(self.left, self.right, 'id', 'ref', 'inner', True)
+
+
+if __name__ == '__main__':
+    unittest.main()
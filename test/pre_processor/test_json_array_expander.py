@@ -510,6 +510,36 @@ class TestJsonArrayExpander(unittest.TestCase):
 
         pd.testing.assert_frame_equal(result.sort_index(axis=1), expected.sort_index(axis=1))
 
+    def test_parallel_parsing(self):
+        """Test that parsing chunks in separate processes gives the same result"""
+        df = pd.DataFrame({
+            'portfolio': ['A', 'B', 'C', 'D', 'E'],
+            'holdings': ['[{"ticker": "AAPL", "weight": 0.5}, {"ticker": "MSFT"}]', '', '{bad',
+                         '[{"ticker": "GOOGL", "tags": ["tech"]}]', '[]']
+        })
+        config = {'column': 'holdings'}
+
+        expected = self.expander.execute(config, {}, df)
+        result = self.expander.execute({**config, 'workers': 2}, {}, df)
+
+        pd.testing.assert_frame_equal(expected, result)
+        self.assertEqual(['portfolio', 'ticker', 'weight', 'tags'], list(result.columns))
+        self.assertEqual(['A', 'A', 'B', 'C', 'D', 'E'], result['portfolio'].tolist())
+
+    def test_other_column_types_are_kept(self):
+        """Test that the repeated columns keep their dtype"""
+        df = pd.DataFrame({
+            'as_of_date': pd.to_datetime(['2023-01-01', '2023-01-02']),
+            'region': pd.Categorical(['EU', 'US']),
+            'holdings': ['[{"ticker": "AAPL"}, {"ticker": "MSFT"}]', '[{"ticker": "GOOGL"}]']
+        })
+
+        result = self.expander.execute({'column': 'holdings'}, {}, df)
+
+        self.assertEqual(df['as_of_date'].dtype, result['as_of_date'].dtype)
+        self.assertEqual(df['region'].dtype, result['region'].dtype)
+        self.assertEqual(['EU', 'EU', 'US'], result['region'].tolist())
+
     def test_performance_large_dataset(self):
         """Test performance with a moderately large dataset."""
         import time
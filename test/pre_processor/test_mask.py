@@ -46,5 +46,15 @@ class MyTestCase(unittest.TestCase):
         pd.testing.assert_frame_equal(expected_dataframe, masked_data)
 
 
+    def test_pushdown_predicate(self):
+        accounts = pd.DataFrame({'ACCOUNT_ID': [1, 2, 2, None]})
+        config = {'on_col': 'PORTFOLIO_ID', 'masking_source': 'accounts', 'masking_col': 'ACCOUNT_ID'}
+
+        predicate = Mask().pushdown_predicate(config, 'positions', {'accounts': accounts})
+
+        self.assertEqual(("(`PORTFOLIO_ID` IN (%s, %s) OR `PORTFOLIO_ID` IS NULL)", [1.0, 2.0]), predicate)
+        self.assertIsNone(Mask().pushdown_predicate(config, 'positions', {}))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,111 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import unittest
+
+import pandas as pd
+
+from ingen.pre_processor.optimizer import PreProcessOptimizer, join_columns
+from ingen.pre_processor.pre_processor import PreProcessor
+
+
+class TestPreProcessOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        self.positions = pd.DataFrame({
+            'id': [1, 2, 3, 4, 5, 6],
+            'cusip': ['A', 'B', 'C', 'D', 'E', 'F'],
+            'country': ['US', 'US', 'GB', 'FR', 'US', 'GB'],
+            'side': ['B', 'S', 'B', 'B', 'S', 'B']
+        })
+        self.securities = pd.DataFrame({'sec_cusip': ['A', 'B', 'C', 'D', 'E', 'F'], 'name': list('abcdef')})
+        self.countries = pd.DataFrame({'country_code': ['FR'], 'country_name': ['France']})
+        self.lots = pd.DataFrame({'lot_id': [1, 1, 2, 3, 3, 3], 'qty': [10, 20, 30, 40, 50, 60]})
+        self.sources_data = {'positions': self.positions, 'securities': self.securities,
+                             'countries': self.countries, 'lots': self.lots}
+        self.optimizer = PreProcessOptimizer(self.sources_data)
+
+    def test_selective_merge_is_moved_first(self):
+        securities = {'type': 'merge', 'source': 'securities', 'left_key': 'cusip', 'right_key': 'sec_cusip'}
+        countries = {'type': 'merge', 'source': 'countries', 'left_key': 'country', 'right_key': 'country_code'}
+
+        plan = self.optimizer.optimize([securities, countries])
+
+        self.assertEqual([countries, securities], [step.config for step in plan])
+        self.assertIsNone(plan[0].columns)
+        self.assertEqual(['id', 'cusip', 'country', 'side', 'sec_cusip', 'name', 'country_code', 'country_name'],
+                         plan[1].columns)
+
+    def test_merges_on_non_unique_keys_keep_their_order(self):
+        lots = {'type': 'merge', 'source': 'lots', 'left_key': 'id', 'right_key': 'lot_id'}
+        securities = {'type': 'merge', 'source': 'securities', 'left_key': 'cusip', 'right_key': 'sec_cusip'}
+        countries = {'type': 'merge', 'source': 'countries', 'left_key': 'country', 'right_key': 'country_code'}
+
+        plan = self.optimizer.optimize([lots, securities, countries])
+
+        self.assertEqual([countries, lots, securities], [step.config for step in plan])
+
+    def test_merge_on_a_column_of_a_later_merge_is_not_moved_first(self):
+        regions = pd.DataFrame({'name': ['a'], 'region': ['EMEA']})
+        optimizer = PreProcessOptimizer({**self.sources_data, 'regions': regions})
+        securities = {'type': 'merge', 'source': 'securities', 'left_key': 'cusip', 'right_key': 'sec_cusip'}
+        by_name = {'type': 'merge', 'source': 'regions', 'left_key': 'name', 'right_key': 'name'}
+
+        plan = optimizer.optimize([securities, by_name])
+
+        self.assertEqual([securities, by_name], [step.config for step in plan])
+
+    def test_merges_with_suffixed_columns_are_not_reordered(self):
+        countries = pd.DataFrame({'country_code': ['FR'], 'name': ['France']})
+        optimizer = PreProcessOptimizer({**self.sources_data, 'countries': countries})
+        securities = {'type': 'merge', 'source': 'securities', 'left_key': 'cusip', 'right_key': 'sec_cusip'}
+        by_country = {'type': 'merge', 'source': 'countries', 'left_key': 'country', 'right_key': 'country_code'}
+
+        plan = optimizer.optimize([securities, by_country])
+
+        self.assertEqual([securities, by_country], [step.config for step in plan])
+
+    def test_filters_are_moved_before_inner_merges(self):
+        merge = {'type': 'merge', 'source': 'securities', 'left_key': 'cusip', 'right_key': 'sec_cusip'}
+        on_left = {'type': 'not_equals_filter', 'cols': [{'col': 'side', 'val': ['S']}]}
+        on_right = {'type': 'filter', 'operator': 'and', 'cols': [{'col': 'name', 'val': ['a']}]}
+        on_key = {'type': 'filter', 'operator': 'and', 'cols': [{'col': 'cusip', 'val': ['A']}]}
+        mask = {'type': 'mask', 'on_col': 'country', 'masking_source': 'countries', 'masking_col': 'country_code'}
+
+        plan = self.optimizer.optimize([merge, on_left, mask, on_right, on_key])
+
+        self.assertEqual([on_left, mask, merge, on_right, on_key], [step.config for step in plan])
+
+    def test_filters_are_not_moved_before_left_merges_or_other_steps(self):
+        left_merge = {'type': 'merge', 'source': 'securities', 'left_key': 'cusip', 'right_key': 'sec_cusip',
+                      'merge_type': 'left'}
+        aggregate = {'type': 'aggregate', 'groupby': ['side'], 'agg': {'id': 'sum'}}
+        merge = {'type': 'merge', 'source': 'securities', 'left_key': 'cusip', 'right_key': 'sec_cusip'}
+        mask = {'type': 'mask', 'on_col': 'country', 'masking_source': 'countries', 'masking_col': 'country_code'}
+
+        self.assertEqual([left_merge, mask], [step.config for step in self.optimizer.optimize([left_merge, mask])])
+        self.assertEqual([aggregate, merge, mask],
+                         [step.config for step in self.optimizer.optimize([aggregate, merge, mask])])
+
+    def test_filters_are_not_moved_before_merges_on_non_unique_right_keys(self):
+        left = pd.DataFrame({'k': [1, 3, 1, 3], 'c': ['x', 'x', 'x', 'y'], 'i': [0, 1, 2, 3]})
+        right = pd.DataFrame({'k': [4, 2, 7, 1, 9, 1, 5]})
+        sources_data = {'left': left, 'right': right}
+        merge = {'type': 'merge', 'source': 'right', 'left_key': 'k', 'right_key': 'k'}
+        on_left = {'type': 'filter', 'operator': 'and', 'cols': [{'col': 'c', 'val': ['x']}]}
+
+        plan = PreProcessOptimizer(sources_data).optimize([merge, on_left])
+
+        self.assertEqual([merge, on_left], [step.config for step in plan])
+        data = PreProcessor([merge, on_left], sources_data).pre_process()
+        self.assertListEqual([0, 2, 0, 2], data['i'].tolist())
+
+    def test_join_columns(self):
+        self.assertEqual(['id', 'value_x', 'value_y', 'key'],
+                         join_columns(['id', 'value'], ['id', 'value', 'key'], ['id'], ['id']))
+        self.assertEqual(['id', 'value', 'ref', 'name'],
+                         join_columns(['id', 'value'], ['ref', 'name'], ['id'], ['ref']))
+
+
+if __name__ == '__main__':
+    unittest.main()
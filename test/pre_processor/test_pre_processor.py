@@ -76,3 +76,68 @@ class TestPreProcessor(unittest.TestCase):
         error_message = 'Source data cannot be empty'
         with self.assertRaisesRegex(ValueError, error_message):
             pre_processor = PreProcessor(config, data)
+
+
+    def test_pre_process_runs_optimized_plan(self):
+        positions = pd.DataFrame({'cusip': ['A', 'B', 'C'], 'country': ['US', 'FR', 'US']})
+        securities = pd.DataFrame({'sec_cusip': ['A', 'B', 'C'], 'name': ['a', 'b', 'c']})
+        countries = pd.DataFrame({'code': ['FR'], 'country_name': ['France']})
+        merge_securities = {'type': 'merge', 'source': 'securities', 'left_key': 'cusip', 'right_key': 'sec_cusip'}
+        merge_countries = {'type': 'merge', 'source': 'countries', 'left_key': 'country', 'right_key': 'code'}
+        sources_data = {'positions': positions, 'securities': securities, 'countries': countries}
+
+        obj = PreProcessor([merge_securities, merge_countries], sources_data)
+
+        self.assertEqual([merge_countries, merge_securities], [step.config for step in obj.plan()])
+        expected = pd.DataFrame({'cusip': ['B'], 'country': ['FR'], 'sec_cusip': ['B'], 'name': ['b'],
+                                 'code': ['FR'], 'country_name': ['France']})
+        pd.testing.assert_frame_equal(expected, obj.pre_process())
+
+    @patch('ingen.pre_processor.pre_processor.properties')
+    def test_plan_keeps_configured_order_when_optimize_is_false(self, properties_mock):
+        properties_mock.get_property.return_value = 'false'
+        config = [{'type': 'merge', 'source': 'source2', 'left_key': 'id', 'right_key': 'id'},
+                  {'type': 'filter', 'operator': 'and', 'cols': [{'col': 'id', 'val': [1]}]}]
+        data = {'source1': pd.DataFrame({'id': [1, 2]}), 'source2': pd.DataFrame({'id': [1]})}
+
+        plan = PreProcessor(config, data).plan()
+
+        self.assertEqual(config, [step.config for step in plan])
+        properties_mock.get_property.assert_called_with('pre_processing.optimize', 'true')
+
+    def test_join_indexes_are_cleared_after_the_run(self):
+        config = [{'type': 'merge', 'source': 'source2', 'left_key': 'id', 'right_key': 'id', 'merge_type': 'left'}]
+        data = {'source1': pd.DataFrame({'id': [1, 2]}), 'source2': pd.DataFrame({'id': [1, 2], 'b': [3, 4]})}
+
+        with patch('ingen.pre_processor.pre_processor.join_engine') as engine:
+            PreProcessor(config, data).pre_process()
+
+        engine.clear.assert_called_once()
+
+    def test_pushdown_predicates_of_leading_filters(self):
+        config = [{'type': 'filter', 'operator': 'and', 'cols': [{'col': 'id', 'val': [1]}]},
+                  {'type': 'mask', 'on_col': 'id', 'masking_source': 'source2', 'masking_col': 'id'},
+                  {'type': 'drop_duplicates'},
+                  {'type': 'filter', 'operator': 'and', 'cols': [{'col': 'id', 'val': [2]}]}]
+        data = {'source2': pd.DataFrame({'id': [1, 3]})}
+
+        predicates = PreProcessor.pushdown_predicates(config, 'source1', data)
+
+        self.assertListEqual([("`id` IN (%s)", [1]), ("`id` IN (%s, %s)", [1, 3])], predicates)
+
+    def test_no_pushdown_predicates_when_source_is_read_by_later_step(self):
+        config = [{'type': 'filter', 'operator': 'and', 'cols': [{'col': 'id', 'val': [1]}]},
+                  {'type': 'merge', 'source': 'source1', 'left_key': 'id', 'right_key': 'id'}]
+
+        self.assertListEqual([], PreProcessor.pushdown_predicates(config, 'source1', {}))
+
+    def test_no_pushdown_predicates_when_first_step_is_not_a_process(self):
+        for config in [[{'type': 'union', 'source': ['a', 'b']}],
+                       [{'type': 'melt', 'source': ['a'], 'key_column': 'key', 'value_column': 'value'}]]:
+            self.assertListEqual([], PreProcessor.pushdown_predicates(config, 'a', {}))
+
+    def test_not_equals_filter_is_not_pushed_down(self):
+        config = [{'type': 'not_equals_filter', 'cols': [{'col': 'id', 'val': ['001']}]},
+                  {'type': 'filter', 'operator': 'and', 'cols': [{'col': 'id', 'val': [1]}]}]
+
+        self.assertListEqual([], PreProcessor.pushdown_predicates(config, 'source1', {}))
@@ -357,6 +357,27 @@ class TestAPIReader(unittest.TestCase):
         actual_dataframe = reader.execute()
         pd.testing.assert_frame_equal(empty_dataframe, actual_dataframe)
 
+    @patch('ingen.reader.api_reader.execute_requests')
+    def test_normalize_per_response(self, mock_execute_requests):
+        requests = [HTTPRequest(url="http://www.test-url.com", method="GET", auth=self.auth)]
+        responses = [{'data': [{'id': 1, 'name': 'abc'}], 'page': 1},
+                     {'data': [{'id': 2, 'name': 'def'}, {'id': 3, 'name': 'ghi'}], 'page': 2}]
+
+        def stream_responses(reqs, params):
+            # execute_requests passes the frames to on_ready in request order
+            params['on_ready']([params['transform'](res) for res in responses])
+            return []
+
+        mock_execute_requests.side_effect = stream_responses
+
+        reader = APIReader(requests, {'normalize_per_response': True})
+        actual_dataframe = reader.execute(['data'], ['id', 'name'], ['page'])
+
+        expected_dataframe = pd.DataFrame({'id': [1, 2, 3], 'name': ['abc', 'def', 'ghi'], 'page': [1, 2, 2]})
+        pd.testing.assert_frame_equal(expected_dataframe, actual_dataframe, check_dtype=False)
+        self.assertNotIn('transform', reader._reader_params)
+        self.assertNotIn('on_ready', reader._reader_params)
+
 
 if __name__ == '__main__':
     unittest.main()
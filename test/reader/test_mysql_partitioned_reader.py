@@ -0,0 +1,81 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import datetime
+import unittest
+from unittest.mock import patch, Mock, MagicMock
+
+import pandas as pd
+
+from ingen.reader.mysql_partitioned_reader import MYSQLPartitionedReader
+
+
+class TestMYSQLPartitionedReader(unittest.TestCase):
+
+    def test_modulo_partition_predicates(self):
+        reader = MYSQLPartitionedReader([Mock()], {'column': 'id', 'type': 'modulo', 'num_partitions': 3})
+        predicates = reader.partition_predicates("select * from positions")
+
+        self.assertListEqual([
+            ("(ABS(MOD(`id`, %s)) = %s OR `id` IS NULL)", [3, 0]),
+            ("ABS(MOD(`id`, %s)) = %s", [3, 1]),
+            ("ABS(MOD(`id`, %s)) = %s", [3, 2]),
+        ], predicates)
+
+    def test_range_partition_predicates_with_configured_bounds(self):
+        reader = MYSQLPartitionedReader([Mock()], {'column': 'id', 'num_partitions': 4,
+                                                   'lower_bound': 1, 'upper_bound': 100})
+        predicates = reader.partition_predicates("select * from positions")
+
+        self.assertListEqual([
+            ("(`id` < %s OR `id` IS NULL)", [26]),
+            ("`id` >= %s AND `id` < %s", [26, 51]),
+            ("`id` >= %s AND `id` < %s", [51, 76]),
+            ("`id` >= %s", [76]),
+        ], predicates)
+
+    def test_range_partition_fetches_bounds_when_not_configured(self):
+        connection = MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (datetime.date(2023, 1, 1), datetime.date(2023, 1, 3))
+        reader = MYSQLPartitionedReader([connection], {'column': 'trade_date', 'num_partitions': 2})
+
+        predicates = reader.partition_predicates("select * from trades where amount like '5%'")
+
+        cursor.execute.assert_called_with(
+            "SELECT MIN(`trade_date`), MAX(`trade_date`) FROM (select * from trades where amount like '5%%') "
+            "AS ingen_bounds WHERE 1 = 1", [])
+        self.assertListEqual([
+            ("(`trade_date` < %s OR `trade_date` IS NULL)", [datetime.datetime(2023, 1, 2)]),
+            ("`trade_date` >= %s", [datetime.datetime(2023, 1, 2)]),
+        ], predicates)
+
+    def test_range_partition_on_empty_result_reads_single_partition(self):
+        connection = MagicMock()
+        connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (None, None)
+        reader = MYSQLPartitionedReader([connection], {'column': 'id'})
+
+        self.assertListEqual([("1 = 1", [])], reader.partition_predicates("select * from positions"))
+
+    @patch('ingen.reader.mysql_partitioned_reader.MYSQLReader')
+    def test_execute_concatenates_partitions_in_order(self, mock_reader):
+        connections = [Mock(), Mock()]
+        partitions = {0: pd.DataFrame({'id': [0, 3]}), 1: pd.DataFrame({'id': [1]}), 2: pd.DataFrame({'id': [2]})}
+        mock_reader.return_value.read.side_effect = lambda query, params: partitions[params[1]]
+        reader = MYSQLPartitionedReader(connections, {'column': 'id', 'type': 'modulo', 'num_partitions': 3})
+
+        dataframe = reader.execute("select * from positions")
+
+        pd.testing.assert_frame_equal(pd.DataFrame({'id': [0, 3, 1, 2]}), dataframe)
+        mock_reader.return_value.read.assert_any_call(
+            "SELECT * FROM (select * from positions) AS ingen_partition WHERE ABS(MOD(`id`, %s)) = %s", [3, 1])
+        for connection in connections:
+            connection.close.assert_called_once()
+
+    def test_unknown_partition_type(self):
+        with self.assertRaisesRegex(ValueError, "Unknown partition type hash"):
+            MYSQLPartitionedReader([Mock()], {'column': 'id', 'type': 'hash'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,9 +4,15 @@
 import unittest
 from unittest.mock import patch, Mock
 
+import datetime
+from decimal import Decimal
+
+import numpy as np
 import pandas as pd
+from pymysql.constants import FIELD_TYPE
+from pymysql.cursors import SSCursor
 
-from ingen.reader.mysql_reader import MYSQLReader
+from ingen.reader.mysql_reader import MYSQLReader, to_column_array
 
 
 class TestDBReader(unittest.TestCase):
@@ -19,3 +25,67 @@ class TestDBReader(unittest.TestCase):
         mock_pandas.read_sql.return_value = pd.DataFrame()
         dataframe = reader.execute("select * from SAMPLE_TABLE")
         pd.testing.assert_frame_equal(pd.DataFrame(), dataframe)
+
+    def test_execute_streams_in_batches_when_fetch_size_given(self):
+        mock_connection = Mock()
+        mock_cursor = mock_connection.cursor.return_value
+        mock_cursor.description = [('id',), ('name',)]
+        mock_cursor.fetchmany.side_effect = [[(1, 'a'), (2, 'b')], [(3, 'c')], []]
+        reader = MYSQLReader(mock_connection, fetch_size=2)
+
+        dataframe = reader.execute("select id, name from SAMPLE_TABLE")
+
+        expected = pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c']})
+        pd.testing.assert_frame_equal(expected, dataframe)
+        mock_connection.cursor.assert_called_with(SSCursor)
+        mock_cursor.fetchmany.assert_called_with(2)
+        mock_cursor.close.assert_called_once()
+        mock_connection.close.assert_called_once()
+
+    def test_execute_streaming_empty_result_keeps_columns(self):
+        mock_connection = Mock()
+        mock_cursor = mock_connection.cursor.return_value
+        mock_cursor.description = [('id',), ('name',)]
+        mock_cursor.fetchmany.return_value = []
+        reader = MYSQLReader(mock_connection, fetch_size=100)
+
+        dataframe = reader.execute("select id, name from SAMPLE_TABLE")
+
+        self.assertListEqual(['id', 'name'], list(dataframe.columns))
+        self.assertEqual(0, len(dataframe))
+
+    def test_execute_columnar_picks_dtypes_from_description(self):
+        mock_connection = Mock()
+        mock_cursor = mock_connection.cursor.return_value
+        mock_cursor.description = [
+            ('id', FIELD_TYPE.LONGLONG, None, 20, 20, 0, False),
+            ('qty', FIELD_TYPE.LONG, None, 11, 11, 0, True),
+            ('price', FIELD_TYPE.NEWDECIMAL, None, 10, 10, 2, True),
+            ('traded_at', FIELD_TYPE.DATETIME, None, 19, 19, 0, True),
+            ('ticker', FIELD_TYPE.VAR_STRING, None, 40, 40, 0, True),
+        ]
+        mock_cursor.fetchmany.side_effect = [
+            [(1, 10, Decimal('1.50'), datetime.datetime(2023, 1, 2, 10, 0), 'ABC')],
+            [(2, None, None, None, None)],
+            []
+        ]
+        reader = MYSQLReader(mock_connection, fetch_size=1, columnar=True)
+
+        dataframe = reader.execute("select * from trades")
+
+        self.assertEqual(np.int64, dataframe['id'].dtype)
+        self.assertEqual('Int64', dataframe['qty'].dtype)
+        self.assertEqual(np.float64, dataframe['price'].dtype)
+        self.assertEqual('datetime64[ns]', dataframe['traded_at'].dtype)
+        self.assertEqual('string', dataframe['ticker'].dtype)
+        self.assertListEqual([1.5], dataframe['price'].dropna().tolist())
+        self.assertTrue(pd.isna(dataframe['qty'][1]))
+
+    def test_to_column_array_keeps_objects_when_conversion_fails(self):
+        values = (Decimal('1.10'), Decimal('2.20'))
+        array = to_column_array(values, FIELD_TYPE.NEWDECIMAL, True, decimal_as='decimal')
+        self.assertEqual(object, array.dtype)
+        self.assertListEqual(list(values), list(array))
+
+        array = to_column_array((2 ** 64 - 1,), FIELD_TYPE.LONGLONG, False)
+        self.assertEqual(object, array.dtype)
@@ -186,5 +186,23 @@ class TestInterfaceGenerator(unittest.TestCase):
         self.assertEqual(json.loads(json_tbl), json.loads(interface))
 
 
+    def test_read_pushes_down_pre_processes_into_first_source(self):
+        first_source, second_source = Mock(id='positions'), Mock(id='accounts')
+        first_source.can_push_down.return_value = True
+        first_source.fetch.return_value = pd.DataFrame({'id': [1]})
+        second_source.fetch.return_value = pd.DataFrame({'id': [1, 2]})
+        mock_pre_processor = Mock()
+        mock_pre_processor.pushdown_predicates.return_value = [("`id` IN (%s, %s)", [1, 2])]
+        pre_processes = [{'type': 'mask', 'on_col': 'id', 'masking_source': 'accounts', 'masking_col': 'id'}]
+
+        generator = InterfaceGenerator(pre_processor=mock_pre_processor)
+        data = generator.read([first_source, second_source], pre_processes)
+
+        self.assertListEqual(['positions', 'accounts'], list(data.keys()))
+        mock_pre_processor.pushdown_predicates.assert_called_with(pre_processes, 'positions',
+                                                                  {'accounts': second_source.fetch.return_value})
+        first_source.push_down.assert_called_once_with("`id` IN (%s, %s)", [1, 2])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,10 +2,16 @@
 #  All Rights Reserved.
 
 import asyncio
+import json
 import unittest
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, AsyncMock, patch
 
-from ingen.utils.app_http.aiohttp_retry import http_retry_request
+from aiohttp import ClientConnectionError
+
+from ingen.utils.app_http.aiohttp_retry import http_retry_request, backoff_time, client_timeout
+from ingen.utils.app_http.circuit_breaker import CircuitBreaker
+from ingen.utils.app_http.metrics import HTTPMetrics
+from ingen.utils.app_http.rate_limit import TokenBucket
 
 
 class MockSession(MagicMock):
@@ -20,6 +26,46 @@ class MockSession(MagicMock):
         return self.__exit__(*args, **kwargs)
 
 
+class FakeResponse:
+    """
+    Response of FakeSession
+    """
+
+    def __init__(self, status, headers=None, data=None):
+        self.status = status
+        self.headers = headers or {'Content-Type': 'application/json'}
+        self._data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def read(self):
+        return json.dumps(self._data).encode('utf-8') if self._data is not None else b''
+
+    async def json(self):
+        return self._data
+
+
+class FakeSession:
+    """
+    Session returning the given responses one after the other
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
 def passing_success_criteria(response, option):
     """
     Mock success criteria that always returns True
@@ -120,6 +166,80 @@ class MyTestCase(unittest.TestCase):
         # one call, no retries
         self.assertEqual(mock_session.get.call_count, 1)
 
+    @patch('ingen.utils.app_http.aiohttp_retry.asyncio.sleep', new_callable=AsyncMock)
+    def test_http_retry_honours_retry_after(self, mock_sleep):
+        session = FakeSession([FakeResponse(429, {'Content-Type': 'application/json', 'Retry-After': '3'}, {}),
+                               FakeResponse(200, data={'data': 1})])
+        rate_limiter = TokenBucket(100)
+
+        http_response = self.loop.run_until_complete(http_retry_request(session, 'get', 'test.com', retries=2,
+                                                                        interval=1, rate_limiter=rate_limiter))
+
+        self.assertEqual({'data': 1}, http_response.data)
+        # the retry waits for Retry-After plus jitter, and the paused host holds the retry back as well
+        retry_wait_time, rate_limit_wait_time = [call[0][0] for call in mock_sleep.await_args_list]
+        self.assertTrue(3 <= retry_wait_time <= 3.3)
+        self.assertGreater(rate_limit_wait_time, 2)
+
+    @patch('ingen.utils.app_http.aiohttp_retry.asyncio.sleep', new_callable=AsyncMock)
+    def test_http_retry_retries_timeouts_and_connection_errors(self, mock_sleep):
+        session = FakeSession([asyncio.TimeoutError(), ClientConnectionError(), FakeResponse(200, data={'data': 1})])
+
+        http_response = self.loop.run_until_complete(http_retry_request(session, 'get', 'test.com', retries=2))
+
+        self.assertEqual({'data': 1}, http_response.data)
+        self.assertEqual(3, len(session.urls))
+        self.assertEqual(2, mock_sleep.await_count)
+
+    @patch('ingen.utils.app_http.aiohttp_retry.asyncio.sleep', new_callable=AsyncMock)
+    def test_http_retry_returns_none_when_retries_are_exhausted(self, mock_sleep):
+        session = FakeSession([asyncio.TimeoutError(), asyncio.TimeoutError()])
+
+        http_response = self.loop.run_until_complete(http_retry_request(session, 'get', 'test.com', retries=1))
+
+        self.assertIsNone(http_response)
+        self.assertEqual(1, mock_sleep.await_count)
+
+    @patch('ingen.utils.app_http.aiohttp_retry.asyncio.sleep', new_callable=AsyncMock)
+    def test_http_retry_stops_when_the_circuit_opens(self, mock_sleep):
+        breaker = CircuitBreaker('test.com', min_requests=2)
+        session = FakeSession([FakeResponse(500), FakeResponse(503), FakeResponse(200)])
+
+        http_response = self.loop.run_until_complete(
+            http_retry_request(session, 'get', 'test.com', retries=2, circuit_breaker=breaker))
+        skipped_response = self.loop.run_until_complete(
+            http_retry_request(session, 'get', 'test.com', retries=2, circuit_breaker=breaker))
+
+        self.assertIsNone(http_response)
+        self.assertIsNone(skipped_response)
+        self.assertEqual(2, len(session.urls))
+        self.assertEqual(1, mock_sleep.await_count)
+
+    @patch('ingen.utils.app_http.aiohttp_retry.asyncio.sleep', new_callable=AsyncMock)
+    def test_http_retry_records_metrics(self, mock_sleep):
+        metrics = HTTPMetrics()
+        session = FakeSession([asyncio.TimeoutError(), FakeResponse(503), FakeResponse(200, data={'data': 1})])
+
+        self.loop.run_until_complete(http_retry_request(session, 'get', 'test.com', retries=2, metrics=metrics,
+                                                        data='{"id": 1}'))
+
+        self.assertEqual({'timeout': 1, 'status_503': 1}, dict(metrics.retries))
+        self.assertEqual(3, len(metrics.latencies))
+        self.assertEqual(27, metrics.bytes_out)
+        # length of the body read, whatever the Content-Length header says
+        self.assertEqual(len(b'{"data": 1}'), metrics.bytes_in)
+
+    @patch('ingen.utils.app_http.aiohttp_retry.random.uniform', side_effect=lambda low, high: high)
+    def test_backoff_time(self, mock_uniform):
+        self.assertListEqual([2.2, 4.4, 6.6, 8.8], [round(backoff_time(retry, 2, 2), 6) for retry in range(1, 5)])
+        self.assertListEqual([2, 4, 8, 10], [backoff_time(retry, 1, 2, backoff='exponential', max_backoff=10)
+                                             for retry in range(1, 5)])
+
+    def test_client_timeout(self):
+        self.assertIsNone(client_timeout(None))
+        timeout = client_timeout({'connect': 5, 'read': 30})
+        self.assertEqual((None, 5, 30), (timeout.total, timeout.sock_connect, timeout.sock_read))
+
 
 if __name__ == '__main__':
     unittest.main()
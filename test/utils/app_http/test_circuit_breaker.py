@@ -0,0 +1,82 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import unittest
+from unittest.mock import patch
+
+from ingen.utils.app_http.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, PROBE
+from ingen.utils.app_http.http_client import HTTPClientManager
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_from_config(self):
+        self.assertIsNone(CircuitBreaker.from_config('host', None))
+        breaker = CircuitBreaker.from_config('host', {'error_rate': 0.2, 'min_requests': 5})
+        self.assertEqual(CLOSED, breaker.state)
+
+    def test_opens_when_error_rate_is_reached(self):
+        breaker = CircuitBreaker('host', error_rate=0.5, min_requests=4)
+        for success in (True, False, True):
+            breaker.record(success)
+        self.assertEqual(CLOSED, breaker.state)
+        breaker.record(False)
+        self.assertEqual(OPEN, breaker.state)
+        self.assertFalse(breaker.allow())
+
+    @patch('ingen.utils.app_http.circuit_breaker.time.monotonic')
+    def test_old_outcomes_leave_the_window(self, mock_monotonic):
+        breaker = CircuitBreaker('host', error_rate=0.5, window=10, min_requests=2)
+        mock_monotonic.return_value = 0
+        breaker.record(False)
+        mock_monotonic.return_value = 20
+        breaker.record(False)
+        self.assertEqual(CLOSED, breaker.state)
+
+    @patch('ingen.utils.app_http.circuit_breaker.time.monotonic')
+    def test_half_open_probe(self, mock_monotonic):
+        breaker = CircuitBreaker('host', min_requests=1, open_seconds=30)
+        mock_monotonic.return_value = 0
+        breaker.record(False)
+        self.assertTrue(breaker.is_open())
+
+        mock_monotonic.return_value = 31
+        self.assertEqual(PROBE, breaker.allow())
+        self.assertEqual(HALF_OPEN, breaker.state)
+        # only one probe at a time
+        self.assertFalse(breaker.allow())
+        breaker.record(False, probe=True)
+        self.assertEqual(OPEN, breaker.state)
+
+        mock_monotonic.return_value = 62
+        self.assertEqual(PROBE, breaker.allow())
+        breaker.record(True, probe=True)
+        self.assertEqual(CLOSED, breaker.state)
+        self.assertIs(True, breaker.allow())
+
+    @patch('ingen.utils.app_http.circuit_breaker.time.monotonic')
+    def test_half_open_circuit_ignores_outcomes_of_other_requests(self, mock_monotonic):
+        breaker = CircuitBreaker('host', min_requests=1, open_seconds=30)
+        mock_monotonic.return_value = 0
+        breaker.record(False)
+
+        mock_monotonic.return_value = 31
+        self.assertEqual(PROBE, breaker.allow())
+        # a request sent before the circuit opened completes while the probe is in flight
+        breaker.record(True)
+        self.assertEqual(HALF_OPEN, breaker.state)
+        self.assertFalse(breaker.allow())
+
+        breaker.record(False, probe=True)
+        self.assertEqual(OPEN, breaker.state)
+
+    def test_client_manager_shares_the_breaker_of_a_host(self):
+        manager = HTTPClientManager()
+        self.assertIsNone(manager.circuit_breaker('https://api.test/a'))
+        breaker = manager.circuit_breaker('https://api.test/a', True)
+        self.assertIs(breaker, manager.circuit_breaker('https://api.test/b'))
+        self.assertIsNone(manager.circuit_breaker('https://other.test/a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import asyncio
+import unittest
+
+from ingen.utils.app_http.concurrency import AdaptiveConcurrencyLimiter
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def run_attempts(self, limiter, statuses):
+        async def attempt(status):
+            async with limiter.attempt() as slot:
+                await asyncio.sleep(0)
+                slot.status = status
+
+        async def run():
+            for status in statuses:
+                await attempt(status)
+
+        self.loop.run_until_complete(run())
+
+    def test_from_config(self):
+        self.assertIsNone(AdaptiveConcurrencyLimiter.from_config(None))
+        limiter = AdaptiveConcurrencyLimiter.from_config({'type': 'adaptive', 'min_tasks': 2, 'max_tasks': 8}, 4)
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(8, limiter.max_limit)
+        self.assertEqual(1, AdaptiveConcurrencyLimiter.from_config('adaptive').limit)
+
+    def test_limit_increases_on_healthy_responses(self):
+        limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=4)
+
+        self.run_attempts(limiter, [200] * 10)
+
+        self.assertEqual(4, limiter.limit)
+
+    def test_limit_backs_off_on_throttling(self):
+        limiter = AdaptiveConcurrencyLimiter(min_limit=1, max_limit=16, initial_limit=8)
+
+        self.run_attempts(limiter, [429])
+
+        self.assertEqual(4, limiter.limit)
+        self.assertEqual(1, limiter.decreases)
+
+    def test_limit_backs_off_on_timeout(self):
+        limiter = AdaptiveConcurrencyLimiter(min_limit=2, max_limit=16, initial_limit=3)
+
+        async def attempt():
+            async with limiter.attempt():
+                raise asyncio.TimeoutError()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(attempt())
+        self.assertEqual(2, limiter.limit)
+
+    def test_requests_in_flight_are_limited(self):
+        limiter = AdaptiveConcurrencyLimiter(min_limit=2, max_limit=2)
+
+        async def attempt():
+            async with limiter.attempt() as slot:
+                await asyncio.sleep(0.01)
+                slot.status = 200
+
+        self.loop.run_until_complete(asyncio.gather(*[attempt() for _ in range(6)]))
+
+        self.assertEqual(2, limiter.peak_in_flight)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from ingen.utils.app_http.aiohttp_retry import HTTPResponse
+from ingen.utils.app_http.http_archive import HTTPArchive, RECORD, REPLAY
+from ingen.utils.app_http.http_client import client_manager
+from ingen.utils.app_http.http_request import HTTPRequest
+from ingen.utils.app_http.http_util import send_request
+
+
+class TestHTTPArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'run.jsonl.gz')
+        self.request = HTTPRequest(url='https://api.test/positions', method='get', headers={'Token': 'secret'})
+
+    def tearDown(self):
+        client_manager.archive = None
+        self.temp_dir.cleanup()
+
+    def test_record_and_replay(self):
+        archive = HTTPArchive(self.path, RECORD)
+        archive.record(self.request, HTTPResponse(200, {'Content-Type': 'application/json'}, {'page': 1}))
+        archive.record(self.request, HTTPResponse(200, {}, {'page': 2}))
+        archive.record(HTTPRequest(url='https://api.test/failed', method='GET'), None)
+        archive.save()
+
+        replay = HTTPArchive(self.path, REPLAY)
+        self.assertEqual(HTTPResponse(200, {'Content-Type': 'application/json'}, {'page': 1}),
+                         replay.replay(self.request))
+        self.assertEqual({'page': 2}, replay.replay(self.request).data)
+        # the last recorded response is repeated
+        self.assertEqual({'page': 2}, replay.replay(self.request).data)
+        self.assertIsNone(replay.replay(HTTPRequest(url='https://api.test/failed', method='GET')))
+        self.assertIsNone(replay.replay(HTTPRequest(url='https://api.test/unknown', method='GET')))
+
+    def test_key_ignores_headers(self):
+        other_headers = HTTPRequest(url=self.request.url, method='GET', headers={'Token': 'other'})
+        other_body = HTTPRequest(url=self.request.url, method='GET', data=b'\x1f\x8b')
+        self.assertEqual(HTTPArchive.key(self.request), HTTPArchive.key(other_headers))
+        self.assertNotEqual(HTTPArchive.key(self.request), HTTPArchive.key(other_body))
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request', new_callable=AsyncMock)
+    def test_send_request_records_and_replays(self, mock_retry):
+        mock_retry.return_value = HTTPResponse(200, {}, {'id': 1})
+        client_manager.archive = HTTPArchive(self.path, RECORD)
+        asyncio.run(send_request(None, self.request, {}))
+        client_manager.archive.save()
+
+        client_manager.archive = HTTPArchive(self.path, REPLAY)
+        response = asyncio.run(send_request(None, self.request, {}))
+
+        self.assertEqual({'id': 1}, response.data)
+        mock_retry.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import asyncio
+import unittest
+
+from ingen.utils.app_http.http_client import HTTPClientManager, connection_settings, DEFAULT_CONNECTION
+
+
+class TestHTTPClientManager(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.manager = HTTPClientManager()
+
+    def tearDown(self) -> None:
+        self.manager.close()
+
+    def test_session_is_reused_across_runs(self):
+        first_session = self.manager.run(self.manager.session())
+        second_session = self.manager.run(self.manager.session())
+
+        self.assertIs(first_session, second_session)
+        self.assertIsNot(first_session, self.manager.run(self.manager.session(ssl=False)))
+
+    def test_session_uses_connection_settings(self):
+        session = self.manager.run(self.manager.session(connection={'limit_per_host': 8}))
+
+        self.assertEqual(8, session.connector.limit_per_host)
+        self.assertEqual(DEFAULT_CONNECTION['limit'], session.connector.limit)
+        self.assertIsNot(session, self.manager.run(self.manager.session()))
+        self.assertIs(session, self.manager.run(self.manager.session(connection={'limit_per_host': 8})))
+
+    def test_unknown_connection_setting(self):
+        with self.assertRaisesRegex(ValueError, "Unknown connection settings pool"):
+            connection_settings({'pool': 10})
+
+    def test_loop_is_kept_between_runs(self):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        self.assertIs(self.manager.run(current_loop()), self.manager.run(current_loop()))
+
+    def test_close_closes_sessions_and_loop(self):
+        session = self.manager.run(self.manager.session())
+        loop = self.manager.loop
+
+        self.manager.close()
+
+        self.assertTrue(session.closed)
+        self.assertTrue(loop.is_closed())
+        new_session = self.manager.run(self.manager.session())
+        self.assertIsNot(session, new_session)
+        self.assertFalse(new_session.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
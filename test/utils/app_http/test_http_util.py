@@ -9,7 +9,8 @@ from aiohttp import BasicAuth
 
 from ingen.utils.app_http.http_request import HTTPRequest
 from ingen.utils.app_http.aiohttp_retry import HTTPResponse
-from ingen.utils.app_http.http_util import api_auth, execute_requests
+from ingen.utils.app_http.http_client import client_manager
+from ingen.utils.app_http.http_util import api_auth, execute_requests, OrderedResults
 from ingen.utils.app_http.success_criterias import get_criteria_by_name, DEFAULT_STATUS_CRITERIA_OPTIONS
 
 
@@ -46,6 +47,7 @@ class MyTestCase(unittest.TestCase):
         }
 
     def tearDown(self) -> None:
+        client_manager.close()
         self.loop.close()
 
     @patch('ingen.utils.app_http.http_util.Properties')
@@ -113,6 +115,229 @@ class MyTestCase(unittest.TestCase):
         parsed_data = execute_requests(requests, self.request_params)
         self.assertListEqual(expected_responses, parsed_data)
 
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_paginated_requests_prefetch_remaining_pages(self, mock_http_retry_request):
+        requests = [HTTPRequest(url="http://test.com/items", method="GET")]
+        pages = {'0': {'total': 5, 'items': [1, 2]}, '2': {'total': 5, 'items': [3, 4]},
+                 '4': {'total': 5, 'items': [5]}}
+        requested_urls = []
+
+        async def mock_response(session, method, url, **kwargs):
+            requested_urls.append(url)
+            return HTTPResponse(200, dict(), pages[url.split('offset=')[1].split('&')[0]])
+
+        mock_http_retry_request.side_effect = mock_response
+        request_params = {**self.request_params, 'tasks_len': 2,
+                          'pagination': {'type': 'offset', 'limit': 2, 'total_key': 'total'}}
+
+        parsed_data = execute_requests(requests, request_params)
+
+        self.assertEqual('http://test.com/items?offset=0&limit=2', requested_urls[0])
+        self.assertEqual(3, len(requested_urls))
+        self.assertListEqual([1, 2, 3, 4, 5], [item for page in parsed_data for item in page['items']])
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_resources_are_paginated_concurrently(self, mock_http_retry_request):
+        requests = [HTTPRequest(url=f"http://test.com/{name}", method="GET") for name in ['a', 'b', 'c']]
+        in_flight = 0
+        peak = 0
+
+        async def mock_response(session, method, url, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if 'cursor' in url:
+                return HTTPResponse(200, dict(), {'items': [url.split('/')[3][0] + '2'], 'next': None})
+            return HTTPResponse(200, dict(), {'items': [url.rsplit('/', 1)[1] + '1'], 'next': 'p2'})
+
+        mock_http_retry_request.side_effect = mock_response
+        request_params = {**self.request_params, 'tasks_len': 2,
+                          'pagination': {'type': 'cursor', 'cursor_key': 'next'}}
+
+        parsed_data = execute_requests(requests, request_params)
+
+        self.assertListEqual(['a1', 'a2', 'b1', 'b2', 'c1', 'c2'],
+                             [item for page in parsed_data for item in page['items']])
+        self.assertEqual(2, peak)
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_prefetched_pages_of_all_resources_are_bounded_by_tasks_len(self, mock_http_retry_request):
+        requests = [HTTPRequest(url=f"http://test.com/{name}", method="GET") for name in ['a', 'b', 'c']]
+        in_flight = 0
+        peak = 0
+
+        async def mock_response(session, method, url, **kwargs):
+            nonlocal in_flight, peak
+            async with kwargs['limiter'].attempt() as attempt:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+                attempt.status = 200
+            return HTTPResponse(200, dict(), {'total': 6, 'items': [1, 2]})
+
+        mock_http_retry_request.side_effect = mock_response
+        request_params = {**self.request_params, 'tasks_len': 2,
+                          'pagination': {'type': 'offset', 'limit': 2, 'total_key': 'total'}}
+
+        parsed_data = execute_requests(requests, request_params)
+
+        self.assertEqual(9, len(parsed_data))
+        self.assertEqual(2, peak)
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_all_pages_share_the_adaptive_limiter(self, mock_http_retry_request):
+        requests = [HTTPRequest(url=f"http://test.com/{name}", method="GET") for name in ['a', 'b']]
+        limiters = []
+
+        async def mock_response(session, method, url, **kwargs):
+            limiters.append(kwargs['limiter'])
+            return HTTPResponse(200, dict(), {'total': 4, 'items': [1, 2]})
+
+        mock_http_retry_request.side_effect = mock_response
+        request_params = {**self.request_params, 'concurrency': 'adaptive',
+                          'pagination': {'type': 'offset', 'limit': 2, 'total_key': 'total'}}
+
+        execute_requests(requests, request_params)
+
+        self.assertEqual(4, len(limiters))
+        self.assertIsNotNone(limiters[0])
+        self.assertTrue(all(limiter is limiters[0] for limiter in limiters))
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_transform_is_applied_after_the_next_page_is_found(self, mock_http_retry_request):
+        requests = [HTTPRequest(url="http://test.com/items", method="GET")]
+        pages = {'http://test.com/items': {'items': [1, 2], 'next': 'abc'},
+                 'http://test.com/items?cursor=abc': {'items': [3], 'next': None}}
+
+        async def mock_response(session, method, url, **kwargs):
+            return HTTPResponse(200, dict(), pages[url])
+
+        mock_http_retry_request.side_effect = mock_response
+        request_params = {**self.request_params, 'transform': lambda data: data['items'],
+                          'pagination': {'type': 'cursor', 'cursor_key': 'next'}}
+
+        parsed_data = execute_requests(requests, request_params)
+
+        self.assertListEqual([[1, 2], [3]], parsed_data)
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_responses_are_in_request_order(self, mock_http_retry_request):
+        requests = [HTTPRequest(url=f"http://test.com/{index}", method="GET") for index in range(6)]
+
+        async def mock_response(session, method, url, **kwargs):
+            index = int(url.rsplit('/', 1)[1])
+            # later requests complete first
+            await asyncio.sleep((6 - index) * 0.01)
+            return HTTPResponse(200, dict(), index)
+
+        mock_http_retry_request.side_effect = mock_response
+        request_params = {**self.request_params, 'tasks_len': 3, 'queue_size': 6}
+
+        parsed_data = execute_requests(requests, request_params)
+
+        self.assertListEqual([0, 1, 2, 3, 4, 5], parsed_data)
+        self.assertEqual(6, len(requests))
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_failed_transform_keeps_the_slot_of_its_request(self, mock_http_retry_request):
+        requests = [HTTPRequest(url=f"http://test.com/{index}", method="GET") for index in range(3)]
+
+        async def mock_response(session, method, url, **kwargs):
+            return HTTPResponse(200, dict(), int(url.rsplit('/', 1)[1]))
+
+        def transform(data):
+            if data == 1:
+                raise ValueError("cannot transform")
+            return data
+
+        mock_http_retry_request.side_effect = mock_response
+        request_params = {**self.request_params, 'tasks_len': 2, 'transform': transform}
+
+        parsed_data = execute_requests(requests, request_params)
+
+        self.assertListEqual([0, 2], parsed_data)
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_streamed_responses_are_passed_in_request_order(self, mock_http_retry_request):
+        requests = [HTTPRequest(url=f"http://test.com/{index}", method="GET") for index in range(6)]
+
+        async def mock_response(session, method, url, **kwargs):
+            index = int(url.rsplit('/', 1)[1])
+            await asyncio.sleep((6 - index) * 0.01)
+            return HTTPResponse(200, dict(), index) if index != 4 else None
+
+        mock_http_retry_request.side_effect = mock_response
+        ready = []
+        request_params = {**self.request_params, 'tasks_len': 3, 'queue_size': 6, 'on_ready': ready.append}
+
+        parsed_data = execute_requests(requests, request_params)
+
+        self.assertListEqual([], parsed_data)
+        self.assertListEqual([0, 1, 2, 3, 5], [data for chunk in ready for data in chunk])
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_streamed_pages_are_passed_in_resource_order(self, mock_http_retry_request):
+        requests = [HTTPRequest(url=f"http://test.com/{name}", method="GET") for name in ['a', 'b']]
+
+        async def mock_response(session, method, url, **kwargs):
+            # the pages of the second resource are fetched first
+            await asyncio.sleep(0.02 if '/a' in url else 0)
+            if 'cursor' in url:
+                return HTTPResponse(200, dict(), {'items': [url.split('/')[3][0] + '2'], 'next': None})
+            return HTTPResponse(200, dict(), {'items': [url.rsplit('/', 1)[1] + '1'], 'next': 'p2'})
+
+        mock_http_retry_request.side_effect = mock_response
+        ready = []
+        request_params = {**self.request_params, 'tasks_len': 2, 'on_ready': ready.append,
+                          'pagination': {'type': 'cursor', 'cursor_key': 'next'}}
+
+        execute_requests(requests, request_params)
+
+        self.assertListEqual(['a1', 'a2', 'b1', 'b2'],
+                             [item for chunk in ready for page in chunk for item in page['items']])
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request')
+    def test_on_ready_error_is_raised_once_the_requests_complete(self, mock_http_retry_request):
+        requests = [HTTPRequest(url=f"http://test.com/{index}", method="GET") for index in range(3)]
+
+        async def mock_response(session, method, url, **kwargs):
+            return HTTPResponse(200, dict(), url)
+
+        def on_ready(data):
+            raise ValueError("cannot consume")
+
+        mock_http_retry_request.side_effect = mock_response
+        request_params = {**self.request_params, 'tasks_len': 2, 'on_ready': on_ready}
+
+        with self.assertRaisesRegex(ValueError, "cannot consume"):
+            execute_requests(requests, request_params)
+        self.assertEqual(3, mock_http_retry_request.call_count)
+
+    def test_ordered_results_keep_request_order(self):
+        results = OrderedResults(4)
+        results.set(2, 'c')
+        results.set(0, 'a')
+        results.set(1, 'b')
+        results.set(3, 'd')
+
+        self.assertListEqual(['a', 'b', 'c', 'd'], results.responses)
+        self.assertEqual(4, results.completed)
+
+    def test_ordered_results_emit_contiguous_prefixes(self):
+        ready = []
+        results = OrderedResults(4, ready.append)
+        results.set(2, 'c')
+        results.set(0, 'a')
+        results.set(1, 'b')
+        results.set(3, 'd')
+
+        self.assertListEqual([['a'], ['b', 'c'], ['d']], ready)
+        # the responses passed to on_ready are released
+        self.assertListEqual([None, None, None, None], results.responses)
+
 
 if __name__ == '__main__':
     unittest.main()
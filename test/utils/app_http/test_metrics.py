@@ -0,0 +1,36 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import unittest
+
+from ingen.utils.app_http.metrics import HTTPMetrics
+
+
+class TestHTTPMetrics(unittest.TestCase):
+
+    def test_percentile(self):
+        metrics = HTTPMetrics()
+        self.assertIsNone(metrics.percentile(50))
+        for latency in range(1, 101):
+            metrics.record_attempt(latency / 100)
+
+        self.assertEqual(0.5, metrics.percentile(50))
+        self.assertEqual(0.99, metrics.percentile(99))
+        self.assertEqual(1.0, metrics.percentile(100))
+
+    def test_counters_and_summary(self):
+        metrics = HTTPMetrics()
+        metrics.record_attempt(0.2, bytes_in=100, bytes_out=10, decode_time=0.01)
+        metrics.record_attempt(0.1, bytes_in=50)
+        metrics.record_retry('status_503')
+        metrics.record_request(True)
+        metrics.record_request(False)
+
+        self.assertEqual({'requests': 2, 'failed_requests': 1, 'attempts': 2, 'retries': 1, 'bytes_in': 150,
+                          'bytes_out': 10}, metrics.counters())
+        self.assertIn("retries: status_503=1", metrics.summary())
+        self.assertIn("p50=0.100s", metrics.summary())
+
+
+if __name__ == '__main__':
+    unittest.main()
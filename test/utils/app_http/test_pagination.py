@@ -0,0 +1,76 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import unittest
+
+from multidict import CIMultiDict
+
+from ingen.utils.app_http.aiohttp_retry import HTTPResponse
+from ingen.utils.app_http.http_request import HTTPRequest
+from ingen.utils.app_http.pagination import get_paginator, set_query_param
+
+
+class TestPagination(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.request = HTTPRequest(url='http://test.com/items?ids=1,2', method='GET')
+
+    def test_set_query_param_keeps_other_params(self):
+        self.assertEqual('http://test.com/items?ids=1,2&offset=10',
+                         set_query_param('http://test.com/items?offset=0&ids=1,2', 'offset', 10))
+
+    def test_offset_pagination_with_total(self):
+        paginator = get_paginator({'type': 'offset', 'limit': 10, 'total_key': 'meta.total'})
+        first_request = paginator.first_request(self.request)
+        response = HTTPResponse(200, {}, {'meta': {'total': 25}, 'items': []})
+
+        remaining = paginator.remaining_requests(first_request, response)
+
+        self.assertEqual('http://test.com/items?ids=1,2&offset=0&limit=10', first_request.url)
+        self.assertListEqual(['http://test.com/items?ids=1,2&offset=10&limit=10',
+                              'http://test.com/items?ids=1,2&offset=20&limit=10'],
+                             [request.url for request in remaining])
+
+    def test_offset_pagination_stops_on_short_page(self):
+        paginator = get_paginator({'type': 'offset', 'limit': 2, 'records_key': 'items'})
+        first_request = paginator.first_request(self.request)
+
+        self.assertIsNone(paginator.remaining_requests(first_request, HTTPResponse(200, {}, {'items': [1, 2]})))
+        next_request = paginator.next_request(first_request, HTTPResponse(200, {}, {'items': [1, 2]}))
+        self.assertEqual('http://test.com/items?ids=1,2&offset=2&limit=2', next_request.url)
+        self.assertIsNone(paginator.next_request(next_request, HTTPResponse(200, {}, {'items': [3]})))
+
+    def test_page_pagination_with_total_pages(self):
+        paginator = get_paginator({'type': 'page', 'total_pages_key': 'pages'})
+        first_request = paginator.first_request(self.request)
+
+        remaining = paginator.remaining_requests(first_request, HTTPResponse(200, {}, {'pages': 3}))
+
+        self.assertEqual('http://test.com/items?ids=1,2&page=1', first_request.url)
+        self.assertListEqual(['http://test.com/items?ids=1,2&page=2', 'http://test.com/items?ids=1,2&page=3'],
+                             [request.url for request in remaining])
+
+    def test_cursor_pagination(self):
+        paginator = get_paginator({'type': 'cursor', 'cursor_param': 'next', 'cursor_key': 'paging.cursor'})
+
+        next_request = paginator.next_request(self.request, HTTPResponse(200, {}, {'paging': {'cursor': 'a b'}}))
+
+        self.assertEqual('http://test.com/items?ids=1,2&next=a%20b', next_request.url)
+        self.assertIsNone(paginator.next_request(next_request, HTTPResponse(200, {}, {'paging': {}})))
+
+    def test_link_header_pagination(self):
+        paginator = get_paginator({'type': 'link'})
+        headers = CIMultiDict([('Link', '</items?page=1>; rel="prev"'), ('Link', '</items?page=3>; rel="next"')])
+
+        next_request = paginator.next_request(self.request, HTTPResponse(200, headers, []))
+
+        self.assertEqual('http://test.com/items?page=3', next_request.url)
+        self.assertIsNone(paginator.next_request(next_request, HTTPResponse(200, CIMultiDict(), [])))
+
+    def test_unknown_pagination_type(self):
+        with self.assertRaisesRegex(ValueError, "Unknown pagination type token"):
+            get_paginator({'type': 'token'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+from ingen.utils.app_http.http_client import HTTPClientManager
+from ingen.utils.app_http.rate_limit import TokenBucket, parse_rate_limit, parse_retry_after
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_is_served_then_requests_are_spaced(self):
+        bucket = TokenBucket(10, burst=2)
+
+        self.assertEqual(0, bucket.reserve())
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.1, bucket.reserve(), places=2)
+        self.assertAlmostEqual(0.2, bucket.reserve(), places=2)
+
+    def test_tighten_keeps_most_restrictive_rate(self):
+        bucket = TokenBucket(10)
+        bucket.tighten(2)
+        bucket.tighten(5)
+
+        self.assertEqual(2, bucket.rate)
+        self.assertEqual(2, bucket.burst)
+
+    def test_pause_holds_requests_back(self):
+        bucket = TokenBucket(100)
+        bucket.pause(5)
+
+        self.assertAlmostEqual(5, bucket.reserve(), places=1)
+
+    def test_requests_are_spaced_at_the_rate_after_a_pause(self):
+        bucket = TokenBucket(10, burst=5)
+        bucket.pause(2)
+
+        self.assertAlmostEqual(2.0, bucket.reserve(), places=2)
+        self.assertAlmostEqual(2.1, bucket.reserve(), places=2)
+        self.assertAlmostEqual(2.2, bucket.reserve(), places=2)
+
+    def test_parse_rate_limit(self):
+        self.assertIsNone(parse_rate_limit(None))
+        self.assertEqual((5.0, None), parse_rate_limit('5'))
+        self.assertEqual((5.0, 10), parse_rate_limit({'requests_per_second': 5, 'burst': 10}))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(120, parse_retry_after('120'))
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        self.assertAlmostEqual(30, parse_retry_after(retry_at), delta=2)
+
+    @patch('ingen.utils.app_http.http_client.properties')
+    def test_rate_limiter_is_shared_per_host(self, mock_properties):
+        mock_properties.get_property.return_value = None
+        manager = HTTPClientManager()
+
+        limiter = manager.rate_limiter('https://api.test.com/v1/items?id=1', {'requests_per_second': 10})
+
+        self.assertIs(limiter, manager.rate_limiter('https://api.test.com/v2/other'))
+        self.assertIs(limiter, manager.rate_limiter('https://api.test.com/v1/items', 4))
+        self.assertEqual(4, limiter.rate)
+        self.assertIsNone(manager.rate_limiter('https://other.test.com/items'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+#  Copyright (c) 2023 BlackRock, Inc.
+#  All Rights Reserved.
+
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from ingen.utils.app_http.aiohttp_retry import HTTPResponse
+from ingen.utils.app_http.http_request import HTTPRequest
+from ingen.utils.app_http.http_util import send_request
+from ingen.utils.app_http.response_cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.request = HTTPRequest(url='https://api.test/positions?id=1', method='GET',
+                                   headers={'Accept': 'application/json', 'X-Trace': '1'})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_from_config(self):
+        self.assertIsNone(ResponseCache.from_config(None))
+        self.assertIsNone(ResponseCache.from_config(False))
+        self.assertIsInstance(ResponseCache.from_config(True), ResponseCache)
+
+    def test_key_ignores_headers_not_in_key_headers(self):
+        cache = ResponseCache(self.temp_dir.name, key_headers=['Accept'])
+        other_trace = HTTPRequest(url=self.request.url, method='get',
+                                  headers={'Accept': 'application/json', 'X-Trace': '2'})
+        other_accept = HTTPRequest(url=self.request.url, method='GET', headers={'Accept': 'text/csv'})
+        self.assertEqual(cache.key(self.request), cache.key(other_trace))
+        self.assertNotEqual(cache.key(self.request), cache.key(other_accept))
+
+    def test_store_and_get_with_etag(self):
+        cache = ResponseCache(self.temp_dir.name)
+        cache.store(self.request, HTTPResponse(200, {'ETag': '"v1"'}, {'id': 1}))
+        entry = cache.get(self.request)
+        self.assertEqual({'id': 1}, entry['data'])
+        self.assertFalse(cache.is_fresh(entry))
+        self.assertEqual({'If-None-Match': '"v1"'}, ResponseCache.conditional_headers(entry))
+
+    def test_response_without_validators_is_not_stored(self):
+        cache = ResponseCache(self.temp_dir.name)
+        cache.store(self.request, HTTPResponse(200, {}, {'id': 1}))
+        self.assertIsNone(cache.get(self.request))
+
+    def test_ttl(self):
+        cache = ResponseCache(self.temp_dir.name, ttl=60)
+        cache.store(self.request, HTTPResponse(200, {}, {'id': 1}))
+        self.assertTrue(cache.is_fresh(cache.get(self.request)))
+
+
+class TestSendRequestWithCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.request = HTTPRequest(url='https://api.test/positions', method='GET')
+        self.request_params = {'cache': {'dir': self.temp_dir.name}, 'retries': 0}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request', new_callable=AsyncMock)
+    def test_not_modified_response_is_served_from_cache(self, mock_retry):
+        mock_retry.side_effect = [HTTPResponse(200, {'ETag': '"v1"'}, {'id': 1}),
+                                  HTTPResponse(304, {'ETag': '"v1"'}, None)]
+        first = asyncio.run(send_request(None, self.request, self.request_params))
+        second = asyncio.run(send_request(None, self.request, self.request_params))
+
+        self.assertEqual({'id': 1}, first.data)
+        self.assertEqual(HTTPResponse(200, {'ETag': '"v1"'}, {'id': 1}), second)
+        self.assertEqual({'If-None-Match': '"v1"'}, mock_retry.await_args_list[1].kwargs['headers'])
+        success_criteria = mock_retry.await_args_list[1].kwargs['success_criteria']
+        self.assertTrue(success_criteria(HTTPResponse(304, {}, None), {}))
+
+    @patch('ingen.utils.app_http.http_util.http_retry_request', new_callable=AsyncMock)
+    def test_fresh_response_does_not_call_the_server(self, mock_retry):
+        mock_retry.return_value = HTTPResponse(200, {}, {'id': 1})
+        self.request_params['cache']['ttl'] = 60
+        asyncio.run(send_request(None, self.request, self.request_params))
+        response = asyncio.run(send_request(None, self.request, self.request_params))
+
+        self.assertEqual({'id': 1}, response.data)
+        mock_retry.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -46,8 +46,7 @@ class MyTestCase(unittest.TestCase):
         cmd_line_query_params = None
         query = "select * from cusip_table, #temp_table temp_table where purpose = temp_table.alias_code"
         expected_query = "create table #temp_table (alias_code int);" \
-                         "INSERT INTO #temp_table (alias_code) VALUES (5005);" \
-                         "INSERT INTO #temp_table (alias_code) VALUES (1234);" \
+                         "INSERT INTO #temp_table (alias_code) VALUES (5005), (1234);" \
                          "select * from cusip_table, #temp_table temp_table where purpose = " \
                          "temp_table.alias_code"
 
@@ -68,8 +67,7 @@ class MyTestCase(unittest.TestCase):
         query = "select name as NAME from students, #temp_table temp_table" \
                 "where subject = 'English' and subject.id = temp_table.id"
         expected_query = "create table #temp_table (id varchar(50),course_name varchar(50));INSERT INTO #temp_table ("\
-                         "id,course_name) VALUES (1, 'Literature');" \
-                         "INSERT INTO #temp_table (id,course_name) VALUES (2, 'Political Science');" \
+                         "id,course_name) VALUES (1, 'Literature'), (2, 'Political Science');" \
                          "select name as NAME from students, #temp_table temp_table" \
                          "where subject = 'English' and subject.id = temp_table.id"
 
@@ -99,8 +97,7 @@ class MyTestCase(unittest.TestCase):
         cmd_line_query_params = None
         query = "select * from cusip_table, #temp_table temp_table where bfm_cusip = temp_table.bcusip"
         expected_query = "create table #temp_table (bcusip varchar(50));" \
-                         "INSERT INTO #temp_table (bcusip) VALUES ('BACH890LK');" \
-                         "INSERT INTO #temp_table (bcusip) VALUES ('BHNK98J80');" \
+                         "INSERT INTO #temp_table (bcusip) VALUES ('BACH890LK'), ('BHNK98J80');" \
                          "select * from cusip_table, #temp_table temp_table where bfm_cusip = " \
                          "temp_table.bcusip"
 
@@ -138,8 +135,7 @@ class MyTestCase(unittest.TestCase):
         cmd_line_query_params = {'run_date': date}
         query = "select * from cusip_table, #temp_table temp_table where bfm_cusip = temp_table.bcusip"
         expected_query = "create table #temp_table (bcusip varchar(50));" \
-                         "INSERT INTO #temp_table (bcusip) VALUES ('BACH890LK');" \
-                         "INSERT INTO #temp_table (bcusip) VALUES ('BHNK98J80');" \
+                         "INSERT INTO #temp_table (bcusip) VALUES ('BACH890LK'), ('BHNK98J80');" \
                          "select * from cusip_table, #temp_table temp_table " \
                          "where bfm_cusip = temp_table.bcusip"
 
@@ -165,7 +161,7 @@ class MyTestCase(unittest.TestCase):
         cmd_line_query_params = None
 
         query = "select DATA, COURSE_NAME, ID FROM test_table"
-        expected_query = "create table #temp_id (ID varchar(50));INSERT INTO #temp_id (ID) VALUES (1);INSERT INTO #temp_id (ID) VALUES (2);select DATA, COURSE_NAME, ID FROM "'test_table'""
+        expected_query = "create table #temp_id (ID varchar(50));INSERT INTO #temp_id (ID) VALUES (1), (2);select DATA, COURSE_NAME, ID FROM "'test_table'""
 
         temp_table_params = [{'id': 'file1', 'type': 'file', 'file_type': 'delimited_file', 'delimiter': ',',
                               'file_path': os.path.join(script_dir, source_file_path),
@@ -183,7 +179,7 @@ class MyTestCase(unittest.TestCase):
         cmd_line_query_params = {'query_params': {'ID': '1'}}
 
         query = "select DATA, COURSE_NAME, ID FROM test_table"
-        expected_query = "create table #temp_id (ID varchar(50));INSERT INTO #temp_id (ID) VALUES (1);INSERT INTO #temp_id (ID) VALUES (2);select DATA, COURSE_NAME, ID FROM "'test_table'""
+        expected_query = "create table #temp_id (ID varchar(50));INSERT INTO #temp_id (ID) VALUES (1), (2);select DATA, COURSE_NAME, ID FROM "'test_table'""
 
         temp_table_params = [{'id': 'file1', 'type': 'file', 'file_type': 'delimited_file', 'delimiter': ',',
                               'file_path': os.path.join(script_dir, source_file_path),
@@ -200,11 +196,9 @@ class MyTestCase(unittest.TestCase):
         query = "select distinct t.cusip from (select cusip from #temp1 union select cusip from #temp2) t"
 
         expected_query = "create table #temp1 (cusip varchar(9));" \
-                         "insert into #temp1 (cusip) values ('abcd');" \
-                         "insert into #temp1 (cusip) values ('abce');" \
+                         "insert into #temp1 (cusip) values ('abcd'), ('abce');" \
                          "create table #temp2 (cusip varchar(9));" \
-                         "insert into #temp2 (cusip) values ('abcd');" \
-                         "insert into #temp2 (cusip) values ('abce');" \
+                         "insert into #temp2 (cusip) values ('abcd'), ('abce');" \
                          "select distinct t.cusip from (select cusip from #temp1 union select cusip from #temp2) t"
 
         data = {'cusip': ('abcd', 'abce')}
@@ -227,6 +221,44 @@ class MyTestCase(unittest.TestCase):
         actual_query = self.query_parser.parse_query(query, None, temp_table_params)
         self.assertEqual(expected_query.lower(), actual_query.lower())
 
+    @patch('ingen.utils.sql_query_parser.ReaderFactory')
+    def test_parse_query_splits_inserts_by_insert_batch_size(self, mock_reader_factory):
+        mock_reader = Mock()
+        mock_reader_factory.get_reader.return_value = mock_reader
+        mock_reader.read.return_value = pd.DataFrame({'ID': [1, 2, 3]})
+
+        query = "select * from positions"
+        expected_query = "create table #temp_id (id int);" \
+                         "INSERT INTO #temp_id (id) VALUES (1), (2);" \
+                         "INSERT INTO #temp_id (id) VALUES (3);" \
+                         "select * from positions"
+
+        temp_table_params = [{'id': 'file1', 'type': 'file', 'file_type': 'delimited_file',
+                              'file_path': 'test/path', 'temp_table_name': 'temp_id', 'insert_batch_size': 2,
+                              'temp_table_cols': [{'name': 'id', 'type': "int", "file_col": "ID"}]}]
+
+        self.assertEqual(expected_query, self.query_parser.parse_query(query, None, temp_table_params))
+
+    @patch('ingen.utils.sql_query_parser.ReaderFactory')
+    def test_parse_query_escapes_temp_table_values(self, mock_reader_factory):
+        mock_reader = Mock()
+        mock_reader_factory.get_reader.return_value = mock_reader
+        mock_reader.read.return_value = pd.DataFrame({'NAME': ["O'Neil", "a,b {c}"]})
+
+        query = "select * from {table_name}"
+        expected_query = "create table #temp_name (name varchar(20));" \
+                         "INSERT INTO #temp_name (name) VALUES ('O\\'Neil'), ('a,b {c}');" \
+                         "select * from positions"
+
+        temp_table_params = [{'id': 'file1', 'type': 'file', 'file_type': 'delimited_file',
+                              'file_path': 'test/path', 'temp_table_name': 'temp_name',
+                              'temp_table_cols': [{'name': 'name', 'type': "varchar", 'size': 20,
+                                                   "file_col": "NAME"}]}]
+
+        actual_query = self.query_parser.parse_query(query, {'query_params': {'table_name': 'positions'}},
+                                                     temp_table_params)
+        self.assertEqual(expected_query, actual_query)
+
 
 if __name__ == '__main__':
     unittest.main()
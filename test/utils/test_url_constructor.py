@@ -1,6 +1,8 @@
 #  Copyright (c) 2023 BlackRock, Inc.
 #  All Rights Reserved.
 
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, Mock
 
@@ -8,10 +10,13 @@ import pandas as pd
 
 from ingen.data_source.mysql_source import MYSQLSource
 from ingen.utils.url_constructor import FileSource
-from ingen.utils.url_constructor import UrlConstructor
+from ingen.utils.url_constructor import UrlConstructor, clear_param_cache, quote_values
 
 
 class MyTestCase(unittest.TestCase):
+    def tearDown(self):
+        clear_param_cache()
+
     def test_url_constructor_with_no_params(self):
         url = "https://www.google.com"
         url_param = None
@@ -173,6 +178,45 @@ class MyTestCase(unittest.TestCase):
         constructed_urls = constructor.get_urls()
         self.assertListEqual(constructed_urls, expected_urls)
 
+    def test_file_param_is_read_once_per_run(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'ids.csv')
+            with open(file_path, 'w') as file:
+                file.write('A1\n')
+            url_params = [{"id": "q", "type": "file", "file_path": file_path, "delimiter": ",",
+                           "columns": ["column_name"], "dest_column": "column_name"}]
+            file_source_result = pd.DataFrame(['A 1', 'A2'], columns=["column_name"])
+
+            with patch.object(FileSource, 'fetch', return_value=file_source_result) as mock_fetch:
+                first_urls = UrlConstructor("https://host.com", [dict(url_params[0])], params_map={}).get_urls()
+                second_urls = UrlConstructor("https://host.com", [dict(url_params[0])], params_map={}).get_urls()
+
+            self.assertListEqual(["https://host.com?q=A%201,A2"], first_urls)
+            self.assertListEqual(first_urls, second_urls)
+            mock_fetch.assert_called_once()
+
+    def test_cached_mysql_path_params_do_not_build_the_source(self):
+        batch = {
+            'batch_type': 'path_param',
+            'path_param_name': 'ids',
+            'path_param_source': {'id': 'ids', 'type': 'mysql', 'query': 'select ids from t'}
+        }
+        mock_data_source_factory = Mock()
+        mock_data_source_factory.parse_source.return_value.fetch.return_value = pd.DataFrame({'ids': [1, 2]})
+
+        first_urls = UrlConstructor("https://host.com", None, batch, params_map={},
+                                    source_factory=mock_data_source_factory).get_urls()
+        second_urls = UrlConstructor("https://host.com", None, batch, params_map={},
+                                     source_factory=mock_data_source_factory).get_urls()
+
+        self.assertListEqual(['https://host.com/1', 'https://host.com/2'], first_urls)
+        self.assertListEqual(first_urls, second_urls)
+        mock_data_source_factory.parse_source.assert_called_once()
+
+    def test_quote_values(self):
+        values = pd.Series(['abc', 'a b', 'x/y', 'a&b', 12, None])
+        self.assertListEqual(['abc', 'a%20b', 'x/y', 'a%26b', '12', 'None'], quote_values(values))
+
 
 if __name__ == '__main__':
     unittest.main()
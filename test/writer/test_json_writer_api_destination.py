@@ -1,6 +1,7 @@
 #  Copyright (c) 2023 BlackRock, Inc.
 #  All Rights Reserved.
 
+import gzip
 import logging
 import unittest
 from unittest.mock import patch, Mock
@@ -9,7 +10,7 @@ import pandas as pd
 
 from ingen.utils.app_http.http_request import HTTPRequest
 from ingen.utils.app_http.success_criterias import get_criteria_by_name
-from ingen.writer.json_writer.destinations.api_destination import ApiDestination
+from ingen.writer.json_writer.destinations.api_destination import ApiDestination, batch_payloads
 
 
 class TestApiDestination(unittest.TestCase):
@@ -67,8 +68,15 @@ class TestApiDestination(unittest.TestCase):
             'success_criteria': get_criteria_by_name(self.api_request_props.get('success_criteria')),
             'criteria_options': self.api_request_props.get('criteria_options'),
             'tasks_len': 1,
+            'concurrency': None,
+            'rate_limit': None,
+            'timeout': None,
+            'backoff': 'linear',
+            'max_backoff': 60,
+            'circuit_breaker': None,
             'queue_size': 1,
             'ssl': True,
+            'connection': None,
             'ignore_failure': True
         }
 
@@ -131,6 +139,40 @@ class TestApiDestination(unittest.TestCase):
             mock_warning.assert_called_with("Received empty response from API call. Writing empty dataframe to "
                                             "dataframe store.")
 
+    def test_batch_payloads_by_size(self):
+        json_strings = ['{"a": 1}', '{"a": 2}', '{"a": 3}']
+        self.assertListEqual(['[{"a": 1},{"a": 2}]', '[{"a": 3}]'], batch_payloads(json_strings, batch_size=2))
+        self.assertListEqual(['{"a": 1}\n{"a": 2}\n', '{"a": 3}\n'],
+                             batch_payloads(json_strings, batch_size=2, batch_format='ndjson'))
+
+    def test_batch_payloads_by_bytes(self):
+        json_strings = ['{"a": 1}', '{"a": 2}', '{"name": "a long record"}']
+        # '[{"a": 1},{"a": 2}]' is 20 bytes
+        payloads = batch_payloads(json_strings, max_batch_bytes=20)
+        self.assertListEqual(['[{"a": 1},{"a": 2}]', '[{"name": "a long record"}]'], payloads)
+
+    def test_batch_payloads_flattens_ndjson_records(self):
+        payloads = batch_payloads(['{\n  "a": 1\n}'], batch_size=10, batch_format='ndjson')
+        self.assertListEqual(['{"a": 1}\n'], payloads)
+
+    @patch('ingen.writer.json_writer.destinations.api_destination.DataFrameWriter')
+    @patch('ingen.writer.json_writer.destinations.api_destination.APIReader')
+    def test_batched_and_compressed_requests(self, mock_api_reader_class, mock_df_writer_class):
+        json_strings = ['{"sample_json": 1}', '{"sample_json": 2}', '{"sample_json": 3}']
+        destination_props = {
+            'api_request_props': {**self.api_request_props, 'batch_size': 2, 'compression': 'gzip'},
+            'api_response_props': self.api_response_props
+        }
+        mock_api_reader_class.return_value.execute.return_value = pd.DataFrame({})
+
+        ApiDestination().handle(json_strings, destination_props)
+
+        requests = mock_api_reader_class.call_args[0][0]
+        self.assertEqual(2, len(requests))
+        self.assertEqual('[{"sample_json": 1},{"sample_json": 2}]', gzip.decompress(requests[0].data).decode())
+        self.assertEqual({'sample_header': 'sample_header_value', 'Content-Type': 'application/json',
+                          'Content-Encoding': 'gzip'}, requests[0].headers)
+
 
 if __name__ == '__main__':
     unittest.main()